@@ -0,0 +1,193 @@
+##########################################################################################
+# PyClim was developed by Prof. Darren Robinson (University of Sheffield, 2019).         #
+# PyClim produces a range of graphs and statistics to support the analysis of climate    #
+# data, to support architectural / engineering / technology students to develop their    #
+# early-stage bioclimatic design concepts.                                               #
+##########################################################################################
+
+
+#THIS MODULE RUNS THE WeatherAnalysis SUMMARY STATISTICS, AND SELECTED FIGURES, FOR MANY
+#WEATHER STATIONS AT ONCE, ACROSS A POOL OF WORKER PROCESSES. THE STATIONS ARE LISTED IN A
+#MANIFEST: A CSV FILE WITH THE COLUMNS path, lat, lon, timezone, timeshift (AND OPTIONALLY
+#name), WHERE path IS RELATIVE TO THE MANIFEST. RESULTS ARE APPENDED TO A COMBINED CSV FILE
+#AND A JSON LINES FILE AS EACH STATION FINISHES.
+#
+#   python BatchStations.py stations.csv --out results --figures degreedays,solar
+
+#imports the basic libraries
+import argparse
+import csv
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import numpy as np
+
+#the figures that can be requested for each station
+figure_list = ['degreedays', 'solar']
+#the statistics written, in order, to the combined CSV file
+summary_fields = ['AnnualIgh', 'DiffuseFraction', 'WindKineticEnergy', 'AnnualMeanTemp', 'TotalHDD', 'TotalCDD']
+
+
+#XXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXX########
+# READ THE STATION MANIFEST
+#XXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXX########
+
+#this function returns one dictionary per station: name, path, lat, lon, timezone, timeshift
+#(None where it is blank, placing the sun at the middle of each time step)
+def read_manifest(manifest):
+    folder = os.path.dirname(os.path.abspath(manifest))
+    station_list = []
+    with open(manifest, newline='') as f:
+        for row in csv.DictReader(f):
+            path = os.path.join(folder, row['path'].strip())
+            station = {}
+            station['name'] = (row.get('name') or '').strip() or os.path.splitext(os.path.basename(path))[0]
+            station['path'] = path
+            station['lat'] = float(row['lat'])
+            station['lon'] = float(row['lon'])
+            station['timezone'] = float(row['timezone'])
+            station['timeshift'] = float(row['timeshift']) if (row.get('timeshift') or '').strip() else None
+            station_list.append(station)
+    return station_list
+
+
+#XXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXX########
+# THE WORKER PROCESSES
+#XXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXX########
+
+#this function prepares each worker: an off-screen matplotlib backend (forced, in case a
+#forked worker inherits pyplot already imported) and, where the operating system supports
+#it, a cap (in MB) on the worker's address space
+def init_worker(max_memory):
+    os.environ['MPLBACKEND'] = 'Agg'
+    try:
+        import matplotlib
+        matplotlib.use('Agg')
+    except ImportError:
+        pass
+    if max_memory:
+        try:
+            import resource
+            limit = int(max_memory)*1024*1024
+            resource.setrlimit(resource.RLIMIT_AS, (limit, limit))
+        except (ImportError, ValueError, OSError):
+            pass
+
+
+#this function returns the options of a pool whose workers are each replaced after
+#tasks_per_worker tasks. Workers can only be replaced from Python 3.11; before that they are
+#kept for the whole run.
+def pool_options(tasks_per_worker):
+    pool_options = {}
+    if tasks_per_worker and sys.version_info >= (3, 11):
+        pool_options['max_tasks_per_child'] = tasks_per_worker
+    return pool_options
+
+
+#this function analyses a single station, returning its summary statistics (or the error
+#that stopped it) and the paths of any figures saved to outdir. With stream, the statistics
+#are calculated a block of the file at a time (see StreamStats), and the hours are only read
+#into memory for a figure that needs them.
+def analyse_station(station, figures, outdir, stream=False):
+    from ClimAnalFunctions import pi
+    from ClimateData import read_climate
+    from TimeIndex import time_index
+    from WeatherStats import summary_statistics
+    from DerivedCache import cached_sunrise_sunset
+    from StreamStats import stream_statistics
+
+    start = time.time()
+    result = {'name': station['name'], 'path': station['path']}
+    try:
+        data = None
+        if stream == True:
+            result.update(stream_statistics(station['path'])['summary'])
+        else:
+            data = read_climate(station['path'])
+            index = time_index(data)
+            result.update(summary_statistics(data, index=index))
+        result['figures'] = []
+        if figures:
+            import matplotlib.pyplot as plt
+            from WeatherFigures import plot_degree_days, plot_solar_availability
+            os.makedirs(outdir, exist_ok=True)
+            for figure in figures:
+                if figure == 'degreedays':
+                    fig = plot_degree_days(result['MonthlyHDD'], result['MonthlyCDD'])
+                elif figure == 'solar':
+                    if data is None:
+                        data = read_climate(station['path'])
+                        index = time_index(data)
+                    day_list = np.arange(1, len(index.starts['day'])+1)
+                    SRtime_list, SStime_list = cached_sunrise_sunset(station['path'], station['lat']*pi/180, station['lon'], station['timezone'], station['timeshift'])
+                    fig = plot_solar_availability(index.grid(data['global']), day_list, SRtime_list, SStime_list)
+                else:
+                    continue
+                figfile = os.path.join(outdir, station['name'] + '_' + figure + '.png')
+                fig.savefig(figfile)
+                plt.close(fig)
+                result['figures'].append(figfile)
+        result['error'] = ''
+    except Exception as error:
+        result['error'] = type(error).__name__ + ': ' + str(error)
+    result['seconds'] = time.time()-start
+    return result
+
+
+#XXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXX########
+# FAN THE STATIONS OUT ACROSS THE POOL
+#XXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXX########
+
+#this function analyses every station in the manifest, writing summary.csv and summary.jsonl
+#to outdir as the stations finish. Each worker is replaced after tasks_per_worker stations
+#(from Python 3.11, see pool_options), so that memory cannot creep up over a long batch, and
+#with stream each station's statistics are calculated in constant memory. Returns the list
+#of results.
+def run_batch(manifest, outdir, figures=(), workers=None, max_memory=None, tasks_per_worker=20, verbose=True, stream=False):
+    station_list = read_manifest(manifest)
+    os.makedirs(outdir, exist_ok=True)
+    csvfile = os.path.join(outdir, 'summary.csv')
+    jsonfile = os.path.join(outdir, 'summary.jsonl')
+    header = ['name', 'path'] + summary_fields + ['MonthlyHDD', 'MonthlyCDD', 'seconds', 'error']
+    result_list = []
+    with open(csvfile, 'w', newline='') as fcsv, open(jsonfile, 'w') as fjson:
+        writer = csv.DictWriter(fcsv, header, extrasaction='ignore')
+        writer.writeheader()
+        with ProcessPoolExecutor(max_workers=workers, initializer=init_worker, initargs=(max_memory,),
+                                 **pool_options(tasks_per_worker)) as pool:
+            futures = [pool.submit(analyse_station, station, list(figures), os.path.join(outdir, 'figures'), stream) for station in station_list]
+            for done, future in enumerate(as_completed(futures), 1):
+                result = future.result()
+                row = dict(result)
+                for field in ['MonthlyHDD', 'MonthlyCDD']:
+                    if field in row:
+                        row[field] = ' '.join('{0:1.1f}'.format(value) for value in row[field])
+                writer.writerow(row)
+                fcsv.flush()
+                fjson.write(json.dumps(result) + '\n')
+                fjson.flush()
+                result_list.append(result)
+                if verbose:
+                    status = result['error'] or '{0:1.2f}s' .format(result['seconds'])
+                    print('[{0}/{1}] {2}: {3}' .format(done, len(station_list), result['name'], status))
+    return result_list
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Run the WeatherAnalysis statistics for many stations.')
+    parser.add_argument('manifest', help='CSV file with the columns path, lat, lon, timezone, timeshift')
+    parser.add_argument('--out', default='batch_results', help='folder for the summary files and figures')
+    parser.add_argument('--figures', default='', help='comma separated figures: ' + ', '.join(figure_list))
+    parser.add_argument('--workers', type=int, default=None, help='number of worker processes')
+    parser.add_argument('--max-memory', type=int, default=None, help='address space cap per worker, MB')
+    parser.add_argument('--tasks-per-worker', type=int, default=20, help='stations before a worker is replaced')
+    parser.add_argument('--stream', action='store_true', help='read each climate file in blocks, in constant memory')
+    args = parser.parse_args()
+    figures = [figure for figure in args.figures.split(',') if figure]
+    for figure in figures:
+        if figure not in figure_list:
+            parser.error('unknown figure: ' + figure)
+    run_batch(args.manifest, args.out, figures, args.workers, args.max_memory, args.tasks_per_worker, stream=args.stream)
@@ -0,0 +1,459 @@
+##########################################################################################
+# PyClim was developed by Prof. Darren Robinson (University of Sheffield, 2019).         #
+# PyClim produces a range of graphs and statistics to support the analysis of climate    #
+# data, to support architectural / engineering / technology students to develop their    #
+# early-stage bioclimatic design concepts.                                               #
+##########################################################################################
+
+
+#THIS MODULE CONTAINS ARRAY (NUMPY) VERSIONS OF THE CLIMATE ANALYSIS FUNCTIONS. EACH ONE
+#MIRRORS ITS SCALAR NAMESAKE IN ClimAnalFunctions, BUT ACCEPTS WHOLE ARRAYS (E.G. A DAY X
+#HOUR GRID) SO THAT A YEAR OF VALUES IS EVALUATED IN A SINGLE CALL.
+
+#imports the basic libraries
+import numpy as np
+
+from ClimAnalFunctions import pi, groundref
+
+
+#XXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXX########
+# FUNCTIONS TO CALCULATE THE PSYCHROMETRIC PROPERTIES OF HUMID AIR
+#XXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXX########
+
+#The scalar g, tsat and twetrh functions search for their answers by bisection / halving.
+#Here g is evaluated in closed form and tsat and twetrh are solved by a bracketed secant
+#method, to (much) better than the resolution of the scalar searches. Compared with the
+#scalar originals:
+#   g_array      differs by at most 1e-7 kg/kg (the scalar stops within 1e-5/100 of rh*gss/100)
+#   tsat_array   differs by less than 0.065 oC (the scalar halves its step down to 0.0625 oC,
+#                and returns the upper end of its final step)
+#   twetrh_array differs by less than 0.5 oC (the scalar halves its step down to 0.5 oC)
+#pss_array, fs_array, gss_array, ps_array, rh_array, pvap_array and g_dry_wet_array are
+#closed forms and agree with their scalar namesakes to rounding. Where the scalar functions
+#assume standard atmospheric pressure (101.325 kPa), the array versions take it as patm.
+
+#this function solves f(x)=0 for arrays of roots bracketed by low and high, where f is
+#increasing in x. It takes secant (false position) steps, halving the retained end's f
+#whenever the same end is kept twice in a row (the Illinois method), so that it does not
+#stall on strongly curved functions. Roots outside the bracket give the nearer end of it.
+def secant_array(f, low, high, xtol=1e-6, maxiter=100):
+    low, high = [np.array(x, dtype=float) for x in np.broadcast_arrays(low, high)]
+    flow = f(low)
+    fhigh = f(high)
+    root = np.where(flow >= 0, low, high)
+    active = (flow < 0) & (fhigh > 0)
+    side = np.zeros(low.shape, dtype=int)
+    for iteration in range(maxiter):
+        if not active.any():
+            break
+        with np.errstate(divide='ignore', invalid='ignore'):
+            x = high - fhigh*(high-low)/(fhigh-flow)
+        x = np.where((x > low) & (x < high), x, low+(high-low)/2)
+        fx = f(x)
+        below = active & (fx < 0)
+        above = active & (fx >= 0)
+        fhigh = np.where(below & (side == -1), fhigh/2, fhigh)
+        flow = np.where(above & (side == 1), flow/2, flow)
+        low = np.where(below, x, low)
+        flow = np.where(below, fx, flow)
+        high = np.where(above, x, high)
+        fhigh = np.where(above, fx, fhigh)
+        side = np.where(below, -1, np.where(above, 1, side))
+        root = np.where(active, x, root)
+        active = active & (fx != 0) & (high-low > xtol)
+    return root
+
+
+#Calculates the saturated vapour pressure (kPa) given the air temperature
+def pss_array(t):
+    t = np.asarray(t, dtype=float)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        warm = 30.59051 - 8.2 * np.log10(t + 273.16) + 0.0024804 * (t + 273.16) - 3142.31 / (t + 273.16)
+        cold = 9.5380997 - 2663.91 / (t + 273.15)
+    pss_array = 10 ** np.where(t >= 0, warm, cold)
+    return pss_array
+
+
+#calculates moisture content of saturated vapour, at an atmospheric pressure patm (kPa)
+def gss_array(fs, pss, patm=101.325):
+    gss_array = 0.62197 * fs * pss / (patm - fs * pss)
+    return gss_array
+
+
+#provides necessary interaction coefficients (the last band is also used beyond 60oC)
+def fs_array(dbt):
+    dbt = np.asarray(dbt, dtype=float)
+    fs_array = np.where(dbt < 11, -7.3E-06 * (dbt + 273.15) + 1.00444,
+                        np.where(dbt < 26, 1.32E-05 * (dbt + 273.15) + 1.004205,
+                                 4.05E-05 * (dbt + 273.15) + 1.003497))
+    return fs_array
+
+
+#calculates moisture content from dbt and rh
+def g_array(dbt, rh, patm=101.325):
+    g_array = np.asarray(rh, dtype=float)*gss_array(fs_array(dbt), pss_array(dbt), patm)/100
+    return g_array
+
+
+#calculates the vapour pressure of air at a given moisture content
+def ps_array(g, patm=101.325):
+    ps_array = patm*g/(0.622+g)
+    return ps_array
+
+
+#calculates rh given the moisture content and dry bulb tempature
+def rh_array(g, dbt, patm=101.325):
+    rh_array = 100*(ps_array(g, patm)/pss_array(dbt))
+    return rh_array
+
+
+#calculates the partial pressure of water vapour mixed with dry air (kPa), given dry-bulb and
+#wet-bulb/screen temperature. As in the scalar pvap, whose final if/else overrides its screen
+#branches, the coefficient is 5.94 for a wet bulb below 0oC (screen False) and 6.66 otherwise.
+def pvap_array(tdry, twet, screen, patm=101.325):
+    twet = np.asarray(twet, dtype=float)
+    if screen == False:
+        corr = np.where(twet < 0, 5.94, 6.66)
+    else:
+        corr = 6.66
+    pvap_array = pss_array(twet) - patm * corr * 10**-4 * (tdry - twet)
+    return pvap_array
+
+
+#calculates moisture content, given the dry and wet bulb temperatures
+def g_dry_wet_array(dbt, twet, patm=101.325):
+    pst = 10*pvap_array(dbt, twet, False, patm)
+    g_dry_wet_array = 0.62197 * fs_array(dbt) * pst / (10*patm - fs_array(dbt) * pst)
+    return g_dry_wet_array
+
+
+#Calculates saturation temperature from moisture content, within the range of the scalar
+#search (60oC down to 60-127.9375oC)
+def tsat_array(mc, patm=101.325):
+    mc = np.asarray(mc, dtype=float)
+    tsat_array = secant_array(lambda t: g_array(t, 100, patm) - mc, np.full(mc.shape, 60-127.9375), np.full(mc.shape, 60.0))
+    return tsat_array
+
+
+#Calculates wet bulb or screen temperature (oC) given the dry bulb temperature and RH,
+#within the range of the scalar search (tdry down to tdry-127.5oC). pvap steps down as the
+#wet bulb rises through 0oC, so a target can be crossed twice; like the scalar search, which
+#works downwards from tdry, the upper crossing is taken.
+def twetrh_array(tdry, rh, screen, patm=101.325):
+    tdry, rh = np.broadcast_arrays(np.asarray(tdry, dtype=float), np.asarray(rh, dtype=float))
+    target = rh * pss_array(tdry) / 100
+    f = lambda twet: pvap_array(tdry, twet, screen, patm) - target
+    aboveice = (tdry > 0) & (f(np.zeros(tdry.shape)) < 0)
+    low = np.where(aboveice, 0, tdry-127.5)
+    high = np.where(aboveice, tdry, np.minimum(tdry, 0))
+    twetrh_array = secant_array(f, low, high)
+    #below freezing the search is bracketed by 0oC, so roots above it are taken from tdry
+    twetrh_array = np.where(~aboveice & (tdry > 0) & (twetrh_array >= 0), np.minimum(twetrh_array, tdry), twetrh_array)
+    return twetrh_array
+
+
+#XXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXX########
+# FUNCTIONS TO CALCULATE THE POSITION OF THE SUN
+#XXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXX########
+
+#as for the scalar arcsine and arccosine, arguments beyond +/-1 are clamped
+def arccos_array(x):
+    arccos_array = np.arccos(np.clip(x, -1, 1))
+    return arccos_array
+
+
+def arcsin_array(x):
+    arcsin_array = np.arcsin(np.clip(x, -1, 1))
+    return arcsin_array
+
+
+#this function calculates the declination angle in radians
+def declin_angle_array(jday):
+    tau = 2*pi*(np.asarray(jday, dtype=float)-1)/365
+    declin_angle_array = 0.006918 - 0.399912 * np.cos(tau) + 0.070257 * np.sin(tau) - 0.006758 * np.cos(2 * tau) + 0.000907 * np.sin(2 * tau) - 0.002697 * np.cos(3 * tau) + 0.00148 * np.sin(3 * tau)
+    return declin_angle_array
+
+
+#this function calculates the solar altitude in radians, clipping negative values to 0
+def solar_altitude_array(jday, hour, latitude, Declin):
+    Hourangle = pi * np.asarray(hour, dtype=float) / 12
+    solar_altitude_array = arcsin_array(np.sin(latitude) * np.sin(Declin) - np.cos(latitude) * np.cos(Declin) * np.cos(Hourangle))
+    solar_altitude_array = np.maximum(solar_altitude_array, 0)
+    return solar_altitude_array
+
+
+#this function calculates the solar azimuth, taking the same hour-angle branch as solar_azimuth
+def solar_azimuth_array(jday, hour, latitude, solalt, declin):
+    Hourangle = pi * np.asarray(hour, dtype=float) / 12
+    with np.errstate(divide='ignore', invalid='ignore'):
+        azimuth = arccos_array((-np.sin(latitude) * np.sin(solalt) + np.sin(declin)) / (np.cos(latitude) * np.cos(solalt)))
+    solar_azimuth_array = np.where(Hourangle < pi, azimuth, (2 * pi) - azimuth)
+    return solar_azimuth_array
+
+
+#this function calculates the difference between solar time and clock time, in hours
+def time_diff_array(jday, EqTonly, longitude, timezone, timeshift):
+    #a timeshift of None is the middle of each hour of an hourly file (see TimeIndex.interval_timeshift)
+    if timeshift is None:
+        timeshift = -0.5
+    B = 2 * pi * (np.asarray(jday, dtype=float)-1)/365
+    EqT = (4*180/pi) * (0.000075 + 0.001868 * np.cos(B) - 0.032077 * np.sin(B) - 0.014615 * np.cos(2 * B) - 0.040849 * np.sin(2 * B))
+    if EqTonly==False:
+        deltaT = 4 * longitude - 60 * timezone + (60*timeshift) + EqT
+    else:
+        deltaT = EqT
+    time_diff_array = deltaT / 60
+    return time_diff_array
+
+
+#this function calculates the number of hours that the sun is above the horizon
+def daylength_array(dec, lat):
+    daylength_array = 24*arccos_array(-np.tan(lat)*np.tan(dec))/pi
+    return daylength_array
+
+
+#this function calculates the sunrise and sunset times
+def sunrise_time_array(dec, lat, jday):
+    DL = daylength_array(dec,lat)
+    SStime = 12+DL/2
+    SRtime = 12-DL/2
+    return SStime, SRtime
+
+
+#this function calculates the sun position for every (day, hour) pair in one call. jday and
+#hour are broadcast against each other, so that jday[:,None] and hour[None,:] give a
+#(day x hour) grid. As in the scripts, the sun is located at hour + time_diff(jday).
+#Returns the solar altitude, solar azimuth, declination and time difference (EqT when
+#EqTonly is True), all in the broadcast shape.
+def solar_position(jday, hour, latitude, longitude, timezone, timeshift, EqTonly=False):
+    jday, hour = np.broadcast_arrays(np.asarray(jday, dtype=float), np.asarray(hour, dtype=float))
+    dec = declin_angle_array(jday)
+    dT = time_diff_array(jday, EqTonly, longitude, timezone, timeshift)
+    solalt = solar_altitude_array(jday, hour + dT, latitude, dec)
+    solaz = solar_azimuth_array(jday, hour + dT, latitude, solalt, dec)
+    return solalt, solaz, dec, dT
+
+
+#this function calculates the cosine of the angle of incidence on a tilted plane
+def cai_array(wallaz, tilt, solalt, solaz):
+    wallsolaz = solaz-wallaz
+    cai_array = np.cos(solalt)*np.cos(wallsolaz)*np.sin(tilt)+np.sin(solalt)*np.cos(tilt)
+    cai_array = np.maximum(cai_array, 0)
+    return cai_array
+
+
+#XXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXX########
+# FUNCTIONS TO CALCULATE THE PEREZ SKY PARAMETERS
+#XXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXX########
+
+#lower bounds of the Perez clearness categories 1 to 8
+clearness_bounds = np.array([1, 1.065, 1.23, 1.5, 1.95, 2.8, 4.5, 6.2])
+
+#Perez coefficients by clearness category: columns are F11, F12, F13 and F21, F22, F23
+F1_table = np.array([[-0.0083, 0.5877, -0.0621],
+                     [0.1299, 0.6826, -0.1514],
+                     [0.3297, 0.4869, -0.2211],
+                     [0.5682, 0.1875, -0.2951],
+                     [0.873, -0.392, -0.3616],
+                     [1.1326, -1.2367, -0.4118],
+                     [1.0602, -1.5999, -0.3589],
+                     [0.6777, -0.3273, -0.2504]])
+F2_table = np.array([[-0.0596, 0.0721, -0.022],
+                     [-0.0189, 0.066, -0.0289],
+                     [0.0554, -0.064, -0.0261],
+                     [0.1089, -0.1519, -0.014],
+                     [0.2256, -0.462, 0.0012],
+                     [0.2878, -0.823, 0.0559],
+                     [0.2642, -1.1272, 0.1311],
+                     [0.1561, -1.3765, 0.2506]])
+
+
+#this function calculates the Perez clearness category (1 to 8). As for the if/elif ladder
+#in PerezClearness, values below 1 or exactly on an upper bound fall into category 8.
+def PerezClearness_array(solalt, idh, ibn):
+    ThetaZ=((pi/2)-solalt)*180/pi
+    with np.errstate(divide='ignore', invalid='ignore'):
+        clearness = (((idh + ibn) / idh) + 5.535 * 10 ** -6 * ThetaZ ** 3) / (1 + 5.535 * 10 ** -6 * ThetaZ ** 3)
+    PerezClearness_array = np.digitize(clearness, clearness_bounds)
+    ontheedge = np.isin(clearness, clearness_bounds[1:])
+    PerezClearness_array = np.where((PerezClearness_array == 0) | ontheedge, 8, PerezClearness_array)
+    return PerezClearness_array
+
+
+#Calculates the Perez brightness coefficient
+def PerezBrightness_array(jday, solalt, idh):
+    IextraT = 1367*(1+0.033*np.cos((360*np.asarray(jday, dtype=float)/365)*pi/180))
+    with np.errstate(divide='ignore'):
+        airmass = 1 / np.sin(solalt)
+    PerezBrightness_array = airmass*idh/IextraT
+    return PerezBrightness_array
+
+
+#this function looks up the Perez coefficients for arrays of clearness categories
+def PerezCoefficients_array(clearness):
+    F1 = F1_table[np.asarray(clearness)-1]
+    F2 = F2_table[np.asarray(clearness)-1]
+    return F1[...,0], F1[...,1], F1[...,2], F2[...,0], F2[...,1], F2[...,2]
+
+
+#this function calculates the orientation independent part of the Perez model for each hour:
+#the circumsolar (F1) and horizon (F2) brightening coefficients and the (bounded) sine of the
+#solar altitude, a1. idh_perez is then idh*((1-F1)*(1+cos(tilt))/2+F1*cai/a1+F2*sin(tilt))
+def PerezSky_array(jday, solalt, idh, ibn):
+    solalt = np.maximum(solalt, 5*pi/180)
+    F11, F12, F13, F21, F22, F23 = PerezCoefficients_array(PerezClearness_array(solalt, idh, ibn))
+    thetaz = (pi/2)-solalt
+    brightness = PerezBrightness_array(jday, solalt, idh)
+    F1 = np.maximum(F11+F12*brightness+F13*thetaz, 0)
+    F2 = F21+F22*brightness + F23*thetaz
+    a1 = np.maximum(np.sin(solalt), np.sin(5*pi/180))
+    return F1, F2, a1
+
+
+#these functions calculates diffuse irradiance on a tilted plane using the Perez model
+def idh_perez_array(jday, cai, solalt, idh, ibn, tilt):
+    F1, F2, a1 = PerezSky_array(jday, solalt, idh, ibn)
+    idh_perez_array = idh*((1-F1)*(1+np.cos(tilt))/2+F1*cai/a1+F2*np.sin(tilt))
+    return idh_perez_array
+
+
+#XXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXX########
+# FUNCTIONS TO CALCULATE THE DAYLIGHT ILLUMINANCE
+#XXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXX########
+
+#the Perez luminous efficacy coefficients (a, b, c, d) of each clearness category, for
+#global (LumEff_global_table) and diffuse (LumEff_diffuse_table) horizontal irradiance
+LumEff_global_table = np.array([[96.6251, -0.4703, 11.501, 9.1555],
+                                [107.5371, 0.7866, 1.7899, -1.1892],
+                                [98.7277, 0.6972, 4.4046, -6.9483],
+                                [92.721, 0.5591, 8.3579, -8.3063],
+                                [86.7266, 0.9763, 7.1033, -10.9361],
+                                [88.3516, 1.3891, 6.0641, -7.5967],
+                                [78.624, 1.4699, 4.9305, -11.3703],
+                                [99.6452, 1.8569, -4.4555, -3.1465]])
+LumEff_diffuse_table = np.array([[97.2375, -0.4597, 11.962, -8.9149],
+                                 [107.2129, 1.1508, 0.584, -3.949],
+                                 [104.996, 2.9605, -5.5334, -8.7793],
+                                 [102.3945, 5.589, -13.951, -13.9052],
+                                 [100.71, 5.94, -22.75, -23.74],
+                                 [106.42, 3.83, -36.15, -28.83],
+                                 [141.88, 1.9, -53.24, -14.03],
+                                 [152.23, 0.35, -45.27, -7.98]])
+
+
+#this function calculates the luminous efficacy (lm/W) of global (globaleff True) or diffuse
+#horizontal irradiance, from the clearness category and brightness of each hour
+def LumEffCoeffs_array(globaleff, clearness, amc, solalt, brightness):
+    if globaleff == True:
+        coefficients = LumEff_global_table[np.asarray(clearness)-1]
+    else:
+        coefficients = LumEff_diffuse_table[np.asarray(clearness)-1]
+    with np.errstate(divide='ignore'):
+        LumEffCoeffs_array = coefficients[...,0]+coefficients[...,1]*amc+coefficients[...,2]*np.sin(solalt)+coefficients[...,3]*np.log(brightness)
+    return LumEffCoeffs_array
+
+
+def LumEff_array(globaleff, jday, solalt, idh, ibn):
+    amc = 2
+    brightness = PerezBrightness_array(jday, solalt, idh)
+    clearness = PerezClearness_array(solalt, idh, ibn)
+    LumEff_array = LumEffCoeffs_array(globaleff, clearness, amc, solalt, brightness)
+    return LumEff_array
+
+
+#this function calculates the global (globaleff True) or diffuse horizontal illuminance (lux)
+#of each hour, which is zero unless the sun is up and both igh and idh are positive. Given
+#the hourly sky state (see SkyState), its clearness and brightness are used as they stand.
+def illuminance_array(globaleff, jday, solalt, igh, idh, skystate=None):
+    igh = np.asarray(igh, dtype=float)
+    idh = np.asarray(idh, dtype=float)
+    daylit = (solalt > 0) & (igh > 0) & (idh > 0)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        if skystate is None:
+            ibn = np.where(daylit, (igh-idh)/np.sin(solalt), 0)
+            LumEff = LumEff_array(globaleff, jday, solalt, idh, ibn)
+        else:
+            LumEff = LumEffCoeffs_array(globaleff, skystate['clearness'], 2, solalt, skystate['brightness'])
+        if globaleff == True:
+            illuminance = igh*LumEff
+        else:
+            illuminance = idh*LumEff
+    illuminance_array = np.where(daylit, illuminance, 0)
+    return illuminance_array
+
+
+#XXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXX########
+# FUNCTIONS TO CALCULATE THE INCIDENT GLOBAL IRRADIANCE
+#XXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXX########
+
+#this function calculates the beam normal irradiance, which is zero with the sun below the horizon
+def ibn_array(igh, idh, solalt):
+    with np.errstate(divide='ignore', invalid='ignore'):
+        ibn_array = np.where(solalt > 0, (igh-idh)/np.sin(solalt), 0)
+    return ibn_array
+
+
+#this function calculates incident irradiance, for either an isotropic or an anisotropic sky
+def igbeta_array(jday, cai, igh, idh, solalt, tilt, isotropic, DiffuseOnly):
+    ibn = ibn_array(igh, idh, solalt)
+    if isotropic==True:
+        idbeta=idh*(1+np.cos(tilt))/2
+    else:
+        with np.errstate(divide='ignore', invalid='ignore'):
+            idbeta=np.where(idh > 0, idh_perez_array(jday, cai, solalt, idh, ibn, tilt), 0)
+    if DiffuseOnly==True:
+        igbeta_array=idbeta
+    else:
+        iground=igh*groundref*(1-np.cos(tilt))/2
+        ibbeta=ibn*cai
+        igbeta_array=ibbeta+idbeta+iground
+    return igbeta_array
+
+
+#this function calculates the annual irradiation (Wh/m2) incident on every combination of
+#tilt and wallaz (radians), returning a (tilt x wallaz) surface. jday, igh, idh, solalt and
+#solaz are hourly series. Only the cai depends on both orientation and hour, so the
+#remaining terms of igbeta are summed over the year once, while the cai is broadcast over
+#a (tilt x wallaz x hour) cube, in chunks of hours holding no more than maxcells values.
+#Given the hourly sky state (see SkyState), its ibn, F1, F2 and a1 are used as they stand.
+def annual_irradiation_surface(tilt, wallaz, jday, igh, idh, solalt, solaz, isotropic, DiffuseOnly, maxcells=2**22, skystate=None):
+    tilt = np.atleast_1d(np.asarray(tilt, dtype=float))
+    wallaz = np.atleast_1d(np.asarray(wallaz, dtype=float))
+    jday, igh, idh, solalt, solaz = [np.ravel(x) for x in np.broadcast_arrays(jday, igh, idh, solalt, solaz)]
+    igh = igh.astype(float)
+    idh = idh.astype(float)
+    if skystate is None:
+        ibn = ibn_array(igh, idh, solalt)
+    else:
+        ibn = skystate['ibn']
+    costilt = np.cos(tilt)[:,None]
+    sintilt = np.sin(tilt)[:,None]
+
+    #the orientation independent sums, and the hourly weight that multiplies the cai
+    if isotropic==True:
+        surface = idh.sum()*(1+costilt)/2
+        weight = np.zeros(len(igh))
+    else:
+        if skystate is None:
+            F1, F2, a1 = PerezSky_array(jday, solalt, idh, ibn)
+            F1 = np.where(idh > 0, F1, 0)
+            F2 = np.where(idh > 0, F2, 0)
+        else:
+            F1, F2, a1 = skystate['F1'], skystate['F2'], skystate['a1']
+        surface = (idh*(1-F1)).sum()*(1+costilt)/2 + (idh*F2).sum()*sintilt
+        weight = idh*F1/a1
+    if DiffuseOnly==False:
+        surface = surface + igh.sum()*groundref*(1-costilt)/2
+        weight = weight + ibn
+    surface = np.broadcast_to(surface, (len(tilt), len(wallaz))).copy()
+
+    #night-time hours, or hours without beam or circumsolar irradiance, add nothing
+    active = np.nonzero(weight != 0)[0]
+    chunk = max(1, maxcells // (len(tilt)*len(wallaz)))
+    for start in range(0, len(active), chunk):
+        hours = active[start:start+chunk]
+        horizontal = np.cos(solalt[hours])*np.cos(solaz[hours]-wallaz[:,None])
+        cube = sintilt[:,:,None]*horizontal + costilt[:,:,None]*np.sin(solalt[hours])
+        np.maximum(cube, 0, out=cube)
+        surface += cube @ weight[hours]
+    return surface
@@ -11,20 +11,19 @@
 
 #imports the basic libraries
 import math
-import matplotlib.pyplot as plt
-import numpy as np
 
 pi = 3.141592654
 
 #XXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXX########
-# HERE WE OPEN THE CLIMATE FILE AND ASSIGN COORDINATES
+# HERE WE NAME THE CLIMATE FILE AND ASSIGN COORDINATES
 #XXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXX########
 
-file = open("./Finningley.csv", "r")
+filename = "./Finningley.csv" #read with ClimateData.read_climate(filename)
 lat = 53.7
 longitude = -1
 timezone= 0
-timeshift = -0.5 #for the hour-centred time convention
+timeshift = None #None centres each time step (-0.5 for the hour-centred convention of hourly files); or a shift in hours
+timestep = None #None keeps the time step of the climate file; or resample it to this step, in hours (see Resample)
 
 groundref=0.2
 
@@ -252,6 +251,9 @@ def cai(wallaz, tilt, solalt, solaz):
 
 #this function calculates the difference between solar time and clock time
 def time_diff(jday, EqTonly, longitude, timezone, timeshift):
+    #a timeshift of None is the middle of each hour of an hourly file (see TimeIndex.interval_timeshift)
+    if timeshift is None:
+        timeshift = -0.5
     B = 2 * pi * (jday-1)/365
     #The term on the left below, converts from radians, through degrees, to minutes: Earth takes 4minutes to rotate one degree.
     EqT = (4*180/pi) * (0.000075 + 0.001868 * math.cos(B) - 0.032077 * math.sin(B) - 0.014615 * math.cos(2 * B) - 0.040849 * math.sin(2 * B))
@@ -0,0 +1,158 @@
+##########################################################################################
+# PyClim was developed by Prof. Darren Robinson (University of Sheffield, 2019).         #
+# PyClim produces a range of graphs and statistics to support the analysis of climate    #
+# data, to support architectural / engineering / technology students to develop their    #
+# early-stage bioclimatic design concepts.                                               #
+##########################################################################################
+
+
+#THIS MODULE READS A CLIMATE FILE INTO TYPED NUMPY COLUMNS. THE PARSED COLUMNS ARE SAVED
+#AS A BINARY (.npy) SIDECAR, SO THAT LATER RUNS CAN MEMORY-MAP THEM RATHER THAN RE-PARSE
+#THE TEXT. THE SIDECAR IS KEYED ON THE FILE PATH, SIZE AND MODIFICATION TIME. SUB-HOURLY
+#FILES GIVE DECIMAL HOURS, OR A minute COLUMN AFTER THE hour COLUMN; EITHER WAY THE hour
+#FIELD HOLDS DECIMAL HOURS (SEE TimeIndex). read_climate CAN ALSO RESAMPLE THE RECORD TO
+#ANOTHER TIME STEP (SEE Resample).
+
+#imports the basic libraries
+import hashlib
+import itertools
+import os
+import numpy as np
+
+
+#XXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXX########
+# THE LAYOUT OF THE CLIMATE FILE
+#XXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXX########
+
+#the first three rows hold the station name, the column names and the units
+header_rows = 3
+
+#column names, in the order that they appear in the climate file
+climate_dtype = np.dtype([('month', np.int16),
+                          ('day', np.int16),
+                          ('hour', np.float64),
+                          ('dbt', np.float64),
+                          ('rh', np.float64),
+                          ('global', np.float64),
+                          ('diffuse', np.float64),
+                          ('winspeed', np.float64),
+                          ('windir', np.float64)])
+
+#the columns of a sub-hourly file with a minute column, named in the second header row
+minute_dtype = np.dtype(climate_dtype.descr[:3] + [('minute', np.float64)] + climate_dtype.descr[3:])
+
+cache_dir = '.pyclim_cache'
+
+
+#XXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXX########
+# FUNCTIONS TO PARSE AND CACHE THE CLIMATE FILE
+#XXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXX########
+
+def has_minutes(header):
+#returns True if the header rows name a minute column after the hour column
+    names = [name.strip().lower() for name in header[1].split(',')]
+    return len(names) > 3 and names[3] == 'minute'
+
+
+def parse_rows(rows, minutes=False):
+#parses rows of the climate file (an open file or a list of lines, after the header) into a
+#structured array, folding any minute column into decimal hours
+    if minutes == False:
+        return np.atleast_1d(np.loadtxt(rows, delimiter=',', usecols=range(len(climate_dtype.names)), dtype=climate_dtype))
+    raw = np.atleast_1d(np.loadtxt(rows, delimiter=',', usecols=range(len(minute_dtype.names)), dtype=minute_dtype))
+    data = np.zeros(len(raw), dtype=climate_dtype)
+    for name in climate_dtype.names:
+        data[name] = raw[name]
+    data['hour'] = raw['hour'] + raw['minute']/60
+    return data
+
+
+def parse_climate(filename):
+#parses the text climate file into a structured array, one field per column
+    with open(filename) as f:
+        header = list(itertools.islice(f, header_rows))
+        data = parse_rows(f, has_minutes(header))
+    return data
+
+
+def cache_key(filename):
+#hashes the absolute path, size and modification time of the climate file
+    stat = os.stat(filename)
+    key = os.path.abspath(filename) + '|' + str(stat.st_size) + '|' + str(stat.st_mtime_ns)
+    cache_key = hashlib.sha1(key.encode('utf-8')).hexdigest()[:16]
+    return cache_key
+
+
+def cache_path(filename):
+#returns the path of the binary sidecar for this version of the climate file
+    folder = os.path.join(os.path.dirname(os.path.abspath(filename)), cache_dir)
+    cache_path = os.path.join(folder, os.path.basename(filename) + '.' + cache_key(filename) + '.npy')
+    return cache_path
+
+
+def write_cache(filename, data):
+#saves the parsed columns, removing any sidecars left by older versions of the file (the
+#arrays derived from them are keyed on the file content, and evicted by DerivedCache)
+    sidecar = cache_path(filename)
+    folder = os.path.dirname(sidecar)
+    os.makedirs(folder, exist_ok=True)
+    prefix = os.path.basename(filename) + '.'
+    for name in os.listdir(folder):
+        if name.startswith(prefix) and name.endswith('.npy') and name != os.path.basename(sidecar):
+            os.remove(os.path.join(folder, name))
+    #write to a temporary file first, so that a concurrent reader never sees half a file
+    tmp = sidecar + '.' + str(os.getpid()) + '.tmp'
+    with open(tmp, 'wb') as f:
+        np.save(f, data)
+    os.replace(tmp, sidecar)
+    return sidecar
+
+
+def read_climate(filename, use_cache=True, timestep=None):
+#returns the climate data as a structured array with the fields of climate_dtype, e.g.
+#data['dbt'], data['global']. When cached the array is memory-mapped (read-only). If
+#timestep (hours) is given, the data are resampled to it (see Resample).
+    if timestep is not None:
+        from Resample import resample
+        return resample(read_climate(filename, use_cache), timestep)
+    if use_cache == False:
+        return parse_climate(filename)
+    sidecar = cache_path(filename)
+    if os.path.exists(sidecar):
+        try:
+            data = np.load(sidecar, mmap_mode='r')
+            if data.dtype == climate_dtype:
+                return data
+        except (OSError, ValueError):
+            pass
+    data = parse_climate(filename)
+    try:
+        write_cache(filename, data)
+    except OSError:
+        #a read-only data directory simply means that we parse the text every time
+        return data
+    return np.load(sidecar, mmap_mode='r')
+
+
+def iter_climate(filename, chunk_rows=744, use_cache=True):
+#yields the climate data in consecutive blocks of (up to) chunk_rows rows, so that long
+#records can be processed without holding every hour in memory: as slices of the binary
+#sidecar where there is one, otherwise by parsing the text a block at a time
+    if use_cache == True:
+        sidecar = cache_path(filename)
+        if os.path.exists(sidecar):
+            try:
+                data = np.load(sidecar, mmap_mode='r')
+                if data.dtype == climate_dtype:
+                    for start in range(0, len(data), chunk_rows):
+                        yield data[start:start+chunk_rows]
+                    return
+            except (OSError, ValueError):
+                pass
+    with open(filename) as f:
+        minutes = has_minutes(list(itertools.islice(f, header_rows)))
+        while True:
+            lines = list(itertools.islice(f, chunk_rows))
+            if len(lines) == 0:
+                return
+            yield parse_rows(lines, minutes)
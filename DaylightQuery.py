@@ -0,0 +1,145 @@
+##########################################################################################
+# PyClim was developed by Prof. Darren Robinson (University of Sheffield, 2019).         #
+# PyClim produces a range of graphs and statistics to support the analysis of climate    #
+# data, to support architectural / engineering / technology students to develop their    #
+# early-stage bioclimatic design concepts.                                               #
+##########################################################################################
+
+
+#THIS MODULE ANSWERS "FOR HOW MANY (OCCUPIED) HOURS IS THE DAYLIGHT ABOVE X klux" FOR MANY
+#THRESHOLDS AND SCHEDULES AT ONCE: THE HORIZONTAL ILLUMINANCE OF EVERY HOUR IS CALCULATED
+#ONCE FOR BOTH THE DIFFUSE AND THE GLOBAL LUMINOUS EFFICACY MODELS (globaleff), AND SORTED
+#WITHIN EACH MONTH AND CLOCK HOUR, SO THAT THE HOURS ABOVE ANY THRESHOLDS ARE FOUND BY
+#BISECTION (searchsorted) AND A SCHEDULE IS A MASK OVER THE (MONTH x HOUR) TABLE OF THEM.
+#
+#   query = illuminance_query('./Finningley.csv', 53.48*pi/180, -1.0, 0)
+#   query.hours_above([5, 10, 20], schedule_mask(hours=range(10, 18)))
+#
+#   python DaylightQuery.py ./Finningley.csv --thresholds 5,10,20 --hours 10-17 --months 1-12
+
+#imports the basic libraries
+import argparse
+
+import numpy as np
+
+from ClimAnalArrays import illuminance_array
+from ClimateData import read_climate
+from SkyState import calculate_sky_state, read_sky_state
+from TimeIndex import time_index
+
+#the number of (month x clock hour) groups
+numgroups = 12*24
+
+
+#this function returns a (month x clock hour) mask of the months (1 to 12) and clock hours (1
+#to 24, where hour 1 is 00:00-01:00) given, by default all of them
+def schedule_mask(months=None, hours=None):
+    month_mask = np.zeros(12, dtype=bool)
+    hour_mask = np.zeros(24, dtype=bool)
+    month_mask[np.asarray(list(range(1, 13) if months is None else months), dtype=int)-1] = True
+    hour_mask[np.asarray(list(range(1, 25) if hours is None else hours), dtype=int)-1] = True
+    schedule_mask = month_mask[:,None] & hour_mask[None,:]
+    return schedule_mask
+
+
+class IlluminanceQuery:
+#the horizontal illuminance (klux) of every hour (or time step) of the climate data of a
+#site at latitude lat (radians), by both luminous efficacy models, sorted within each month
+#and clock hour. The values of group g (month-1)*24 + clock hour-1 are stored as the keys
+#g*span + (illuminance-low), so that one searchsorted finds a threshold in every group at
+#once. The index and sky state are calculated if they are not given.
+
+    def __init__(self, data, lat, longitude, timezone, timeshift, index=None, skystate=None):
+        if index is None:
+            index = time_index(data)
+        if skystate is None:
+            skystate = calculate_sky_state(data, lat, longitude, timezone, timeshift, index)
+        self.timestep = index.timestep
+        group = (index.month-1)*24 + index.clock_hour-1
+        #the first row of each group, in the sorted order, and the end of the last
+        self.starts = np.concatenate(([0], np.cumsum(np.bincount(group, minlength=numgroups))))
+        illuminance = {}
+        for globaleff in (False, True):
+            illuminance[globaleff] = illuminance_array(globaleff, index.jday, skystate['solalt'], data['global'], data['diffuse'], skystate)*10**-3
+        self.low = min(illuminance[False].min(), illuminance[True].min()) if len(group) > 0 else 0.0
+        self.span = max(illuminance[False].max(), illuminance[True].max()) - self.low + 1 if len(group) > 0 else 1.0
+        self.keys = {}
+        for globaleff in (False, True):
+            order = np.lexsort((illuminance[globaleff], group))
+            self.keys[globaleff] = group[order]*self.span + (illuminance[globaleff][order]-self.low)
+
+
+    def above_table(self, thresholds, globaleff=False):
+    #returns the hours above each threshold (klux) in each month and clock hour, as a (12 x
+    #24) + thresholds.shape array
+        thresholds = np.asarray(thresholds, dtype=float)
+        #thresholds outside the values are moved just outside them, within their group
+        threshold_list = np.clip(thresholds.ravel()-self.low, -0.5, self.span-0.5)
+        key = np.arange(numgroups)[:,None]*self.span + threshold_list[None,:]
+        position = np.searchsorted(self.keys[globaleff], key, side='right')
+        above_table = (self.starts[1:,None]-position)*self.timestep
+        above_table = above_table.reshape((12, 24) + thresholds.shape)
+        return above_table
+
+
+    def hours_above(self, thresholds, schedule=None, globaleff=False):
+    #returns the hours above each threshold (klux) within a schedule (see schedule_mask; by
+    #default every hour), or within each of a stack (... x 12 x 24) of schedules, as a
+    #schedules.shape[:-2] + thresholds.shape array
+        above_table = self.above_table(thresholds, globaleff)
+        if schedule is None:
+            schedule = schedule_mask()
+        hours_above = np.tensordot(np.asarray(schedule, dtype=float), above_table, axes=([-2, -1], [0, 1]))
+        return hours_above
+
+
+    def scheduled_hours(self, schedule=None):
+    #returns the hours within a schedule, or each of a stack of schedules (see hours_above)
+        group_hours = (np.diff(self.starts)*self.timestep).reshape(12, 24)
+        if schedule is None:
+            schedule = schedule_mask()
+        scheduled_hours = np.tensordot(np.asarray(schedule, dtype=float), group_hours, axes=([-2, -1], [0, 1]))
+        return scheduled_hours
+
+
+#this function builds the illuminance query of a climate file, for a site at latitude lat
+#(radians), reading its sky state from the derived cache (see SkyState.read_sky_state)
+def illuminance_query(filename, lat, longitude, timezone, timeshift=None, timestep=None):
+    data = read_climate(filename, timestep=timestep)
+    skystate = read_sky_state(filename, lat, longitude, timezone, timeshift, timestep=timestep)
+    illuminance_query = IlluminanceQuery(data, lat, longitude, timezone, timeshift, skystate=skystate)
+    return illuminance_query
+
+
+#this function reads a list of integers such as '1-3,7' (as [1, 2, 3, 7])
+def parse_range(text):
+    parse_range = []
+    for part in text.split(','):
+        if '-' in part:
+            first, last = part.split('-')
+            parse_range.extend(range(int(first), int(last)+1))
+        elif part:
+            parse_range.append(int(part))
+    return parse_range
+
+
+if __name__ == '__main__':
+    import ClimAnalFunctions
+    parser = argparse.ArgumentParser(description='Hours of daylight above illuminance thresholds, within a schedule.')
+    parser.add_argument('filename', nargs='?', default=ClimAnalFunctions.filename, help='climate file')
+    parser.add_argument('--lat', type=float, default=ClimAnalFunctions.lat, help='latitude, degrees')
+    parser.add_argument('--lon', type=float, default=ClimAnalFunctions.longitude, help='longitude, degrees')
+    parser.add_argument('--timezone', type=float, default=ClimAnalFunctions.timezone, help='time zone, hours')
+    parser.add_argument('--timeshift', type=float, default=ClimAnalFunctions.timeshift, help='time shift, hours (default: the middle of each time step)')
+    parser.add_argument('--thresholds', default='5,10,20,30,50', help='comma separated thresholds, klux')
+    parser.add_argument('--months', default='1-12', help='months, e.g. 1-3,10-12')
+    parser.add_argument('--hours', default='1-24', help='clock hours (1 is 00:00-01:00), e.g. 10-17')
+    parser.add_argument('--globaleff', action='store_true', help='global (rather than diffuse) illuminance')
+    args = parser.parse_args()
+    thresholds = [float(threshold) for threshold in args.thresholds.split(',') if threshold]
+    query = illuminance_query(args.filename, args.lat*ClimAnalFunctions.pi/180, args.lon, args.timezone, args.timeshift, ClimAnalFunctions.timestep)
+    schedule = schedule_mask(parse_range(args.months), parse_range(args.hours))
+    scheduled = query.scheduled_hours(schedule)
+    print('threshold,hours_above,fraction_above')
+    for threshold, hours in zip(thresholds, query.hours_above(thresholds, schedule, args.globaleff)):
+        print('{0:g},{1:g},{2:1.4f}' .format(threshold, hours, hours/scheduled if scheduled > 0 else 0))
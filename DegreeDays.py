@@ -0,0 +1,174 @@
+##########################################################################################
+# PyClim was developed by Prof. Darren Robinson (University of Sheffield, 2019).         #
+# PyClim produces a range of graphs and statistics to support the analysis of climate    #
+# data, to support architectural / engineering / technology students to develop their    #
+# early-stage bioclimatic design concepts.                                               #
+##########################################################################################
+
+
+#THIS MODULE CALCULATES HEATING AND COOLING DEGREE-DAYS (FROM DAILY MEAN TEMPERATURES) AND
+#DEGREE-HOURS (FROM HOURLY OR SUB-HOURLY TEMPERATURES) FOR MANY BASE TEMPERATURES AT ONCE:
+#EACH DAY IS BROADCAST AGAINST EVERY BASE TEMPERATURE, AND THE RESULTING (BASE x DAY) MATRIX
+#IS SUMMED INTO MONTHS AND YEARS WITH A SINGLE reduceat. THE DATA CAN BE ADDED IN BLOCKS (SEE
+#ClimateData.iter_climate), SO THAT A MULTI-YEAR FILE NEED NOT BE HELD IN MEMORY.
+#
+#   results = stream_degree_days('./Finningley.csv', np.arange(10, 25.5, 0.5))
+
+#imports the basic libraries
+import numpy as np
+
+from ClimateData import iter_climate
+from TimeIndex import time_index
+
+#the default base temperatures, oC
+base_list = np.arange(10, 25.5, 0.5)
+
+
+class DegreeDayEngine:
+#accumulates monthly heating / cooling degree-days and degree-hours, for every base
+#temperature of base_list, for each year of a record. Rows are added in order, in blocks of
+#any size: a day that runs over the end of a block is completed by the next one. A new year
+#starts whenever the month steps backwards. Degree-hours are weighted by the time step of
+#the rows (hours).
+
+    def __init__(self, base_list=base_list, timestep=1.0):
+        self.base_list = np.asarray(base_list, dtype=float)
+        self.timestep = timestep
+        numbase = len(self.base_list)
+        #(year x base x month) totals
+        self.HDD = np.zeros((0, numbase, 12))
+        self.CDD = np.zeros((0, numbase, 12))
+        self.HDH = np.zeros((0, numbase, 12))
+        self.CDH = np.zeros((0, numbase, 12))
+        self.numdays = 0
+        self.year = 0
+        self.lastmonth = None
+        #the rows (year, month, day, dbt) of a day that is not yet complete
+        self.carry = (np.zeros(0, dtype=int), np.zeros(0, dtype=int), np.zeros(0, dtype=int), np.zeros(0))
+
+
+    def grow(self, numyears):
+    #makes room in the totals for numyears years
+        extra = numyears - len(self.HDD)
+        if extra > 0:
+            pad = ((0, extra), (0, 0), (0, 0))
+            self.HDD = np.pad(self.HDD, pad)
+            self.CDD = np.pad(self.CDD, pad)
+            self.HDH = np.pad(self.HDH, pad)
+            self.CDH = np.pad(self.CDH, pad)
+
+
+    def accumulate(self, totals_heat, totals_cool, year_list, month_list, temp_list, weight=1.0):
+    #adds max(base - t, 0) and max(t - base, 0) (times weight), for every base and every t, to
+    #the year and month of each t: one broadcast, then one reduceat over each run of rows in
+    #the same month
+        if len(temp_list) == 0:
+            return
+        code = year_list*12 + month_list
+        runstarts = np.flatnonzero(np.concatenate(([True], code[1:] != code[:-1])))
+        difference = self.base_list[:,None] - temp_list[None,:]
+        heat = np.add.reduceat(np.maximum(difference, 0), runstarts, axis=1)
+        cool = np.add.reduceat(np.maximum(-difference, 0), runstarts, axis=1)
+        runyear = year_list[runstarts]
+        runmonth = month_list[runstarts]-1
+        np.add.at(totals_heat, (runyear, slice(None), runmonth), heat.T*weight)
+        np.add.at(totals_cool, (runyear, slice(None), runmonth), cool.T*weight)
+
+
+    def add(self, month, day, dbt):
+    #adds a block of consecutive rows, given their month, day and dry bulb temperature
+        month = np.asarray(month, dtype=int)
+        day = np.asarray(day, dtype=int)
+        dbt = np.asarray(dbt, dtype=float)
+        if len(month) == 0:
+            return
+        previous = np.empty(len(month), dtype=int)
+        previous[0] = month[0] if self.lastmonth is None else self.lastmonth
+        previous[1:] = month[:-1]
+        year = self.year + np.cumsum(month < previous)
+        self.year = int(year[-1])
+        self.lastmonth = int(month[-1])
+        self.grow(self.year+1)
+
+        #degree-hours need no daily means, so every row is added now
+        self.accumulate(self.HDH, self.CDH, year, month, dbt, self.timestep)
+
+        #degree-days: the rows of complete days, plus the rows carried from the last block
+        year = np.concatenate((self.carry[0], year))
+        month = np.concatenate((self.carry[1], month))
+        day = np.concatenate((self.carry[2], day))
+        dbt = np.concatenate((self.carry[3], dbt))
+        newday = np.ones(len(day), dtype=bool)
+        newday[1:] = (day[1:] != day[:-1]) | (month[1:] != month[:-1]) | (year[1:] != year[:-1])
+        starts = np.flatnonzero(newday)
+        #the last day may continue in the next block
+        self.carry = (year[starts[-1]:], month[starts[-1]:], day[starts[-1]:], dbt[starts[-1]:])
+        self.add_days(year[:starts[-1]], month[:starts[-1]], dbt[:starts[-1]], starts[:-1])
+
+
+    def add_days(self, year, month, dbt, starts):
+    #adds the degree-days of complete days, whose first rows are at starts
+        if len(starts) == 0:
+            return
+        count = np.diff(np.append(starts, len(dbt)))
+        dailymeantemp_list = np.add.reduceat(dbt, starts)/count
+        self.accumulate(self.HDD, self.CDD, year[starts], month[starts], dailymeantemp_list)
+        self.numdays = self.numdays + len(starts)
+
+
+    def finish(self):
+    #completes the last day, once every block has been added
+        year, month, day, dbt = self.carry
+        if len(dbt) > 0:
+            self.add_days(year, month, dbt, np.array([0]))
+        self.carry = (np.zeros(0, dtype=int), np.zeros(0, dtype=int), np.zeros(0, dtype=int), np.zeros(0))
+
+
+    def results(self):
+    #returns a dictionary of the base temperatures and (base x month) degree-days and
+    #degree-hours per year (mean of all years), and (base x year) annual degree-days
+        numyears = max(len(self.HDD), 1)
+        results = {}
+        results['base_list'] = self.base_list
+        results['MonthlyHDD'] = self.HDD.sum(axis=0)/numyears
+        results['MonthlyCDD'] = self.CDD.sum(axis=0)/numyears
+        results['MonthlyHDH'] = self.HDH.sum(axis=0)/numyears
+        results['MonthlyCDH'] = self.CDH.sum(axis=0)/numyears
+        results['AnnualHDD'] = self.HDD.sum(axis=2).T
+        results['AnnualCDD'] = self.CDD.sum(axis=2).T
+        results['numyears'] = len(self.HDD)
+        results['numdays'] = self.numdays
+        return results
+
+
+#this function calculates the degree-days and degree-hours of climate data already read
+#(see ClimateData), in one pass
+def degree_days(data, base_list=base_list):
+    engine = DegreeDayEngine(base_list, time_index(data).timestep)
+    engine.add(data['month'], data['day'], data['dbt'])
+    engine.finish()
+    degree_days = engine.results()
+    return degree_days
+
+
+#this function calculates the degree-days and degree-hours of a climate file, reading it
+#chunk_rows rows at a time. The time step (hours) is found from the first block if it is
+#not given.
+def stream_degree_days(filename, base_list=base_list, chunk_rows=744, use_cache=True, timestep=None):
+    engine = DegreeDayEngine(base_list, timestep)
+    for block in iter_climate(filename, chunk_rows, use_cache):
+        if engine.timestep is None:
+            engine.timestep = time_index(block).timestep
+        engine.add(block['month'], block['day'], block['dbt'])
+    engine.finish()
+    stream_degree_days = engine.results()
+    return stream_degree_days
+
+
+#this function writes the mean annual degree-days and degree-hours of each base temperature
+#as a csv file
+def write_degree_days(results, filename):
+    table = np.column_stack((results['base_list'],
+                             results['MonthlyHDD'].sum(axis=1), results['MonthlyCDD'].sum(axis=1),
+                             results['MonthlyHDH'].sum(axis=1), results['MonthlyCDH'].sum(axis=1)))
+    np.savetxt(filename, table, delimiter=',', header='base,HDD,CDD,HDH,CDH', comments='', fmt='%g')
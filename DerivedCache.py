@@ -0,0 +1,213 @@
+##########################################################################################
+# PyClim was developed by Prof. Darren Robinson (University of Sheffield, 2019).         #
+# PyClim produces a range of graphs and statistics to support the analysis of climate    #
+# data, to support architectural / engineering / technology students to develop their    #
+# early-stage bioclimatic design concepts.                                               #
+##########################################################################################
+
+
+#THIS MODULE KEEPS AN ON-DISK CACHE OF ARRAYS DERIVED FROM A CLIMATE FILE: SUN POSITIONS,
+#CLOCK-SOLAR TIME DIFFERENCES, DAY LENGTHS, SUNRISE / SUNSET TIMES AND (FOR SkyState) THE
+#SKY STATE. EACH ENTRY IS KEYED ON A HASH OF ITS NAME, THE SITE (lat, longitude, timezone,
+#timeshift), THE TIME RESOLUTION AND THE CONTENT OF THE CLIMATE FILE, SO THAT REPEATED RUNS
+#OVER THE SAME STATIONS READ RATHER THAN RECALCULATE THEM. THE CACHE IS BOUNDED IN SIZE:
+#THE LEAST RECENTLY USED ENTRIES ARE REMOVED FIRST.
+
+#imports the basic libraries
+import hashlib
+import os
+import numpy as np
+
+from ClimAnalArrays import solar_position, time_diff_array, daylength_array, declin_angle_array
+from ClimateData import read_climate, cache_dir, cache_key
+from TimeIndex import time_index
+from WeatherStats import sunrise_sunset
+
+#increment this whenever a derived quantity changes, so that old entries are not reused
+derived_version = 1
+#the sub-folder of each climate file's cache folder, and its size limit in bytes
+derived_dir = 'derived'
+max_cache_bytes = 256*1024**2
+
+#content digests of the climate files already hashed, keyed on ClimateData.cache_key
+digest_memo = {}
+#the caches already opened, keyed on their folder
+cache_memo = {}
+
+
+class DerivedCache:
+#a folder of derived arrays, limited to max_bytes. Single arrays are saved as .npy files
+#(and memory-mapped when read), tuples of arrays as .npz files. Each read or write marks the
+#entry as recently used, by its modification time.
+
+    def __init__(self, folder, max_bytes=max_cache_bytes):
+        self.folder = folder
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+
+    def key(self, name, params):
+        key = repr((derived_version, name) + tuple(params))
+        key = name + '.' + hashlib.sha1(key.encode('utf-8')).hexdigest()[:16]
+        return key
+
+
+    def load(self, key):
+    #returns the cached result, or None if there is none (or it cannot be read)
+        for extension in ['.npy', '.npz']:
+            path = os.path.join(self.folder, key + extension)
+            if os.path.exists(path):
+                try:
+                    if extension == '.npy':
+                        result = np.load(path, mmap_mode='r')
+                    else:
+                        with np.load(path) as cached:
+                            result = tuple(cached['a' + str(i)] for i in range(len(cached.files)))
+                    os.utime(path)
+                    return result
+                except (OSError, ValueError, KeyError):
+                    return None
+        return None
+
+
+    def save(self, key, result):
+    #saves a result (an array, or a tuple of arrays), then evicts old entries if need be
+        os.makedirs(self.folder, exist_ok=True)
+        if isinstance(result, tuple):
+            path = os.path.join(self.folder, key + '.npz')
+        else:
+            path = os.path.join(self.folder, key + '.npy')
+        tmp = path + '.' + str(os.getpid()) + '.tmp'
+        with open(tmp, 'wb') as f:
+            if isinstance(result, tuple):
+                np.savez(f, **{'a' + str(i): np.asarray(x) for i, x in enumerate(result)})
+            else:
+                np.save(f, np.asarray(result))
+        os.replace(tmp, path)
+        self.evict(keep=path)
+
+
+    def evict(self, keep=None):
+    #removes the least recently used entries until the folder is within max_bytes
+        entries = []
+        for name in os.listdir(self.folder):
+            if name.endswith('.npy') or name.endswith('.npz'):
+                path = os.path.join(self.folder, name)
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, path))
+        entries.sort()
+        total = sum(entry[1] for entry in entries)
+        for mtime, size, path in entries:
+            if total <= self.max_bytes:
+                break
+            if path == keep:
+                continue
+            try:
+                os.remove(path)
+                self.evictions = self.evictions + 1
+            except OSError:
+                pass
+            total = total - size
+
+
+    def get(self, name, params, compute):
+    #returns the cached result of compute() for (name, params), calculating and saving it
+    #on a miss
+        key = self.key(name, params)
+        result = self.load(key)
+        if result is not None:
+            self.hits = self.hits + 1
+            return result
+        self.misses = self.misses + 1
+        result = compute()
+        try:
+            self.save(key, result)
+        except OSError:
+            #a read-only data directory simply means that we recalculate every time
+            pass
+        return result
+
+
+    def stats(self):
+        stats = {'folder': self.folder, 'hits': self.hits, 'misses': self.misses, 'evictions': self.evictions}
+        return stats
+
+
+#this function returns the SHA-1 digest of the content of a climate file
+def file_digest(filename):
+    memo = cache_key(filename)
+    if memo not in digest_memo:
+        digest = hashlib.sha1()
+        with open(filename, 'rb') as f:
+            for block in iter(lambda: f.read(2**20), b''):
+                digest.update(block)
+        digest_memo[memo] = digest.hexdigest()
+    return digest_memo[memo]
+
+
+#this function returns the derived cache of a climate file, in its cache folder
+def derived_cache(filename, max_bytes=max_cache_bytes):
+    folder = os.path.join(os.path.dirname(os.path.abspath(filename)), cache_dir, derived_dir)
+    if folder not in cache_memo:
+        cache_memo[folder] = DerivedCache(folder, max_bytes)
+    return cache_memo[folder]
+
+
+#this function returns the hit / miss / eviction counts of every cache used in this session
+def cache_stats():
+    cache_stats = [cache.stats() for cache in cache_memo.values()]
+    return cache_stats
+
+
+#this function returns the key parameters of a climate file: its content digest and time
+#resolution (rows per day), followed by the site parameters given
+def derived_params(filename, index, *site):
+    resolution = int(np.median(index.count('day'))) if index.numhours > 0 else 0
+    derived_params = (file_digest(filename), resolution) + tuple(float(x) for x in site)
+    return derived_params
+
+
+#XXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXX########
+# CACHED SOLAR QUANTITIES
+#XXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXX########
+
+#the solar altitude, azimuth, declination and clock-solar time difference of every row of
+#a climate file, for a site at latitude lat (radians), see ClimAnalArrays.solar_position
+def cached_solar_position(filename, lat, longitude, timezone, timeshift):
+    index = time_index(read_climate(filename))
+    timeshift = index.timeshift(timeshift)
+    compute = lambda: solar_position(index.jday, index.hour, lat, longitude, timezone, timeshift)
+    cached_solar_position = derived_cache(filename).get('solar_position', derived_params(filename, index, lat, longitude, timezone, timeshift), compute)
+    return cached_solar_position
+
+
+#the clock-solar time difference of every day of a climate file
+def cached_time_diff(filename, longitude, timezone, timeshift, EqTonly=False):
+    index = time_index(read_climate(filename))
+    timeshift = index.timeshift(timeshift)
+    compute = lambda: time_diff_array(index.first(index.jday, 'day'), EqTonly, longitude, timezone, timeshift)
+    cached_time_diff = derived_cache(filename).get('time_diff', derived_params(filename, index, longitude, timezone, timeshift, EqTonly), compute)
+    return cached_time_diff
+
+
+#the solar day length (hours) of every day of a climate file
+def cached_daylength(filename, lat):
+    index = time_index(read_climate(filename))
+    compute = lambda: daylength_array(declin_angle_array(index.first(index.jday, 'day')), lat)
+    cached_daylength = derived_cache(filename).get('daylength', derived_params(filename, index, lat), compute)
+    return cached_daylength
+
+
+#the (clock) sunrise and sunset times of every day of a climate file, see WeatherStats
+def cached_sunrise_sunset(filename, lat, longitude, timezone, timeshift):
+    index = time_index(read_climate(filename))
+    timeshift = index.timeshift(timeshift)
+    compute = lambda: sunrise_sunset(index.first(index.jday, 'day'), lat, longitude, timezone, timeshift)
+    cached_sunrise_sunset = derived_cache(filename).get('sunrise_sunset', derived_params(filename, index, lat, longitude, timezone, timeshift), compute)
+    return cached_sunrise_sunset
+
@@ -0,0 +1,109 @@
+##########################################################################################
+# PyClim was developed by Prof. Darren Robinson (University of Sheffield, 2019).         #
+# PyClim produces a range of graphs and statistics to support the analysis of climate    #
+# data, to support architectural / engineering / technology students to develop their    #
+# early-stage bioclimatic design concepts.                                               #
+##########################################################################################
+
+
+#THIS MODULE EVALUATES MANY EVAPORATIVE COOLING SCENARIOS AT ONCE. AS IN psychros, HOURS AT
+#OR ABOVE A LOWER LIMIT OF DRY BULB TEMPERATURE (LLdbt) ARE SHIFTED ALONG THEIR WET BULB LINE
+#BY A FRACTION (EvapCoolEff) OF THE WET BULB DEPRESSION. THE WET BULB DEPRESSION IS FOUND
+#ONCE PER HOUR; EVERY (EvapCoolEff, LLdbt) SCENARIO IS THEN A BROADCAST OVER A SCENARIO AXIS.
+
+#imports the basic libraries
+import numpy as np
+
+from ClimAnalArrays import g_array, twetrh_array, g_dry_wet_array
+
+#a target comfort zone on the psychrometric chart: dry bulb (oC) and moisture content (kg/kg)
+comfort_zone = (20, 27, 0.004, 0.012)
+
+#the columns of the results table
+sweep_dtype = np.dtype([('EvapCoolEff', float),
+                        ('LLdbt', float),
+                        ('hours_shifted', int),
+                        ('hours_in_zone', int),
+                        ('hours_into_zone', int),
+                        ('mean_dbt', float),
+                        ('max_dbt', float),
+                        ('mean_g', float)])
+
+
+#this function returns the lower limit of dry bulb temperature of the Martinez limit, for
+#each hour's moisture content
+def martinez_limit(g):
+    martinez_limit = 29 + g / -0.0055 #where -0.0055 = dy/dx of PDEC line
+    return martinez_limit
+
+
+#this function evaluates every combination of EvapCoolEff_list and LLdbt_list (an LLdbt of
+#nan applies the Martinez limit), for hourly dry bulb temperatures and RH. It returns a
+#results table (a structured array with the fields of sweep_dtype, one row per scenario)
+#and, for each scenario, the shifted dry bulb temperatures and moisture contents
+#(scenarios x hours). Hours are counted in the comfort zone (tlow, thigh, glow, ghigh)
+#after shifting, and into it if they were outside it beforehand.
+def evap_cool_sweep(temp_list, rh_list, EvapCoolEff_list, LLdbt_list, zone=comfort_zone, Screen=False):
+    temp_list = np.asarray(temp_list, dtype=float)
+    rh_list = np.asarray(rh_list, dtype=float)
+    EvapCoolEff_grid, LLdbt_grid = np.meshgrid(np.asarray(EvapCoolEff_list, dtype=float), np.asarray(LLdbt_list, dtype=float), indexing='ij')
+    EvapCoolEff_grid = EvapCoolEff_grid.ravel()
+    LLdbt_grid = LLdbt_grid.ravel()
+
+    #the state of every hour on the chart, which is common to all scenarios
+    g_list = g_array(temp_list, rh_list)
+    twet_list = twetrh_array(temp_list, rh_list, Screen)
+    wbtd_list = temp_list - twet_list
+
+    #the scenario axis is the first axis of everything that follows
+    LLdbt_hours = np.where(np.isnan(LLdbt_grid)[:,None], martinez_limit(g_list), LLdbt_grid[:,None])
+    shifted = temp_list >= LLdbt_hours
+    cooled_temp_list = temp_list - EvapCoolEff_grid[:,None]*wbtd_list
+    shifted_temp_list = np.where(shifted, cooled_temp_list, temp_list)
+    shifted_g_list = np.where(shifted, g_dry_wet_array(cooled_temp_list, twet_list), g_list)
+
+    tlow, thigh, glow, ghigh = zone
+    inzone_before = (temp_list >= tlow) & (temp_list <= thigh) & (g_list >= glow) & (g_list <= ghigh)
+    inzone = (shifted_temp_list >= tlow) & (shifted_temp_list <= thigh) & (shifted_g_list >= glow) & (shifted_g_list <= ghigh)
+
+    table = np.zeros(len(EvapCoolEff_grid), dtype=sweep_dtype)
+    table['EvapCoolEff'] = EvapCoolEff_grid
+    table['LLdbt'] = LLdbt_grid
+    table['hours_shifted'] = shifted.sum(axis=1)
+    table['hours_in_zone'] = inzone.sum(axis=1)
+    table['hours_into_zone'] = (inzone & ~inzone_before).sum(axis=1)
+    table['mean_dbt'] = shifted_temp_list.mean(axis=1)
+    table['max_dbt'] = shifted_temp_list.max(axis=1)
+    table['mean_g'] = shifted_g_list.mean(axis=1)
+    return table, shifted_temp_list, shifted_g_list
+
+
+#this function writes the results table as a csv file
+def write_sweep(table, filename):
+    np.savetxt(filename, table, delimiter=',', header=','.join(table.dtype.names), comments='',
+               fmt=['%g' if table.dtype[name].kind == 'f' else '%d' for name in table.dtype.names])
+
+
+#this function plots the hours brought into the comfort zone of a results table of
+#evap_cool_sweep, for each EvapCoolEff (x axis) and LLdbt (y axis) of the lists it was given;
+#the Martinez limit (an LLdbt of nan) is labelled as such
+def plot_sweep(table, EvapCoolEff_list, LLdbt_list, ax=None):
+    import matplotlib.pyplot as plt
+    if ax is None:
+        fig,ax = plt.subplots(1,1, figsize=(12, 6), tight_layout=True)
+    #rows run through LLdbt_list for each EvapCoolEff in turn
+    EvapCoolEff_list = np.asarray(EvapCoolEff_list, dtype=float)
+    LLdbt_list = np.asarray(LLdbt_list, dtype=float)
+    if len(table) != len(EvapCoolEff_list)*len(LLdbt_list):
+        raise ValueError('the table has {0} rows, not one per EvapCoolEff and LLdbt ({1} x {2})' .format(len(table), len(EvapCoolEff_list), len(LLdbt_list)))
+    hours = table['hours_into_zone'].reshape(len(EvapCoolEff_list), len(LLdbt_list))
+    cp = ax.pcolormesh(np.arange(len(EvapCoolEff_list)+1)-0.5, np.arange(len(LLdbt_list)+1)-0.5, hours.T, cmap='jet')
+    ax.set_xticks(np.arange(len(EvapCoolEff_list)))
+    ax.set_xticklabels(['{0:g}'.format(eff) for eff in EvapCoolEff_list])
+    ax.set_yticks(np.arange(len(LLdbt_list)))
+    ax.set_yticklabels(['Martinez' if np.isnan(ll) else '{0:g}'.format(ll) for ll in LLdbt_list])
+    ax.set_xlabel('Evaporative cooling effectiveness')
+    ax.set_ylabel('Lower limit of dry bulb temperature, $^o$C')
+    ax.set_title('Hours brought into the comfort zone by evaporative cooling')
+    ax.figure.colorbar(cp, ax=ax, label = 'Hours')
+    return ax
@@ -0,0 +1,111 @@
+##########################################################################################
+# PyClim was developed by Prof. Darren Robinson (University of Sheffield, 2019).         #
+# PyClim produces a range of graphs and statistics to support the analysis of climate    #
+# data, to support architectural / engineering / technology students to develop their    #
+# early-stage bioclimatic design concepts.                                               #
+##########################################################################################
+
+
+#THIS MODULE BINS A SERIES (TEMPERATURE, WIND SPEED, ILLUMINANCE, ...) ONCE, OVER GIVEN OR
+#DEFAULT BIN EDGES, AND DERIVES ITS CUMULATIVE (HOURS BELOW) AND EXCEEDANCE (HOURS ABOVE)
+#CURVES FROM THE COUNTS, SO THAT THE WeatherAnalysis FREQUENCY PLOTS NEED NOT RE-BIN THE
+#SERIES FOR EACH CURVE. THE SORTED SERIES IS KEPT, SO THAT THE HOURS BELOW OR ABOVE ANY
+#THRESHOLDS ARE FOUND BY BISECTION RATHER THAN BY BINNING AGAIN.
+#
+#   table = frequency_table(data['dbt'])
+#   table.above([25, 28])
+
+#imports the basic libraries
+import copy
+
+import numpy as np
+
+
+#this function returns the default bin edges of the WeatherAnalysis frequency plots: bins of
+#(about) one unit, from low (by default the minimum) to the maximum of the values. Where no
+#value is above low (or there are none) it is a single bin of one unit from low.
+def histogram_edges(values, low=None):
+    values = np.asarray(values, dtype=float).ravel()
+    values = values[~np.isnan(values)]
+    if len(values) == 0:
+        low = 0.0 if low is None else low
+        return np.array([low, low+1.0])
+    numbins = max(int(values.max()-int(values.min())), 1)
+    if low is None:
+        low = values.min()
+    high = values.max()
+    if high <= low:
+        high = low+1.0
+    histogram_edges = np.linspace(low, high, numbins+1)
+    return histogram_edges
+
+
+class FrequencyTable:
+#the frequency distribution of a series over bin edges (each bin holds its lower edge, and
+#the last also its upper edge, as np.histogram). counts, cumulative (the values below the
+#upper edge of each bin) and exceedance (the values from the lower edge of each bin) count
+#values in the bins only; below and above count every value, in hours for a series of time
+#steps of timestep hours. A binned copy keeps the bins without the series, e.g. to send to a
+#worker process that only draws them.
+
+    def __init__(self, values, edges, timestep=1.0):
+        values = np.asarray(values, dtype=float).ravel()
+        self.sorted = np.sort(values[~np.isnan(values)])
+        self.edges = np.asarray(edges, dtype=float)
+        self.timestep = timestep
+        self.counts = np.histogram(self.sorted, self.edges)[0]
+        self.cumulative = np.cumsum(self.counts)
+        self.exceedance = np.cumsum(self.counts[::-1])[::-1]
+
+
+    def binned(self):
+    #returns a copy of the table without the sorted series (so without below and above)
+        binned = copy.copy(self)
+        binned.sorted = None
+        return binned
+
+
+    def check_sorted(self):
+    #raises an error if the sorted series has been dropped (see binned)
+        if self.sorted is None:
+            raise ValueError('a binned FrequencyTable has no series to find thresholds in')
+
+
+    def below(self, thresholds):
+    #returns the hours with values below each threshold
+        self.check_sorted()
+        below = np.searchsorted(self.sorted, thresholds, side='left')*self.timestep
+        return below
+
+
+    def above(self, thresholds):
+    #returns the hours with values above each threshold
+        self.check_sorted()
+        above = (len(self.sorted)-np.searchsorted(self.sorted, thresholds, side='right'))*self.timestep
+        return above
+
+
+    def table(self):
+    #returns the binned table as a dictionary of columns: the lower and upper edge of each bin,
+    #and its hours, cumulative hours (below the upper edge) and exceedance hours (from the lower edge)
+        table = {}
+        table['lower'] = self.edges[:-1]
+        table['upper'] = self.edges[1:]
+        table['hours'] = self.counts*self.timestep
+        table['cumulative'] = self.cumulative*self.timestep
+        table['exceedance'] = self.exceedance*self.timestep
+        return table
+
+
+    def write(self, filename):
+    #writes the binned table as a csv file
+        table = self.table()
+        np.savetxt(filename, np.column_stack([table[column] for column in table]), delimiter=',', header=','.join(table), comments='', fmt='%g')
+
+
+#this function bins values over edges (by default those of histogram_edges, from low)
+def frequency_table(values, edges=None, low=None, timestep=1.0):
+    if edges is None:
+        edges = histogram_edges(values, low)
+    frequency_table = FrequencyTable(values, edges, timestep)
+    return frequency_table
@@ -0,0 +1,190 @@
+##########################################################################################
+# PyClim was developed by Prof. Darren Robinson (University of Sheffield, 2019).         #
+# PyClim produces a range of graphs and statistics to support the analysis of climate    #
+# data, to support architectural / engineering / technology students to develop their    #
+# early-stage bioclimatic design concepts.                                               #
+##########################################################################################
+
+
+#THIS MODULE CREATES THE BACKGROUND OF A PSYCHROMETRIC CHART: THE RH CURVES, CONSTANT
+#MOISTURE CONTENT LINES, DRY BULB VERTICALS AND WET BULB LINES. THESE ARE CALCULATED ONCE
+#PER AXIS RANGE AND ATMOSPHERIC PRESSURE, AND MEMOIZED BOTH IN MEMORY AND ON DISK, SO THAT
+#LATER CHARTS ONLY NEED TO DRAW THEM: EITHER AS A SINGLE LINE COLLECTION OR AS A CACHED
+#RASTER UNDERLAY.
+
+#imports the basic libraries
+import hashlib
+import os
+import numpy as np
+
+from ClimAnalArrays import g_array, tsat_array, g_dry_wet_array
+
+#increment this whenever the chart lines change, so that old disk caches are not reused
+chart_version = 1
+cache_dir = '.pyclim_cache'
+#charts already built in this session, keyed as on disk
+chart_memo = {}
+
+
+class PsychroChart:
+#the lines of a psychrometric chart with dry bulb temperatures tmin to tmax (oC) and moisture
+#contents 0 to gmax (kg/kg), at atmospheric pressure patm (kPa). Wet bulb lines are drawn
+#from tmin up to (but excluding) wbtmax.
+
+    def __init__(self, tmin=-10, tmax=60, gmax=0.03, patm=101.325, wbtmax=40, folder=cache_dir):
+        self.tmin = tmin
+        self.tmax = tmax
+        self.gmax = gmax
+        self.patm = patm
+        self.wbtmax = wbtmax
+        self.folder = folder
+        key = repr((chart_version, tmin, tmax, gmax, patm, wbtmax))
+        self.key = hashlib.sha1(key.encode('utf-8')).hexdigest()[:16]
+        self.segments = self.load_lines()
+
+
+    def calculate_lines(self):
+    #calculates every line of the chart, returning a list of (npoints x 2) arrays
+        segments = []
+        temp_x_list = np.arange(self.tmin, self.tmax+1, dtype=float)
+
+        #relative humidity curves, from 10 to 100%
+        rh_grid = np.arange(10, 110, 10)[:,None]
+        g_grid = g_array(temp_x_list[None,:], rh_grid, self.patm)
+        for line in g_grid:
+            segments.append(np.column_stack((temp_x_list, line)))
+
+        #constant moisture content lines, from saturation to tmax
+        mc_list = 0.005*np.arange(1, int(round(self.gmax/0.005))+1)
+        for tsat, mc in zip(tsat_array(mc_list, self.patm), mc_list):
+            segments.append(np.array([[tsat, mc], [self.tmax, mc]]))
+
+        #dry bulb verticals, from 0 to saturation
+        dbt_list = np.arange(self.tmin, self.tmax, 5, dtype=float)
+        gsat_list = np.minimum(g_dry_wet_array(dbt_list, dbt_list, self.patm), 0.3)
+        for dbt, gsat in zip(dbt_list, gsat_list):
+            segments.append(np.array([[dbt, 0], [dbt, gsat]]))
+
+        #wet bulb lines, from saturation to tmax
+        wbt_grid = np.arange(self.tmin, self.wbtmax, 5, dtype=float)[:,None]
+        g_grid = g_dry_wet_array(temp_x_list[None,:], wbt_grid, self.patm)
+        for wbt, line in zip(wbt_grid[:,0], g_grid):
+            drier = temp_x_list >= wbt
+            segments.append(np.column_stack((temp_x_list[drier], line[drier])))
+        return segments
+
+
+    def cache_file(self, extension):
+        return os.path.join(self.folder, 'psychrochart.' + self.key + extension)
+
+
+    def load_lines(self):
+    #returns the chart lines from memory, from disk, or (failing both) by calculating them
+        if self.key in chart_memo:
+            return chart_memo[self.key]
+        linefile = self.cache_file('.npz')
+        segments = None
+        if os.path.exists(linefile):
+            try:
+                with np.load(linefile) as cached:
+                    segments = np.split(cached['points'], cached['breaks'])
+            except (OSError, ValueError, KeyError):
+                segments = None
+        if segments is None:
+            segments = self.calculate_lines()
+            try:
+                os.makedirs(self.folder, exist_ok=True)
+                breaks = np.cumsum([len(line) for line in segments])[:-1]
+                tmp = linefile + '.' + str(os.getpid()) + '.tmp'
+                with open(tmp, 'wb') as f:
+                    np.savez(f, points=np.concatenate(segments), breaks=breaks)
+                os.replace(tmp, linefile)
+            except OSError:
+                pass
+        chart_memo[self.key] = segments
+        return segments
+
+
+    def draw_axes(self, ax):
+    #sets the limits, labels and right-hand border of a psychrometric chart
+        ax.set_ylim(0, self.gmax)
+        ax.set_xlim(self.tmin, self.tmax)
+        ax.set_xlabel('Dry bulb temperature, $^o$C')
+        ax.set_ylabel('Moisture content, kg/kg (dry air)')
+        ax.axvline(x=self.tmax, color='lightgrey')
+
+
+    def draw(self, ax, raster=False, color='darkgray', lw=1):
+    #draws the chart background on ax, either as one LineCollection artist or, with raster
+    #True, as an image underlay rendered (once, then cached) from the same lines
+        if raster == True:
+            ax.imshow(self.raster(color, lw), extent=(self.tmin, self.tmax, 0, self.gmax),
+                      aspect='auto', origin='upper', zorder=0, interpolation='bilinear')
+        else:
+            from matplotlib.collections import LineCollection
+            ax.add_collection(LineCollection(self.segments, colors=color, linewidths=lw, zorder=1))
+        self.draw_axes(ax)
+
+
+    def raster(self, color='darkgray', lw=1, width=1200, height=800):
+    #returns the chart background as an RGBA array, rendering it off-screen the first time
+        imagefile = self.cache_file('.' + str(color) + '.' + str(lw) + '.' + str(width) + 'x' + str(height) + '.npy')
+        if imagefile in chart_memo:
+            return chart_memo[imagefile]
+        if os.path.exists(imagefile):
+            try:
+                image = np.load(imagefile)
+                chart_memo[imagefile] = image
+                return image
+            except (OSError, ValueError):
+                pass
+        from matplotlib.backends.backend_agg import FigureCanvasAgg
+        from matplotlib.collections import LineCollection
+        from matplotlib.figure import Figure
+        fig = Figure(figsize=(width/100, height/100), dpi=100)
+        canvas = FigureCanvasAgg(fig)
+        ax = fig.add_axes((0, 0, 1, 1))
+        ax.add_collection(LineCollection(self.segments, colors=color, linewidths=lw))
+        ax.set_xlim(self.tmin, self.tmax)
+        ax.set_ylim(0, self.gmax)
+        ax.axis('off')
+        fig.patch.set_alpha(0)
+        canvas.draw()
+        image = np.asarray(canvas.buffer_rgba()).copy()
+        try:
+            os.makedirs(self.folder, exist_ok=True)
+            tmp = imagefile + '.' + str(os.getpid()) + '.tmp'
+            with open(tmp, 'wb') as f:
+                np.save(f, image)
+            os.replace(tmp, imagefile)
+        except OSError:
+            pass
+        chart_memo[imagefile] = image
+        return image
+
+
+    def bin_hours(self, temp, g, month=None, tstep=0.5, gstep=0.00025):
+    #counts the hours in each (dry bulb, moisture content) cell of the chart, in one pass.
+    #Returns counts (temperature bins x moisture bins) and the bin edges; given the month of
+    #each hour, counts gains a leading axis of 12 months. Hours off the chart are not counted.
+        tedges = self.tmin + tstep*np.arange(int(round((self.tmax-self.tmin)/tstep))+1)
+        gedges = gstep*np.arange(int(round(self.gmax/gstep))+1)
+        nt = len(tedges)-1
+        ng = len(gedges)-1
+        tbin = np.floor((np.asarray(temp, dtype=float)-self.tmin)/tstep).astype(int)
+        gbin = np.floor(np.asarray(g, dtype=float)/gstep).astype(int)
+        onchart = (tbin >= 0) & (tbin < nt) & (gbin >= 0) & (gbin < ng)
+        cell = tbin[onchart]*ng + gbin[onchart]
+        if month is None:
+            counts = np.bincount(cell, minlength=nt*ng).reshape(nt, ng)
+        else:
+            cell = (np.asarray(month, dtype=int)[onchart]-1)*nt*ng + cell
+            counts = np.bincount(cell, minlength=12*nt*ng).reshape(12, nt, ng)
+        return counts, tedges, gedges
+
+
+    def draw_density(self, ax, counts, tedges, gedges, cmap='jet'):
+    #draws binned hour counts (from bin_hours) as a coloured mesh on the chart; empty cells
+    #are left transparent so that the chart lines show through
+        mesh = ax.pcolormesh(tedges, gedges, np.ma.masked_equal(counts, 0).T, cmap=cmap, zorder=2)
+        return mesh
@@ -0,0 +1,110 @@
+##########################################################################################
+# PyClim was developed by Prof. Darren Robinson (University of Sheffield, 2019).         #
+# PyClim produces a range of graphs and statistics to support the analysis of climate    #
+# data, to support architectural / engineering / technology students to develop their    #
+# early-stage bioclimatic design concepts.                                               #
+##########################################################################################
+
+
+#THIS MODULE RESAMPLES CLIMATE DATA (SEE ClimateData) TO ANOTHER TIME STEP, E.G. 1 MINUTE OR
+#10 MINUTE MONITORING DATA TO HOURLY, OR HOURLY DATA TO 10 MINUTES. TO A LONGER STEP, THE
+#ROWS OF EACH NEW STEP ARE AVERAGED WITH ONE reduceat: TEMPERATURE, RH, IRRADIANCE AND WIND
+#SPEED ARE MEANS AND WIND DIRECTION IS THE DIRECTION OF THE MEAN WIND VECTOR. TO A SHORTER
+#STEP, IRRADIANCE IS HELD OVER EACH OLD STEP (SO THAT THE IRRADIATION IS UNCHANGED) AND
+#TEMPERATURE, RH AND THE WIND VECTOR ARE INTERPOLATED BETWEEN THE MIDDLES OF THE OLD STEPS.
+#EITHER WAY EACH NEW STEP IS LABELLED BY ITS END, AS IN HOURLY FILES.
+#
+#   hourly = resample(read_climate('./site_10min.csv'), 1)
+
+#imports the basic libraries
+import numpy as np
+
+from ClimateData import climate_dtype
+from TimeIndex import time_index
+
+#the irradiance fields, and the fields averaged (or interpolated) as they are
+irradiance_fields = ['global', 'diffuse']
+mean_fields = ['dbt', 'rh', 'winspeed']
+
+
+#this function returns the wind vector components (towards the east and north, for the
+#direction that the wind approaches from) of wind speeds and directions (degrees)
+def wind_components(winspeed, windir):
+    windir = np.radians(windir)
+    u = winspeed*np.sin(windir)
+    v = winspeed*np.cos(windir)
+    return u, v
+
+
+#this function returns the direction (degrees, 0 to 360) of wind vector components
+def wind_direction(u, v):
+    wind_direction = np.degrees(np.arctan2(u, v)) % 360
+    return wind_direction
+
+
+#this function resamples climate data to timestep (hours, dividing 24). Irradiance is given
+#as the mean over each step (W/m2, as in hourly files) or, with irradiance='integrate', as
+#the irradiation in each step (Wh/m2). Returns a structured array of climate_dtype.
+def resample(data, timestep, index=None, irradiance='mean'):
+    if index is None:
+        index = time_index(data)
+    timestep = float(timestep)
+    if abs(24/timestep - round(24/timestep)) > 1e-6:
+        raise ValueError('the time step must divide a day: ' + str(timestep))
+    if abs(timestep - index.timestep) < 1e-9:
+        resample = np.array(data, dtype=climate_dtype)
+    elif timestep > index.timestep:
+        resample = coarsen(data, timestep, index)
+    else:
+        resample = refine(data, timestep, index)
+    if irradiance == 'integrate':
+        for field in irradiance_fields:
+            resample[field] = resample[field]*timestep
+    return resample
+
+
+#this function averages climate data into the longer timestep (hours): every row whose step
+#starts within a new step is part of it
+def coarsen(data, timestep, index):
+    perday = int(round(24/timestep))
+    step = np.minimum(np.floor(index.start_hour/timestep + 1e-6).astype(int), perday-1)
+    code = index.daynum*perday + step
+    starts = np.flatnonzero(np.concatenate(([True], code[1:] != code[:-1])))
+    count = np.diff(np.append(starts, len(code)))
+
+    coarsen = np.zeros(len(starts), dtype=climate_dtype)
+    coarsen['month'] = np.asarray(data['month'])[starts]
+    coarsen['day'] = np.asarray(data['day'])[starts]
+    coarsen['hour'] = (step[starts]+1)*timestep
+    for field in irradiance_fields + mean_fields:
+        coarsen[field] = np.add.reduceat(np.asarray(data[field], dtype=float), starts)/count
+    u, v = wind_components(np.asarray(data['winspeed'], dtype=float), np.asarray(data['windir'], dtype=float))
+    coarsen['windir'] = wind_direction(np.add.reduceat(u, starts), np.add.reduceat(v, starts))
+    return coarsen
+
+
+#this function divides each row of climate data into the shorter timestep (hours), which
+#must divide the time step of the data
+def refine(data, timestep, index):
+    numsplit = int(round(index.timestep/timestep))
+    if abs(index.timestep/timestep - numsplit) > 1e-6:
+        raise ValueError('the time step must divide the time step of the data: ' + str(timestep))
+    sub = np.arange(numsplit)
+    rows = np.repeat(np.arange(len(data)), numsplit)
+
+    refine = np.zeros(len(rows), dtype=climate_dtype)
+    refine['month'] = np.asarray(data['month'])[rows]
+    refine['day'] = np.asarray(data['day'])[rows]
+    start_hour = (index.start_hour[:,None] + sub[None,:]*timestep).ravel()
+    refine['hour'] = start_hour + timestep
+    for field in irradiance_fields:
+        refine[field] = np.asarray(data[field], dtype=float)[rows]
+
+    #the middle of every old and new step, in hours from the start of the record
+    oldtime = index.daynum*24 + index.start_hour + index.timestep/2
+    newtime = index.daynum[rows]*24 + start_hour + timestep/2
+    for field in mean_fields:
+        refine[field] = np.interp(newtime, oldtime, np.asarray(data[field], dtype=float))
+    u, v = wind_components(np.asarray(data['winspeed'], dtype=float), np.asarray(data['windir'], dtype=float))
+    refine['windir'] = wind_direction(np.interp(newtime, oldtime, u), np.interp(newtime, oldtime, v))
+    return refine
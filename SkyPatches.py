@@ -0,0 +1,193 @@
+##########################################################################################
+# PyClim was developed by Prof. Darren Robinson (University of Sheffield, 2019).         #
+# PyClim produces a range of graphs and statistics to support the analysis of climate    #
+# data, to support architectural / engineering / technology students to develop their    #
+# early-stage bioclimatic design concepts.                                               #
+##########################################################################################
+
+
+#THIS MODULE DISCRETISES THE SKY INTO TREGENZA (OR REINHART-SUBDIVIDED) PATCHES, ASSIGNS
+#THEM A RADIANCE FROM THE PEREZ TILTED SURFACE MODEL, AND CALCULATES THE PATCH VIEW FACTORS
+#OF RECEIVING PLANES. THE SKY IS THEN CALCULATED ONCE, SO THAT THE IRRADIATION INCIDENT ON
+#ANY NUMBER OF ORIENTATIONS IS A SINGLE MATRIX PRODUCT: view factors @ sky vector.
+
+#The sky vector has one element per patch (radiance, W/m2/sr), followed by one element for
+#the Perez horizon band (F2*idh) and one for the ground reflected irradiance (groundref*igh).
+#The view factor matrix has matching columns: for each patch the integral of the cosine of
+#the angle of incidence over the part of the patch in front of the plane (sr), then sin(tilt)
+#for the horizon band and (1-cos(tilt))/2 for the ground.
+
+#imports the basic libraries
+import numpy as np
+
+from ClimAnalFunctions import pi, groundref
+from ClimAnalArrays import ibn_array, PerezSky_array
+
+#Tregenza bands: 12 degrees of altitude each, the number of patches per band, and a zenith cap
+band_edges = np.array([0, 12, 24, 36, 48, 60, 72, 84, 90])*pi/180
+band_patches = [30, 30, 24, 24, 18, 12, 6, 1]
+
+
+#XXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXX########
+# FUNCTIONS TO DEFINE THE SKY PATCHES
+#XXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXX########
+
+#this function returns the altitude and azimuth bounds (radians) of each sky patch. MF=1
+#gives the 145 Tregenza patches; MF>1 gives the Reinhart subdivision, in which each band is
+#split into MF bands of MF times as many patches (the zenith cap is not subdivided).
+#Patch azimuths are measured from north, and the first patch of each band is centred on it.
+def sky_patches(MF=1):
+    altlow_list = []
+    althigh_list = []
+    azlow_list = []
+    azhigh_list = []
+    for band in range(len(band_patches)):
+        if band_patches[band] == 1:
+            altlow_list.append(band_edges[band])
+            althigh_list.append(pi/2)
+            azlow_list.append(0)
+            azhigh_list.append(2*pi)
+            continue
+        subedges = np.linspace(band_edges[band], band_edges[band+1], MF+1)
+        numpatches = band_patches[band]*MF
+        width = 2*pi/numpatches
+        for subband in range(MF):
+            for patch in range(numpatches):
+                altlow_list.append(subedges[subband])
+                althigh_list.append(subedges[subband+1])
+                azlow_list.append((patch-0.5)*width)
+                azhigh_list.append((patch+0.5)*width)
+    return np.array(altlow_list), np.array(althigh_list), np.array(azlow_list), np.array(azhigh_list)
+
+
+#this function calculates the solid angle (sr) of each patch
+def patch_solid_angles(patches):
+    altlow, althigh, azlow, azhigh = patches
+    patch_solid_angles = (azhigh-azlow)*(np.sin(althigh)-np.sin(altlow))
+    return patch_solid_angles
+
+
+#this function returns the index of the patch containing each (altitude, azimuth) direction
+def patch_index(solalt, solaz, patches):
+    altlow, althigh, azlow, azhigh = patches
+    solalt = np.clip(solalt, 0, pi/2)
+    solaz = np.mod(solaz, 2*pi)
+    #patches are ordered by band, so the first patch of each band marks its start
+    bandstart = np.flatnonzero(np.r_[True, np.diff(altlow) != 0])
+    band = np.searchsorted(altlow[bandstart], solalt, side='right')-1
+    start = bandstart[band]
+    width = azhigh[start]-azlow[start]
+    count = np.round(2*pi/width).astype(int)
+    offset = np.floor(np.mod(solaz-azlow[start], 2*pi)/width).astype(int)
+    patch_index = start + np.minimum(offset, count-1)
+    return patch_index
+
+
+#XXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXX########
+# FUNCTION TO CALCULATE THE PATCH VIEW FACTORS OF RECEIVING PLANES
+#XXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXX########
+
+#this function calculates the view factor matrix (orientations x (patches+2)) for planes of
+#the given tilt and wallaz (radians, broadcast against each other and flattened). Each patch
+#is divided into subdivisions x subdivisions elements; only those elements in front of the
+#plane contribute, so that patches cut by a tilted plane are partially counted.
+def patch_view_factors(tilt, wallaz, patches, subdivisions=8, maxcells=2**22):
+    tilt, wallaz = [np.ravel(x) for x in np.broadcast_arrays(np.asarray(tilt, dtype=float), np.asarray(wallaz, dtype=float))]
+    altlow, althigh, azlow, azhigh = patches
+    numpatches = len(altlow)
+
+    #the centre and solid angle of every sub-element, stored patch by patch
+    fraction = (np.arange(subdivisions)+0.5)/subdivisions
+    sinlow = np.sin(altlow)[:,None,None]
+    sinhigh = np.sin(althigh)[:,None,None]
+    #equal solid angle sub-bands: uniform steps in sin(altitude)
+    sinalt = sinlow + (sinhigh-sinlow)*fraction[None,:,None]
+    az = azlow[:,None,None] + (azhigh-azlow)[:,None,None]*fraction[None,None,:]
+    sinalt, az = np.broadcast_arrays(sinalt, az)
+    sinalt = sinalt.reshape(-1)
+    az = az.reshape(-1)
+    cosalt = np.sqrt(1-sinalt**2)
+    element_dirs = np.array([cosalt*np.sin(az), cosalt*np.cos(az), sinalt])
+    element_omega = np.repeat(patch_solid_angles(patches)/subdivisions**2, subdivisions**2)
+    elementstart = np.arange(numpatches)*subdivisions**2
+
+    normals = np.array([np.sin(tilt)*np.sin(wallaz), np.sin(tilt)*np.cos(wallaz), np.cos(tilt)]).T
+    patch_view_factors = np.empty((len(tilt), numpatches+2))
+    chunk = max(1, maxcells // len(element_omega))
+    for start in range(0, len(tilt), chunk):
+        cosinc = normals[start:start+chunk] @ element_dirs
+        np.maximum(cosinc, 0, out=cosinc)
+        cosinc *= element_omega
+        patch_view_factors[start:start+chunk,:numpatches] = np.add.reduceat(cosinc, elementstart, axis=1)
+    patch_view_factors[:,numpatches] = np.sin(tilt)
+    patch_view_factors[:,numpatches+1] = (1-np.cos(tilt))/2
+    return patch_view_factors
+
+
+#XXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXX########
+# FUNCTION TO CALCULATE THE SKY VECTOR
+#XXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXX########
+
+#this function calculates the sky vector from hourly series of jday, igh, idh, solalt and
+#solaz. The diffuse sky is split as in the Perez model: an isotropic background of radiance
+#idh*(1-F1)/pi, a circumsolar component idh*F1/a1 (normal irradiance) which, like the beam
+#irradiance ibn, is placed in the patch containing the sun, and the horizon band F2*idh.
+#With cumulative=True the hours are summed (giving Wh/m2/sr); otherwise an (hours x
+#elements) matrix is returned, so that hourly irradiances are sky @ view_factors.T. Given
+#the hourly sky state (see SkyState), its ibn, F1, F2 and a1 are used as they stand.
+def sky_vector(jday, igh, idh, solalt, solaz, patches, isotropic, DiffuseOnly, cumulative=True, skystate=None):
+    jday, igh, idh, solalt, solaz = [np.ravel(x) for x in np.broadcast_arrays(jday, igh, idh, solalt, solaz)]
+    igh = igh.astype(float)
+    idh = idh.astype(float)
+    numpatches = len(patches[0])
+    omega = patch_solid_angles(patches)
+    if skystate is None:
+        ibn = ibn_array(igh, idh, solalt)
+    else:
+        ibn = skystate['ibn']
+
+    if isotropic==True:
+        background = idh/pi
+        sun = np.zeros(len(igh))
+        horizon = np.zeros(len(igh))
+    else:
+        if skystate is None:
+            F1, F2, a1 = PerezSky_array(jday, solalt, idh, ibn)
+            F1 = np.where(idh > 0, F1, 0)
+            F2 = np.where(idh > 0, F2, 0)
+        else:
+            F1, F2, a1 = skystate['F1'], skystate['F2'], skystate['a1']
+        background = idh*(1-F1)/pi
+        sun = idh*F1/a1
+        horizon = idh*F2
+    if DiffuseOnly==False:
+        sun = sun + ibn
+        ground = groundref*igh
+    else:
+        ground = np.zeros(len(igh))
+    sunpatch = patch_index(solalt, solaz, patches)
+
+    if cumulative==True:
+        sky_vector = np.empty(numpatches+2)
+        sky_vector[:numpatches] = background.sum() + np.bincount(sunpatch, weights=sun, minlength=numpatches)/omega
+        sky_vector[numpatches] = horizon.sum()
+        sky_vector[numpatches+1] = ground.sum()
+    else:
+        sky_vector = np.empty((len(igh), numpatches+2))
+        sky_vector[:,:numpatches] = background[:,None]
+        sky_vector[np.arange(len(igh)), sunpatch] += sun/omega[sunpatch]
+        sky_vector[:,numpatches] = horizon
+        sky_vector[:,numpatches+1] = ground
+    return sky_vector
+
+
+#this function calculates the annual irradiation (Wh/m2) on every combination of tilt and
+#wallaz (radians), as a (tilt x wallaz) surface, for comparison with annual_irradiation_surface
+def annual_irradiation_patches(tilt, wallaz, jday, igh, idh, solalt, solaz, isotropic, DiffuseOnly, MF=1, subdivisions=8, skystate=None):
+    tilt = np.atleast_1d(np.asarray(tilt, dtype=float))
+    wallaz = np.atleast_1d(np.asarray(wallaz, dtype=float))
+    patches = sky_patches(MF)
+    sky = sky_vector(jday, igh, idh, solalt, solaz, patches, isotropic, DiffuseOnly, skystate=skystate)
+    view_factors = patch_view_factors(tilt[:,None], wallaz[None,:], patches, subdivisions)
+    annual_irradiation_patches = (view_factors @ sky).reshape(len(tilt), len(wallaz))
+    return annual_irradiation_patches
@@ -0,0 +1,76 @@
+##########################################################################################
+# PyClim was developed by Prof. Darren Robinson (University of Sheffield, 2019).         #
+# PyClim produces a range of graphs and statistics to support the analysis of climate    #
+# data, to support architectural / engineering / technology students to develop their    #
+# early-stage bioclimatic design concepts.                                               #
+##########################################################################################
+
+
+#THIS MODULE CALCULATES THE ORIENTATION INDEPENDENT STATE OF THE SKY FOR EVERY HOUR OF A
+#CLIMATE FILE: THE SUN POSITION, BEAM NORMAL IRRADIANCE, PEREZ CLEARNESS CATEGORY AND
+#BRIGHTNESS AND THE PEREZ CIRCUMSOLAR (F1) AND HORIZON (F2) COEFFICIENTS. THE TABLE IS SAVED
+#NEXT TO THE PARSED CLIMATE DATA (SEE DerivedCache), KEYED ON THE SITE, SO THAT ORIENTATION
+#SWEEPS AND ILLUMINANCE CALCULATIONS READ IT RATHER THAN RECALCULATING IT.
+
+#imports the basic libraries
+import numpy as np
+
+from ClimAnalArrays import solar_position, ibn_array, PerezClearness_array, PerezBrightness_array, PerezSky_array
+from ClimateData import read_climate
+from DerivedCache import derived_cache, derived_params
+from TimeIndex import time_index
+
+#the fields of the table. clearness and brightness are at the solar altitude of each hour
+#(as used by the luminous efficacy model); F1, F2 and a1 are those of the Perez tilted
+#surface model, which bounds the solar altitude at 5 degrees.
+sky_dtype = np.dtype([('solalt', np.float64),
+                      ('solaz', np.float64),
+                      ('ibn', np.float64),
+                      ('clearness', np.int8),
+                      ('brightness', np.float64),
+                      ('F1', np.float64),
+                      ('F2', np.float64),
+                      ('a1', np.float64)])
+
+
+#this function calculates the sky state of every hour (or time step) of the climate data, for
+#a site at latitude lat (radians). A timeshift of None places the sun at the middle of each
+#time step (see TimeIndex). The sun position (a dictionary of solalt and solaz, radians) is
+#calculated if it is not given.
+def calculate_sky_state(data, lat, longitude, timezone, timeshift, index=None, sun=None):
+    if index is None:
+        index = time_index(data)
+    timeshift = index.timeshift(timeshift)
+    igh = np.asarray(data['global'], dtype=float)
+    idh = np.asarray(data['diffuse'], dtype=float)
+    if sun is None:
+        solalt, solaz, dec, dT = solar_position(index.jday, index.hour, lat, longitude, timezone, timeshift)
+    else:
+        solalt, solaz = sun['solalt'], sun['solaz']
+    sky = np.zeros(len(data), dtype=sky_dtype)
+    sky['solalt'] = solalt
+    sky['solaz'] = solaz
+    sky['ibn'] = ibn_array(igh, idh, solalt)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        sky['clearness'] = PerezClearness_array(solalt, idh, sky['ibn'])
+        sky['brightness'] = PerezBrightness_array(index.jday, solalt, idh)
+        F1, F2, a1 = PerezSky_array(index.jday, solalt, idh, sky['ibn'])
+    sky['F1'] = np.where(idh > 0, F1, 0)
+    sky['F2'] = np.where(idh > 0, F2, 0)
+    sky['a1'] = a1
+    return sky
+
+
+#this function returns the sky state table of a climate file, for a site at latitude lat
+#(radians), from the derived cache of the file (see DerivedCache) where it has been saved,
+#otherwise calculating and saving it. If timestep is given, it is the sky state of the
+#climate data resampled to it (see ClimateData.read_climate).
+def read_sky_state(filename, lat, longitude, timezone, timeshift, use_cache=True, timestep=None):
+    data = read_climate(filename, use_cache, timestep)
+    index = time_index(data)
+    timeshift = index.timeshift(timeshift)
+    compute = lambda: calculate_sky_state(data, lat, longitude, timezone, timeshift, index)
+    if use_cache == False:
+        return compute()
+    read_sky_state = derived_cache(filename).get('sky_state', derived_params(filename, index, lat, longitude, timezone, timeshift), compute)
+    return read_sky_state
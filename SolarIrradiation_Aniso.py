@@ -9,115 +9,103 @@
 #anisotropic sky.
 #A prior version also calculated a quotient of the two, to demonstrate the importance of
 #modelling anisotropy.
+#The surface is calculated by irradiation_surface and plotted by plot_irradiation_surface,
+#so the module can be imported without reading a file or importing matplotlib.
 
 
 #imports the basic libraries
 import math
-import matplotlib.pyplot as plt
 import numpy as np
 
 from ClimAnalFunctions import * 
+from ClimAnalArrays import annual_irradiation_surface
+from ClimateData import read_climate
+from SkyPatches import annual_irradiation_patches
+from SkyState import calculate_sky_state, read_sky_state
+from TimeIndex import time_index
 
 ##########################################################################################
 #THIS SURFACE PLOT CALCULATION WOULD PROBABLY BE 'MUCH' QUICKER USING A GLOBAL RADIANCE 
 #DISTRIBUTION MODEL. THE DISTRIBUTION ONLY NEEDS TO BE CALCULATED ONCE. ONLY THE PATCH
 #VIEW FACTORS NEED TO BE RE-CALCULATED. THIS WILL NEED A MECHANISM TO ESTIMATE THE VIEW
 #FACTOR FOR CUTS THROUGH PATCHES FROM A PROGRESSIVELY TILTED PLANE. 
+#THE SkyPatchModel OPTION BELOW DOES THIS, USING THE SkyPatches MODULE.
 ##########################################################################################
 
-lat =lat * pi / 180
-
 DiffuseOnly = False
 isotropic = False
-FirstSweep = True
-
-
-cumhour=0
-globalirradbeta=0
-day_list = []
-dec_list = []
-hour_list = []
-solalt_list = []
-solaz_list = []
-timediff_list = []
-cai_list = []
-file_list = []
-global_list = []
-diffuse_list = []
-day_global_list = []
-day_diffuse_list = []
-igbeta_list = []
-annualirrad_list = []
-
-
-for line in file:
-    line = line.rstrip('\n')
-    line = line.split(',')
-    file_list.append(line)
-file.close()
-
-
-#this popuates global and diffuse lists with the corresponding solar data
-for i in range (3,len(file_list)):
-    global_list.append(float(file_list[i][5]))
-    diffuse_list.append(float(file_list[i][6]))
-
-
-#This is where the daily and hourly solar quantities are calculated
-for tilt in range(0,95,10):
-    for wallaz in range (0,360,10):
-        for i in range(1,366):
-            if FirstSweep == True: #no need to re-calculate sun-positions
-                day_list.append(i)
-                dec_list.append(declin_angle(i))
-                timediff_list.append(time_diff(i,False,longitude,timezone,timeshift))
-                #This populates a list of daily SR, SS times, for the solar availability plots
-            for j in range(1,25):
-                cumhour=cumhour+1
-                if FirstSweep == True: #no need to re-calculate sun-positions
-                    solalt_list.append(solar_altitude(i,j+timediff_list[i-1],lat, dec_list[i-1]))
-                    solaz_list.append(solar_azimuth(i,j+timediff_list[i-1],lat,solalt_list[cumhour-1], dec_list[i-1]))
-                cai_list.append(cai(wallaz*pi/180,tilt*pi/180,solalt_list[cumhour-1],solaz_list[cumhour-1]))
-                igbeta_list.append(igbeta(i, cai_list[cumhour-1],global_list[cumhour-1],diffuse_list[cumhour-1],solalt_list[cumhour-1],tilt*pi/180, isotropic, DiffuseOnly))
-                globalirradbeta = globalirradbeta + igbeta_list[cumhour-1]    
-        
-        annualirrad_list.append(globalirradbeta)
-        FirstSweep = False
-        globalirradbeta=0
-        cumhour=0
-        cai_list.clear()
-        igbeta_list.clear()
-
-
-if isotropic==True:
-    #This creates a 2D irradiation surface plot
-    xlist = np.linspace(0, 350, 36)
-    ylist = np.linspace(0, 90, 10) #Note: theer need to be 19 subdivisions (here and for Z) for 5o bins of altitude
-    X, Y = np.meshgrid(xlist, ylist)
+#This uses a discretised sky (Tregenza patches, or Reinhart with ReinhartMF>1) in place of igbeta
+SkyPatchModel = False
+ReinhartMF = 1
+#This prints the relative difference between the sky patch and igbeta surfaces
+CrossCheck = False
+
+#These set the resolution of the surface plot, in degrees
+TiltIncrement = 10
+AzimuthIncrement = 10
+
+tilt_list = np.arange(0, 90+TiltIncrement, TiltIncrement)
+wallaz_list = np.arange(0, 360, AzimuthIncrement)
+
+
+#this function calculates the irradiation (Wh/m2, over the whole record) incident on every
+#tilt (rows) and azimuth (columns) of tilt_list and wallaz_list (degrees), for a site at
+#latitude lat (radians), from the climate data (see ClimateData) and its hourly sky state
+#(see SkyState), which is calculated if it is not given
+def irradiation_surface(data, tilt_list, wallaz_list, lat, longitude, timezone, timeshift, isotropic=isotropic, DiffuseOnly=DiffuseOnly, SkyPatchModel=SkyPatchModel, ReinhartMF=ReinhartMF, CrossCheck=CrossCheck, skystate=None):
+    global_list = data['global']
+    diffuse_list = data['diffuse']
+    index = time_index(data)
+    day_list = index.jday
+
+    #The sun positions and sky parameters are orientation independent, so they are calculated once for the whole record
+    if skystate is None:
+        skystate = calculate_sky_state(data, lat, longitude, timezone, timeshift, index)
+    solalt_list = skystate['solalt']
+    solaz_list = skystate['solaz']
+
+    #This is where the annual incident irradiation is calculated, for every tilt and azimuth at once
+    if SkyPatchModel == True:
+        annualirrad_list = annual_irradiation_patches(tilt_list*pi/180, wallaz_list*pi/180, day_list, global_list, diffuse_list, solalt_list, solaz_list, isotropic, DiffuseOnly, ReinhartMF, skystate=skystate)
+        if CrossCheck == True:
+            igbeta_surface = annual_irradiation_surface(tilt_list*pi/180, wallaz_list*pi/180, day_list, global_list, diffuse_list, solalt_list, solaz_list, isotropic, DiffuseOnly, skystate=skystate)
+            difference = np.abs(annualirrad_list-igbeta_surface)/igbeta_surface
+            print('Sky patch versus igbeta irradiation: mean difference {0:1.2%}, maximum difference {1:1.2%}' .format(difference.mean(), difference.max()))
+    else:
+        annualirrad_list = annual_irradiation_surface(tilt_list*pi/180, wallaz_list*pi/180, day_list, global_list, diffuse_list, solalt_list, solaz_list, isotropic, DiffuseOnly, skystate=skystate)
+    #the irradiances (W/m2) are integrated over each time step
+    annualirrad_list = annualirrad_list*index.timestep
+    return annualirrad_list
+
+
+#This creates a 2D irradiation surface plot, returning the figure
+def plot_irradiation_surface(annualirrad_list, tilt_list, wallaz_list, isotropic=isotropic):
+    import matplotlib.pyplot as plt
+    X, Y = np.meshgrid(wallaz_list, tilt_list)
     fig,ax=plt.subplots(1,1, figsize=(16,8))
-    #this part converts the list into an array and reshapes it, to match the x,y dimensions
-    Z = np.array(annualirrad_list)*10**-6
-    Z = Z.reshape(10,36)
+    #the surface is already a (tilt x azimuth) array, matching the x,y dimensions
+    Z = annualirrad_list*10**-6
     cp = ax.contourf(X, Y, Z, 16, cmap='plasma', alpha=1.0) #NB: 16 sets number of division; alpha sets opacity; 'magma', 'jet' and 'viridis' are also good cmaps
     fig.colorbar(cp, label = 'Solar irradiation, MWh/m^2') # Adds a colorbar
-    ax.set_title('Annual Solar Irradiation Surface Plot: Isotropic Sky')
-    ax.set_xlabel('Collector azimuth, deg')
-    ax.set_ylabel('Collector tilt, deg')
-    plt.show()
-else:
-    #This creates a 2D irradiation surface plot
-    xlist = np.linspace(0, 350, 36)
-    ylist = np.linspace(0, 90, 10) #Note: theer need to be 19 subdivisions (here and for Z) for 5o bins of altitude
-    X, Y = np.meshgrid(xlist, ylist)
-    fig,ax=plt.subplots(1,1, figsize=(16,8))
-    #this part converts the list into an array and reshapes it, to match the x,y dimensions
-    Zprime = np.array(annualirrad_list)*10**-6
-    Zprime = Zprime.reshape(10,36)
-    cp = ax.contourf(X, Y, Zprime, 16, cmap='plasma', alpha=1.0) #NB: 16 sets number of division; alpha sets opacity; 'magma', 'jet' and 'viridis' are also good cmaps
-    fig.colorbar(cp, label = 'Solar irradiation, MWh/m^2') # Adds a colorbar    
-    ax.set_title('Annual Solar Irradiation Surface Plot: Anisotropic Sky')
+    if isotropic==True:
+        ax.set_title('Annual Solar Irradiation Surface Plot: Isotropic Sky')
+    else:
+        ax.set_title('Annual Solar Irradiation Surface Plot: Anisotropic Sky')
     ax.set_xlabel('Collector azimuth, deg')
     ax.set_ylabel('Collector tilt, deg')
+    return fig
+
+
+def main():
+    import matplotlib.pyplot as plt
+    #this reads the global and diffuse solar data from the climate file
+    data = read_climate(filename, timestep=timestep)
+    #the hourly sky state is saved next to the climate data, so later runs only calculate the geometry
+    skystate = read_sky_state(filename, lat * pi / 180, longitude, timezone, timeshift, timestep=timestep)
+    annualirrad_list = irradiation_surface(data, tilt_list, wallaz_list, lat * pi / 180, longitude, timezone, timeshift, isotropic, DiffuseOnly, SkyPatchModel, ReinhartMF, CrossCheck, skystate)
+    plot_irradiation_surface(annualirrad_list, tilt_list, wallaz_list, isotropic)
     plt.show()
 
-        
\ No newline at end of file
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,211 @@
+##########################################################################################
+# PyClim was developed by Prof. Darren Robinson (University of Sheffield, 2019).         #
+# PyClim produces a range of graphs and statistics to support the analysis of climate    #
+# data, to support architectural / engineering / technology students to develop their    #
+# early-stage bioclimatic design concepts.                                               #
+##########################################################################################
+
+
+#THIS MODULE CALCULATES THE WeatherAnalysis STATISTICS OF A CLIMATE FILE IN ONE STREAMING
+#PASS: THE FILE IS READ IN BLOCKS (SEE ClimateData.iter_climate) AND EACH BLOCK UPDATES FIXED
+#SIZE TOTALS (THE SUMMARY STATISTICS, DEGREE-DAYS, MONTHLY MEANS, DIURNAL RANGES AND THE
+#TEMPERATURE, WIND SPEED AND ILLUMINANCE HISTOGRAMS), SO THAT MEMORY STAYS FLAT HOWEVER MANY
+#YEARS THE RECORD HOLDS. THE SUMMARY IS THE SAME AS THAT OF WeatherStats.summary_statistics.
+#
+#   results = stream_statistics('./Finningley.csv', 53.48*pi/180, -1.0, 0)
+
+#imports the basic libraries
+import numpy as np
+
+from ClimAnalArrays import solar_position, ibn_array, PerezClearness_array, PerezBrightness_array, illuminance_array
+from ClimateData import iter_climate
+from DegreeDays import DegreeDayEngine
+from TimeIndex import time_index, interval_timeshift, month_offsets
+from WeatherStats import Rho, HDDbase, CDDbase
+
+#the default histogram bin edges: temperature (oC), wind speed (m/s) and illuminance (klux)
+temp_edges = np.arange(-40, 51, 1.0)
+winspeed_edges = np.arange(0, 41, 1.0)
+illuminance_edges = np.arange(0, 151, 1.0)
+
+
+#this function counts the values in each bin of edges (each bin holds its lower edge), with
+#the values below the first edge first and those from the last edge up last
+def bin_counts(values, edges):
+    bin_counts = np.bincount(np.searchsorted(edges, values, side='right'), minlength=len(edges)+1)
+    return bin_counts
+
+
+class StreamingStatistics:
+#accumulates the statistics of a record added in blocks of consecutive rows, of any size. A
+#day that runs over the end of a block is completed by the next one, a new year starts
+#whenever the month steps backwards, and a year is leap once it holds 29 February. The
+#illuminance is only binned if the latitude lat (radians) of the site is given; a timeshift
+#of None places the sun at the middle of each time step (see TimeIndex). The time step
+#(hours) is found from the first block if it is not given.
+
+    def __init__(self, HDDbase=HDDbase, CDDbase=CDDbase, timestep=None, lat=None, longitude=0, timezone=0, timeshift=None, globaleff=False,
+                 temp_edges=temp_edges, winspeed_edges=winspeed_edges, illuminance_edges=illuminance_edges):
+        self.timestep = timestep
+        self.lat = lat
+        self.longitude = longitude
+        self.timezone = timezone
+        self.timeshift = timeshift
+        self.globaleff = globaleff
+        #the heating and cooling degree-days are the first and second base temperatures of the engine
+        self.degreedays = DegreeDayEngine([HDDbase, CDDbase], timestep)
+        self.numrows = 0
+        self.year = 0
+        self.lastmonth = None
+        self.leap_years = set()
+        #annual totals, and (month) totals of the rows and of the days
+        self.sums = {'global': 0.0, 'diffuse': 0.0, 'windpower': 0.0, 'dbt': 0.0}
+        self.monthly_sums = {field: np.zeros(12) for field in ['dbt', 'rh', 'winspeed', 'global']}
+        self.monthly_rows = np.zeros(12, dtype=np.int64)
+        self.monthly_diurnal = np.zeros(12)
+        self.monthly_maxdiurnal = np.zeros(12)
+        self.monthly_days = np.zeros(12, dtype=np.int64)
+        #the (year, month, day, max, min) of a day that is not yet complete
+        self.carry = None
+        #the histograms, with the counts below the first and from the last edge at either end
+        self.edges = {'temp': np.asarray(temp_edges, dtype=float),
+                      'winspeed': np.asarray(winspeed_edges, dtype=float),
+                      'illuminance': np.asarray(illuminance_edges, dtype=float)}
+        self.counts = {name: np.zeros(len(edges)+1, dtype=np.int64) for name, edges in self.edges.items()}
+
+
+    def add(self, block):
+    #adds a block of consecutive rows of climate data (see ClimateData)
+        if len(block) == 0:
+            return
+        month = np.asarray(block['month'], dtype=int)
+        day = np.asarray(block['day'], dtype=int)
+        hour = np.asarray(block['hour'], dtype=float)
+        dbt = np.asarray(block['dbt'], dtype=float)
+        igh = np.asarray(block['global'], dtype=float)
+        idh = np.asarray(block['diffuse'], dtype=float)
+        winspeed = np.asarray(block['winspeed'], dtype=float)
+        if self.timestep is None:
+            self.timestep = time_index(block).timestep
+            self.degreedays.timestep = self.timestep
+        if self.numrows == 0:
+            self.timeshift = interval_timeshift(self.timeshift, self.timestep, not (hour == 0).any())
+        self.numrows = self.numrows + len(block)
+
+        previous = np.empty(len(month), dtype=int)
+        previous[0] = month[0] if self.lastmonth is None else self.lastmonth
+        previous[1:] = month[:-1]
+        year = self.year + np.cumsum(month < previous)
+        self.year = int(year[-1])
+        self.lastmonth = int(month[-1])
+        self.leap_years.update(year[(month == 2) & (day == 29)].tolist())
+
+        self.degreedays.add(month, day, dbt)
+
+        #the annual and monthly totals
+        self.sums['global'] = self.sums['global'] + igh.sum()
+        self.sums['diffuse'] = self.sums['diffuse'] + idh.sum()
+        self.sums['windpower'] = self.sums['windpower'] + (0.5*Rho*winspeed**3/1000).sum()
+        self.sums['dbt'] = self.sums['dbt'] + dbt.sum()
+        for field in self.monthly_sums:
+            self.monthly_sums[field] += np.bincount(month-1, weights=block[field], minlength=12)
+        self.monthly_rows += np.bincount(month-1, minlength=12)
+
+        self.counts['temp'] += bin_counts(dbt, self.edges['temp'])
+        self.counts['winspeed'] += bin_counts(winspeed, self.edges['winspeed'])
+        if self.lat is not None:
+            leap = np.isin(year, list(self.leap_years))
+            jday = month_offsets[month-1] + day + (leap & (month > 2))
+            solalt = solar_position(jday, hour, self.lat, self.longitude, self.timezone, self.timeshift)[0]
+            ibn = ibn_array(igh, idh, solalt)
+            with np.errstate(divide='ignore', invalid='ignore'):
+                skystate = {'clearness': PerezClearness_array(solalt, idh, ibn), 'brightness': PerezBrightness_array(jday, solalt, idh)}
+            illuminance = illuminance_array(self.globaleff, jday, solalt, igh, idh, skystate)*10**-3
+            self.counts['illuminance'] += bin_counts(illuminance, self.edges['illuminance'])
+
+        #the diurnal temperature ranges: the block's days, the first joined to the carried day
+        newday = np.ones(len(day), dtype=bool)
+        newday[1:] = (day[1:] != day[:-1]) | (month[1:] != month[:-1]) | (year[1:] != year[:-1])
+        starts = np.flatnonzero(newday)
+        daymax = np.maximum.reduceat(dbt, starts)
+        daymin = np.minimum.reduceat(dbt, starts)
+        daymonth = month[starts]
+        if self.carry is not None:
+            carryyear, carrymonth, carryday, carrymax, carrymin = self.carry
+            if (carryyear, carrymonth, carryday) == (year[0], month[0], day[0]):
+                daymax[0] = max(daymax[0], carrymax)
+                daymin[0] = min(daymin[0], carrymin)
+            else:
+                self.add_days(np.array([carrymonth]), np.array([carrymax-carrymin]))
+        #the last day may continue in the next block
+        self.carry = (year[starts[-1]], month[starts[-1]], day[starts[-1]], daymax[-1], daymin[-1])
+        self.add_days(daymonth[:-1], (daymax-daymin)[:-1])
+
+
+    def add_days(self, daymonth, diurnal):
+    #adds the diurnal temperature ranges of complete days, given their months
+        if len(daymonth) == 0:
+            return
+        self.monthly_diurnal += np.bincount(daymonth-1, weights=diurnal, minlength=12)
+        self.monthly_days += np.bincount(daymonth-1, minlength=12)
+        np.maximum.at(self.monthly_maxdiurnal, daymonth-1, diurnal)
+
+
+    def finish(self):
+    #completes the last day, once every block has been added
+        if self.carry is not None:
+            carryyear, carrymonth, carryday, carrymax, carrymin = self.carry
+            self.add_days(np.array([carrymonth]), np.array([carrymax-carrymin]))
+            self.carry = None
+        self.degreedays.finish()
+
+
+    def results(self):
+    #returns a dictionary of the summary statistics (as WeatherStats.summary_statistics), the
+    #monthly means and mean and maximum diurnal temperature ranges, and the edges and counts
+    #of each histogram, with the counts below and from the last edge (hours, or time steps)
+        numyears = self.year+1 if self.numrows > 0 else 1
+        timestep = self.timestep if self.timestep is not None else 1.0
+        degreedays = self.degreedays.results()
+        summary = {}
+        #irradiances and wind power (W/m2) are integrated over each time step
+        summary['AnnualIgh'] = float(self.sums['global']*timestep/1000/numyears)
+        summary['DiffuseFraction'] = float(self.sums['diffuse']/self.sums['global'])
+        summary['WindKineticEnergy'] = float(self.sums['windpower']*timestep/numyears)
+        summary['AnnualMeanTemp'] = float(self.sums['dbt']/self.numrows)
+        summary['TotalHDD'] = float(degreedays['MonthlyHDD'][0].sum())
+        summary['TotalCDD'] = float(degreedays['MonthlyCDD'][1].sum())
+        summary['MonthlyHDD'] = degreedays['MonthlyHDD'][0].tolist()
+        summary['MonthlyCDD'] = degreedays['MonthlyCDD'][1].tolist()
+
+        results = {}
+        results['summary'] = summary
+        with np.errstate(divide='ignore', invalid='ignore'):
+            results['MonthlyMeanTemp'] = self.monthly_sums['dbt']/self.monthly_rows
+            results['MonthlyMeanRH'] = self.monthly_sums['rh']/self.monthly_rows
+            results['MonthlyMeanWinspeed'] = self.monthly_sums['winspeed']/self.monthly_rows
+            results['MonthlyMeanGlobal'] = self.monthly_sums['global']/self.monthly_rows
+            results['MonthlyDiurnal'] = self.monthly_diurnal/self.monthly_days
+        results['MonthlyMaxDiurnal'] = self.monthly_maxdiurnal
+        for name in self.edges:
+            if name == 'illuminance' and self.lat is None:
+                continue
+            results[name + '_edges'] = self.edges[name]
+            results[name + '_counts'] = self.counts[name][1:-1]
+            results[name + '_below'] = int(self.counts[name][0])
+            results[name + '_above'] = int(self.counts[name][-1])
+        results['numyears'] = numyears
+        results['numrows'] = self.numrows
+        results['timestep'] = timestep
+        return results
+
+
+#this function calculates the statistics of a climate file, reading it chunk_rows rows at a
+#time. The illuminance is only binned if the latitude lat (radians) of the site is given.
+def stream_statistics(filename, lat=None, longitude=0, timezone=0, timeshift=None, globaleff=False, HDDbase=HDDbase, CDDbase=CDDbase, chunk_rows=744, use_cache=True, timestep=None):
+    engine = StreamingStatistics(HDDbase, CDDbase, timestep, lat, longitude, timezone, timeshift, globaleff)
+    for block in iter_climate(filename, chunk_rows, use_cache):
+        engine.add(block)
+    engine.finish()
+    stream_statistics = engine.results()
+    return stream_statistics
@@ -0,0 +1,157 @@
+##########################################################################################
+# PyClim was developed by Prof. Darren Robinson (University of Sheffield, 2019).         #
+# PyClim produces a range of graphs and statistics to support the analysis of climate    #
+# data, to support architectural / engineering / technology students to develop their    #
+# early-stage bioclimatic design concepts.                                               #
+##########################################################################################
+
+
+#THIS MODULE RENDERS AN ATLAS OF SUNPATH DIAGRAMS (SEE sunpath): ONE FOR EVERY LATITUDE OF
+#A RANGE, IN CLOCK AND / OR SOLAR TIME, AND FOR EACH OF SEVERAL WALL AZIMUTHS. THE DIAGRAMS
+#ARE RENDERED OFF-SCREEN (Agg) ACROSS A POOL OF WORKER PROCESSES, EACH OF WHICH CALCULATES
+#THE CIRCLES AND SPOKES ONCE. THEY ARE WRITTEN AS A FOLDER OF PNG FILES OR AS ONE
+#MULTI-PAGE (VECTOR) PDF, IN LATITUDE ORDER, WITH A TIMING LOG OF EVERY DIAGRAM.
+#
+#   python SunpathAtlas.py --out atlas --format pdf --lat-min -66 --lat-max 66 --time clock,solar
+
+#imports the basic libraries
+import argparse
+import csv
+import os
+import pickle
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from BatchStations import init_worker, pool_options
+
+#the time variants of the diagrams: plotted in clock time (the analemma) or solar time
+time_list = ['clock', 'solar']
+
+#the sunpath backgrounds already calculated by this worker, keyed on AzimuthIncrement
+background_memo = {}
+
+
+#this function returns one dictionary per diagram: page, lat (degrees), time and WallAzimuth
+def atlas_pages(lat_min=-66, lat_max=66, lat_step=1, times=time_list, walls=(185,)):
+    page_list = []
+    numlat = int(round((lat_max-lat_min)/lat_step))+1
+    for i in range(numlat):
+        lat = lat_min + i*lat_step
+        for variant in times:
+            for wall in walls:
+                page = {}
+                page['page'] = len(page_list)
+                page['lat'] = lat
+                page['time'] = variant
+                page['WallAzimuth'] = wall
+                page['name'] = 'sunpath_{0}{1:05.1f}_{2}_wall{3:03d}' .format('N' if lat >= 0 else 'S', abs(lat), variant, int(wall))
+                page_list.append(page)
+    return page_list
+
+
+#XXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXX########
+# THE WORKER PROCESSES
+#XXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXX########
+
+#this function renders one diagram, returning its timing and either the path of the PNG
+#file written to outdir or (without outdir) the pickled figure itself, for a PDF page
+def render_page(page, outdir=None, dpi=100):
+    import matplotlib.pyplot as plt
+    from ClimAnalFunctions import pi
+    from sunpath import plot_sunpath, sunpath_background, AzimuthIncrement
+
+    start = time.time()
+    result = dict(page)
+    result['pid'] = os.getpid()
+    try:
+        if AzimuthIncrement not in background_memo:
+            background_memo[AzimuthIncrement] = sunpath_background(AzimuthIncrement)
+        fig = plot_sunpath(page['lat']*pi/180, WallAzimuth=page['WallAzimuth'], ClockTime=(page['time'] == 'clock'), background=background_memo[AzimuthIncrement])
+        fig.text(0.5, 0.01, 'latitude {0:g}$^o${1}, '.format(abs(page['lat']), 'N' if page['lat'] >= 0 else 'S') + page['time'] + ' time, wall azimuth ' + str(page['WallAzimuth']) + '$^o$', c='darkgray', horizontalalignment='center')
+        if outdir is None:
+            result['figure'] = pickle.dumps(fig)
+        else:
+            result['file'] = os.path.join(outdir, page['name'] + '.png')
+            fig.savefig(result['file'], dpi=dpi)
+        plt.close(fig)
+        result['error'] = ''
+    except Exception as error:
+        result['error'] = type(error).__name__ + ': ' + str(error)
+    result['seconds'] = time.time()-start
+    return result
+
+
+#XXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXX########
+# FAN THE DIAGRAMS OUT ACROSS THE POOL
+#XXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXX########
+
+#this function adds a pickled figure (see render_page) to the multi-page PDF, as a vector page
+def write_pdf_page(pdf, figure):
+    import matplotlib.pyplot as plt
+    fig = pickle.loads(figure)
+    pdf.savefig(fig)
+    plt.close(fig)
+
+
+#this function renders every page of the atlas, as PNG files in outdir or (with fmt='pdf')
+#as outdir/sunpath_atlas.pdf, writing the timing of each diagram to outdir/timing.csv as it
+#finishes. Returns the list of results, in page order.
+def run_atlas(page_list, outdir, fmt='png', workers=None, dpi=100, tasks_per_worker=50, verbose=True):
+    os.makedirs(outdir, exist_ok=True)
+    timingfile = os.path.join(outdir, 'timing.csv')
+    header = ['page', 'name', 'lat', 'time', 'WallAzimuth', 'file', 'pid', 'seconds', 'error']
+    start = time.time()
+    result_list = [None]*len(page_list)
+    pdf = None
+    if fmt == 'pdf':
+        from matplotlib.backends.backend_pdf import PdfPages
+        pdf = PdfPages(os.path.join(outdir, 'sunpath_atlas.pdf'))
+    nextpage = 0
+    try:
+        with open(timingfile, 'w', newline='') as ftiming:
+            writer = csv.DictWriter(ftiming, header, extrasaction='ignore')
+            writer.writeheader()
+            with ProcessPoolExecutor(max_workers=workers, initializer=init_worker, initargs=(None,),
+                                     **pool_options(tasks_per_worker)) as pool:
+                futures = [pool.submit(render_page, page, None if pdf else outdir, dpi) for page in page_list]
+                for done, future in enumerate(as_completed(futures), 1):
+                    result = future.result()
+                    writer.writerow(result)
+                    ftiming.flush()
+                    result_list[result['page']] = result
+                    #the PDF pages are written in order, as soon as every earlier page is done
+                    while pdf is not None and nextpage < len(page_list) and result_list[nextpage] is not None:
+                        figure = result_list[nextpage].pop('figure', None)
+                        if figure is not None:
+                            write_pdf_page(pdf, figure)
+                        nextpage = nextpage+1
+                    if verbose:
+                        status = result['error'] or '{0:1.2f}s' .format(result['seconds'])
+                        print('[{0}/{1}] {2}: {3}' .format(done, len(page_list), result['name'], status))
+    finally:
+        if pdf is not None:
+            pdf.close()
+    if verbose:
+        print('{0} diagrams in {1:1.1f}s' .format(len(page_list), time.time()-start))
+    return result_list
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Render an atlas of sunpath diagrams over a range of latitudes.')
+    parser.add_argument('--out', default='sunpath_atlas', help='folder for the diagrams and timing log')
+    parser.add_argument('--format', default='png', choices=['png', 'pdf'], help='a PNG file per diagram, or one multi-page PDF')
+    parser.add_argument('--lat-min', type=float, default=-66, help='first latitude, degrees')
+    parser.add_argument('--lat-max', type=float, default=66, help='last latitude, degrees')
+    parser.add_argument('--lat-step', type=float, default=1, help='latitude step, degrees')
+    parser.add_argument('--time', default='clock,solar', help='comma separated time variants: ' + ', '.join(time_list))
+    parser.add_argument('--walls', default='185', help='comma separated wall azimuths of the protractors, degrees')
+    parser.add_argument('--workers', type=int, default=None, help='number of worker processes')
+    parser.add_argument('--dpi', type=int, default=100, help='resolution of the PNG diagrams')
+    args = parser.parse_args()
+    times = [variant for variant in args.time.split(',') if variant]
+    for variant in times:
+        if variant not in time_list:
+            parser.error('unknown time variant: ' + variant)
+    walls = [int(wall) for wall in args.walls.split(',') if wall]
+    page_list = atlas_pages(args.lat_min, args.lat_max, args.lat_step, times, walls)
+    run_atlas(page_list, args.out, args.format, args.workers, args.dpi)
@@ -0,0 +1,208 @@
+##########################################################################################
+# PyClim was developed by Prof. Darren Robinson (University of Sheffield, 2019).         #
+# PyClim produces a range of graphs and statistics to support the analysis of climate    #
+# data, to support architectural / engineering / technology students to develop their    #
+# early-stage bioclimatic design concepts.                                               #
+##########################################################################################
+
+
+#THIS MODULE BUILDS A CALENDAR INDEX FROM THE month, day AND hour COLUMNS OF A CLIMATE FILE
+#(SEE ClimateData). A NEW YEAR STARTS WHENEVER THE MONTH STEPS BACKWARDS, A YEAR IS A LEAP
+#YEAR IF IT HOLDS 29 FEBRUARY, AND MISSING HOURS SIMPLY SHORTEN THEIR DAY. THE FIRST ROW OF
+#EACH DAY, MONTH, SEASON AND YEAR IS FOUND ONCE, SO THAT DAILY / MONTHLY TOTALS, MEANS AND
+#EXTREMES ARE SINGLE np.ufunc.reduceat CALLS, AND CALENDAR MONTH / SEASON / HOUR TOTALS
+#ARE SINGLE np.bincount CALLS. THE RECORD MAY BE SUB-HOURLY (E.G. 10 OR 1 MINUTE): THE TIME
+#STEP IS FOUND FROM THE hour COLUMN, WHICH THEN HOLDS DECIMAL HOURS.
+
+#imports the basic libraries
+import numpy as np
+
+#the days in each month of a non-leap year, and the days before each month starts
+month_days = np.array([31,28,31,30,31,30,31,31,30,31,30,31])
+month_offsets = np.concatenate(([0], np.cumsum(month_days)[:-1]))
+
+#seasons (0 to 3) of months 1 to 12: December-February is season 0
+season_names = ['DJF', 'MAM', 'JJA', 'SON']
+month_seasons = np.array([0,0,1,1,1,2,2,2,3,3,3,0])
+
+#the number of groups of each calendar key, for the bincount totals
+calendar_lengths = {'month': 12, 'season': 4, 'hour': 24}
+
+
+#this function returns the mid-month day number of months 1 to 12 of a (non-)leap year,
+#as used by the ground temperature model
+def mid_month_days(leap=False):
+    days = month_days + (np.arange(1,13) == 2)*int(leap)
+    mid_month_days = np.cumsum(days) - days/2
+    return mid_month_days
+
+
+#this function returns the timeshift (hours) that locates the sun at the middle of each time
+#step: -timestep/2 when each step is labelled by its end, as in hourly files (hour 1 is
+#00:00-01:00), +timestep/2 when it is labelled by its start. A timeshift that is not None is
+#returned unchanged.
+def interval_timeshift(timeshift=None, timestep=1.0, end=True):
+    if timeshift is not None:
+        return timeshift
+    interval_timeshift = -timestep/2 if end == True else timestep/2
+    return interval_timeshift
+
+
+class TimeIndex:
+#the calendar of an hourly (or sub-hourly) record, from its month, day and hour columns.
+#If start_year is given, years are numbered from it and leap years follow the calendar;
+#otherwise years are numbered from 0 and a year is leap if it holds 29 February. The time
+#step (hours) is the most common step between rows of the same day, unless it is given.
+#Each step is labelled by its end (hours in (0, 24], as in hourly files), or by its start if
+#any row is at hour 0.
+
+    def __init__(self, month, day, hour, start_year=None, timestep=None):
+        self.month = np.asarray(month, dtype=int)
+        self.day = np.asarray(day, dtype=int)
+        self.hour = np.asarray(hour, dtype=float)
+        #the number of rows (one per hour for hourly data)
+        self.numhours = len(self.month)
+
+        #a new year starts whenever the month steps backwards
+        newyear = np.zeros(self.numhours, dtype=bool)
+        newyear[1:] = self.month[1:] < self.month[:-1]
+        self.year = np.cumsum(newyear)
+        numyears = int(self.year[-1])+1 if self.numhours > 0 else 0
+        if start_year is None:
+            self.year_list = np.arange(numyears)
+            self.leap_list = np.zeros(numyears, dtype=bool)
+            self.leap_list[self.year[(self.month == 2) & (self.day == 29)]] = True
+        else:
+            self.year_list = start_year + np.arange(numyears)
+            self.leap_list = (self.year_list % 4 == 0) & ((self.year_list % 100 != 0) | (self.year_list % 400 == 0))
+            self.year = self.year + start_year
+        leap = self.leap_list[self.year - self.year_list[0]] if numyears > 0 else np.zeros(0, dtype=bool)
+
+        #the day of the year (1 to 365, or 366) of every hour, for the solar geometry
+        self.jday = month_offsets[self.month-1] + self.day + (leap & (self.month > 2))
+        self.season = month_seasons[self.month-1]
+
+        #the first row of every day, month, season and year
+        newday = np.ones(self.numhours, dtype=bool)
+        newday[1:] = (self.day[1:] != self.day[:-1]) | (self.month[1:] != self.month[:-1]) | newyear[1:]
+        newmonth = np.ones(self.numhours, dtype=bool)
+        newmonth[1:] = (self.month[1:] != self.month[:-1]) | newyear[1:]
+        newseason = np.ones(self.numhours, dtype=bool)
+        newseason[1:] = self.season[1:] != self.season[:-1]
+        newyear[:1] = True
+        self.starts = {'day': np.flatnonzero(newday),
+                       'month': np.flatnonzero(newmonth),
+                       'season': np.flatnonzero(newseason),
+                       'year': np.flatnonzero(newyear)}
+        #the running day number (0, 1, 2, ...) of every hour, across the whole record
+        self.daynum = np.cumsum(newday)-1
+
+        #the time step, in hours, rounded to the second
+        if timestep is None:
+            step = np.diff(self.hour)[~newday[1:]]
+            step = step[step > 0]
+            timestep = float(np.median(step)) if len(step) > 0 else 1.0
+            timestep = round(timestep*3600)/3600
+        self.timestep = float(timestep)
+        #the number of steps in a day, e.g. 24 for hourly or 144 for 10 minute data
+        self.perday = int(round(24/self.timestep))
+        #whether each step is labelled by its end, and the hour at which each step starts
+        self.end = not (self.hour == 0).any()
+        self.start_hour = self.hour - self.timestep if self.end == True else self.hour
+        #the step of the day (0 to perday-1) and the clock hour (1 to 24) of every row
+        self.step = np.clip(np.rint(self.start_hour/self.timestep).astype(int), 0, self.perday-1)
+        self.clock_hour = np.clip(np.floor(self.start_hour + 1e-6).astype(int)+1, 1, 24)
+
+
+    def count(self, group):
+    #returns the number of rows in each day, month, season or year
+        count = np.diff(np.append(self.starts[group], self.numhours))
+        return count
+
+
+    def first(self, values, group):
+    #returns the value of the first row of each group, e.g. first(month, 'day') is the
+    #month of each day
+        first = np.asarray(values)[self.starts[group]]
+        return first
+
+
+    def reduce(self, values, group, ufunc=np.add):
+    #reduces values (hours along the first axis) over each group, with one reduceat call
+        reduce = ufunc.reduceat(np.asarray(values, dtype=float), self.starts[group], axis=0)
+        return reduce
+
+
+    def sum(self, values, group):
+        return self.reduce(values, group, np.add)
+
+
+    def mean(self, values, group):
+        values = np.asarray(values, dtype=float)
+        count = self.count(group).reshape((-1,) + (1,)*(values.ndim-1))
+        mean = self.reduce(values, group, np.add)/count
+        return mean
+
+
+    def max(self, values, group):
+        return self.reduce(values, group, np.maximum)
+
+
+    def min(self, values, group):
+        return self.reduce(values, group, np.minimum)
+
+
+    def timeshift(self, timeshift=None):
+    #the timeshift that places the sun at the middle of each step, see interval_timeshift
+        return interval_timeshift(timeshift, self.timestep, self.end)
+
+
+    def total_by(self, key, values=None):
+    #totals values (or, without values, counts rows) by calendar month (1 to 12), season
+    #(see season_names) or clock hour of the day (1 to 24), pooling all years
+        if key == 'month':
+            code = self.month-1
+        elif key == 'season':
+            code = self.season
+        else:
+            code = self.clock_hour-1
+        total_by = np.bincount(code, weights=values, minlength=calendar_lengths[key])
+        return total_by
+
+
+    def mean_by(self, key, values):
+    #the mean of values by calendar month, season or hour of the day (nan where empty)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            mean_by = self.total_by(key, np.asarray(values, dtype=float))/self.total_by(key)
+        return mean_by
+
+
+    def split_by(self, key, values):
+    #returns a list of the values of each calendar month, season or hour of the day, e.g.
+    #for violin plots
+        if key == 'month':
+            code = self.month
+            keys = range(1,13)
+        elif key == 'season':
+            code = self.season
+            keys = range(4)
+        else:
+            code = self.clock_hour
+            keys = range(1,25)
+        values = np.asarray(values)
+        split_by = [values[code == k] for k in keys]
+        return split_by
+
+
+    def grid(self, values, fill=np.nan):
+    #arranges the values of every row into a (days x perday) grid, e.g. (days x 24) for
+    #hourly data, for surface plots; missing steps are left as fill
+        grid = np.full((len(self.starts['day']), self.perday), fill, dtype=float)
+        grid[self.daynum, self.step] = values
+        return grid
+
+
+#this function builds the TimeIndex of a climate file read by ClimateData
+def time_index(data, start_year=None, timestep=None):
+    time_index = TimeIndex(data['month'], data['day'], data['hour'], start_year, timestep)
+    return time_index
@@ -11,322 +11,335 @@
 #5) wind speed / temperature frequency histograms, 6) ground temperature profile. 
 
 
+#The analysis is in analyse_weather (which only needs numpy) and the figures are created
+#by WeatherFigures, so that this module can be imported without reading a file, plotting or
+#importing matplotlib. Running it as a script analyses the climate file named in
+#ClimAnalFunctions and shows each figure in turn.
+
+
 #imports the basic libraries
-import math
-import matplotlib.pyplot as plt
 import numpy as np
 
 from ClimAnalFunctions import * 
+from ClimAnalArrays import illuminance_array, solar_position
+from ClimateData import read_climate
+from DaylightQuery import IlluminanceQuery
+from Histograms import frequency_table
+from SkyState import calculate_sky_state, read_sky_state
+from TimeIndex import time_index, mid_month_days
+from WeatherStats import summary_statistics, sunrise_sunset
 
 
 globaleff = False
-daynum_list = []
-file_list = []
-temp_list = []
-dailymeantemp_list = []
-rh_list = []
-global_list = []
-diffuse_list = []
-winspeed_list= []
-windir_list = []
-temp_matrix = []
-winspeed_matrix = []
-tground_matrix=[]
-depth_list = []
-Colour_list = []
-Month_list=[]
-daytempprofile = []
-Diurnal_matrix = []
-rh_matrix = []
-SRtime_list = []
-SStime_list = []
-day_list = []
-dec_list = []
-illuminance_list = []
-
-MonthlyHDD_list = []
-MonthlyCDD_list = []
 HDDbase = 15.5
 CDDbase=18
+#a folder to save the figures to, off-screen and in parallel (see WeatherReport), rather than showing them
+ReportFolder = None
 
-TotalHDD=0
-TotalCDD=0
-Rho=1.2 #kg/m3
-WindKineticEnergy=0
-AnnualIgh=0
-DiffuseFraction=0
-
-lat = lat * pi / 180
-
-numhours=0
-for line in file:
-    line = line.rstrip('\n')
-    line = line.split(',')
-    file_list.append(line)
-    numhours=numhours+1
-file.close()
-
-
-#this popuates lists with the corresponding data
-for h in range (3, len(file_list)):
-    temp_list.append(float(file_list[h][3]))
-    rh_list.append(float(file_list[h][4]))
-    global_list.append(float(file_list[h][5]))
-    diffuse_list.append(float(file_list[h][6]))
-    winspeed_list.append(float(file_list[h][7]))
-    windir_list.append(float(file_list[h][8]))
-
-
-AnnualIgh = sum(global_list)/1000
-DiffuseFraction = sum(diffuse_list)/sum(global_list)
-
-cumday=0
-annualmeantemp=0
-meandaytemp=0
-
-daynum_list = [31,28,31,30,31,30,31,31,30,31,30,31]
-MonthlyHDD_list = [0 for i in range(0,12)]
-MonthlyCDD_list = [0 for i in range(0,12)]
-for i in range(1,13):
-    temp_matrix.append([])
-    winspeed_matrix.append([])
-    Diurnal_matrix.append([])
-    rh_matrix.append([])
-    for j in range(1,daynum_list[i-1]+1):
-        cumday=cumday+1
-        daymeantemp=0
-        day_list.append(cumday)
-        dec_list.append(declin_angle(cumday))
-        SStime, SRtime = sunrise_time(dec_list[cumday-1],lat,cumday)
-        dT = time_diff(cumday,False,longitude,timezone,timeshift)
-        SStime_list.append(min(24,SStime+dT))
-        SRtime_list.append(max(1,SRtime+dT))
-        for k in range(1,25):
-                temp_matrix[i-1].append(temp_list[24*(cumday-1)+k-1])
-                winspeed_matrix[i-1].append(winspeed_list[24*(cumday-1)+k-1])
-                rh_matrix[i-1].append(rh_list[24*(cumday-1)+k-1])
-                WindKineticEnergy=WindKineticEnergy+0.5*Rho*winspeed_list[24*(cumday-1)+k-1]**3/1000
-                #Accrue monthly degree days
-                #annual mean temp for ground temperature model
-                annualmeantemp=annualmeantemp+temp_list[24*(cumday-1)+k-1]/len(temp_list)
-                daymeantemp = daymeantemp + temp_list[24*(cumday-1)+k-1]/24
-                daytempprofile.append(temp_list[24*(cumday-1)+k-1])
-                #This populates an hour list of iluminance, for an iluminance availability plot
-                ibn=0
-                illuminance=0
-                solalt = solar_altitude(cumday,k + dT,lat,dec_list[cumday-1])
-                if solalt>0 and global_list[24*(cumday-1)+k-1]>0:
-                    ibn = (global_list[24*(cumday-1)+k-1] - diffuse_list[24*(cumday-1)+k-1])/math.sin(solalt)
-                    if globaleff==True and diffuse_list[24*(cumday-1)+k-1]>0:
-                        illuminance = global_list[24*(cumday-1)+k-1]*LumEff(globaleff,cumday,solalt,diffuse_list[24*(cumday-1)+k-1],ibn)
-                    elif globaleff==False and diffuse_list[24*(cumday-1)+k-1]>0:
-                        illuminance = diffuse_list[24*(cumday-1)+k-1]*LumEff(globaleff,cumday,solalt,diffuse_list[24*(cumday-1)+k-1],ibn)
-                illuminance_list.append(illuminance*10**-3)
-        if daymeantemp > CDDbase:
-            MonthlyCDD_list[i-1] = MonthlyCDD_list[i-1] + (daymeantemp - CDDbase)
-            TotalCDD = TotalCDD + (daymeantemp - CDDbase)
-        if daymeantemp < HDDbase:
-            MonthlyHDD_list[i-1] = MonthlyHDD_list[i-1] + (HDDbase - daymeantemp)
-            TotalHDD = TotalHDD + (HDDbase - daymeantemp)
-        dailymeantemp_list.append(daymeantemp)
-        Diurnal_matrix[i-1].append(max(daytempprofile)-min(daytempprofile))
-        daytempprofile.clear()
 
-#This part calculates ground temperature profiles. 
-maxmeandaytemp=max(dailymeantemp_list)
-minmeandaytemp=min(dailymeantemp_list)
-t_offset = dailymeantemp_list.index(minmeandaytemp)+1
-amplitude=0.5*(maxmeandaytemp-minmeandaytemp)
-
-cum_monthmeandaynum=0
-for i in range(1,13):
-    tground_matrix.append([])
-    cum_monthmeandaynum=cum_monthmeandaynum+daynum_list[i-1]
-    for depth in range (0,21):
-        #need to populate a 2D list here with temps for month and depth
-        #t_mean,t_swing,t_month,t_ref,depth
-        tground_matrix[i-1].append(Tground(annualmeantemp,amplitude,cum_monthmeandaynum - daynum_list[i-1]/2,t_offset,depth))
-        if i==1:
-            depth_list.append(depth)
+#XXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXX########
+# THE STAGES OF THE ANALYSIS
+#XXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXX########
 
+#each stage is a function of the pipeline (which holds the data and the site) and of the
+#stages named as its inputs in stage_list
+
+#the calendar of the data (see TimeIndex)
+def stage_index(pipeline):
+    stage_index = time_index(pipeline.data)
+    return stage_index
+
+
+#the sun's altitude and azimuth (radians) in every hour
+def stage_solar_position(pipeline, index):
+    solalt, solaz, dec, dT = solar_position(index.jday, index.hour, pipeline.lat, pipeline.longitude, pipeline.timezone, index.timeshift(pipeline.timeshift))
+    stage_solar_position = {'solalt': solalt, 'solaz': solaz}
+    return stage_solar_position
+
+
+#the hourly sky state (see SkyState): the Perez clearness and brightness of every hour
+def stage_sky_state(pipeline, index, sun):
+    stage_sky_state = calculate_sky_state(pipeline.data, pipeline.lat, pipeline.longitude, pipeline.timezone, pipeline.timeshift, index, sun)
+    return stage_sky_state
+
+
+#the summary statistics and degree-days
+def stage_summary(pipeline, index):
+    stage_summary = summary_statistics(pipeline.data, pipeline.HDDbase, pipeline.CDDbase, index)
+    return stage_summary
+
+
+#the days of the year, for the solar availability plots
+def stage_day_list(pipeline, index):
+    stage_day_list = np.arange(1, len(index.starts['day'])+1)
+    return stage_day_list
+
+
+#the daily SR, SS times, for the solar availability plots
+def stage_sunrise_sunset(pipeline, index):
+    stage_sunrise_sunset = sunrise_sunset(index.first(index.jday, 'day'), pipeline.lat, pipeline.longitude, pipeline.timezone, index.timeshift(pipeline.timeshift))
+    return stage_sunrise_sunset
+
+
+def stage_SRtime_list(pipeline, sunrise_sunset):
+    return sunrise_sunset[0]
+
+
+def stage_SStime_list(pipeline, sunrise_sunset):
+    return sunrise_sunset[1]
+
+
+def stage_temp_list(pipeline):
+    return pipeline.data['dbt']
+
+
+def stage_winspeed_list(pipeline):
+    return pipeline.data['winspeed']
+
+
+def stage_global_list(pipeline):
+    return pipeline.data['global']
 
-#PRINT SUMMARY STATISTICS
-print('')
-print('')
-print('Annual global horizontal solar irradiation: {0:1.2f}' .format(AnnualIgh)  + ', kWh/m^2')
-print('Annual solar diffuse fraction: {0:1.3f}' .format(DiffuseFraction))
-print('Total annual wind kinetic energy flux: {0:1.2f}' .format(WindKineticEnergy) + ', kWh/m^2')
-print('Total annual heating degree-days: {0:1.0f}' .format(TotalHDD))
-print('Total annual cooling degree-days: {0:1.0f}' .format(TotalCDD))
-print('')
-print('')
 
+#the hours of each month
+def stage_temp_matrix(pipeline, index):
+    stage_temp_matrix = index.split_by('month', pipeline.data['dbt'])
+    return stage_temp_matrix
 
 
-Colour_list = ['firebrick', 'salmon', 'darkorange', 'orange', 'gold', 'yellow', 'yellowgreen', 'green', 'olive', 'cyan', 'skyblue', 'blue']
-Month_list = ['Jan', 'Feb', 'Mar', 'Apr', 'May', 'Jun', 'Jul', 'Aug', 'Sep', 'Oct', 'Nov', 'Dec']
-plt.figure(figsize=(12, 6))
+def stage_rh_matrix(pipeline, index):
+    stage_rh_matrix = index.split_by('month', pipeline.data['rh'])
+    return stage_rh_matrix
+
+
+def stage_winspeed_matrix(pipeline, index):
+    stage_winspeed_matrix = index.split_by('month', pipeline.data['winspeed'])
+    return stage_winspeed_matrix
+
+
+#the diurnal temperature range of each day of each month
+def stage_Diurnal_matrix(pipeline, index):
+    temp_list = pipeline.data['dbt']
+    daymonth_list = index.first(index.month, 'day')
+    Diurnal_list = index.max(temp_list, 'day') - index.min(temp_list, 'day')
+    stage_Diurnal_matrix = [Diurnal_list[daymonth_list == month] for month in range(1,13)]
+    return stage_Diurnal_matrix
+
+
+def stage_dailymeantemp_list(pipeline, index):
+    stage_dailymeantemp_list = index.mean(pipeline.data['dbt'], 'day')
+    return stage_dailymeantemp_list
+
+
+#This populates an hour list of iluminance (klux), for an iluminance availability plot
+def stage_illuminance_list(pipeline, index, sun, skystate):
+    stage_illuminance_list = illuminance_array(pipeline.globaleff, index.jday, sun['solalt'], pipeline.data['global'], pipeline.data['diffuse'], skystate)*10**-3
+    return stage_illuminance_list
+
+
+#the binned frequency tables of the temperature, wind speed and illuminance histograms (see Histograms)
+def stage_temp_histogram(pipeline, index):
+    stage_temp_histogram = frequency_table(pipeline.data['dbt'], timestep=index.timestep)
+    return stage_temp_histogram
+
+
+def stage_winspeed_histogram(pipeline, index):
+    stage_winspeed_histogram = frequency_table(pipeline.data['winspeed'], timestep=index.timestep)
+    return stage_winspeed_histogram
+
+
+def stage_illuminance_histogram(pipeline, index, illuminance_list):
+    stage_illuminance_histogram = frequency_table(illuminance_list, low=1, timestep=index.timestep)
+    return stage_illuminance_histogram
+
+
+#the hours of daylight above any illuminance thresholds, by both efficacy models (see DaylightQuery)
+def stage_illuminance_query(pipeline, index, skystate):
+    stage_illuminance_query = IlluminanceQuery(pipeline.data, pipeline.lat, pipeline.longitude, pipeline.timezone, pipeline.timeshift, index, skystate)
+    return stage_illuminance_query
+
+
+def stage_depth_list(pipeline):
+    return list(range(0,21))
+
+
+#This part calculates ground temperature profiles. 
+def stage_tground_matrix(pipeline, index, dailymeantemp_list, depth_list):
+    #annual mean temp for ground temperature model
+    annualmeantemp = pipeline.data['dbt'].mean()
+    maxmeandaytemp=max(dailymeantemp_list)
+    minmeandaytemp=min(dailymeantemp_list)
+    t_offset = index.first(index.jday, 'day')[np.argmin(dailymeantemp_list)]
+    amplitude=0.5*(maxmeandaytemp-minmeandaytemp)
+
+    stage_tground_matrix=[]
+    for month_meandaynum in mid_month_days(index.leap_list[0]):
+        #t_mean,t_swing,t_month,t_ref,depth
+        stage_tground_matrix.append([Tground(annualmeantemp,amplitude,month_meandaynum,t_offset,depth) for depth in depth_list])
+    return stage_tground_matrix
+
+
+#the inputs and function of each stage, by name
+stage_list = {}
+stage_list['index'] = ((), stage_index)
+stage_list['solar_position'] = (('index',), stage_solar_position)
+stage_list['sky_state'] = (('index', 'solar_position'), stage_sky_state)
+stage_list['summary'] = (('index',), stage_summary)
+stage_list['day_list'] = (('index',), stage_day_list)
+stage_list['sunrise_sunset'] = (('index',), stage_sunrise_sunset)
+stage_list['SRtime_list'] = (('sunrise_sunset',), stage_SRtime_list)
+stage_list['SStime_list'] = (('sunrise_sunset',), stage_SStime_list)
+stage_list['temp_list'] = ((), stage_temp_list)
+stage_list['winspeed_list'] = ((), stage_winspeed_list)
+stage_list['global_list'] = ((), stage_global_list)
+stage_list['temp_matrix'] = (('index',), stage_temp_matrix)
+stage_list['rh_matrix'] = (('index',), stage_rh_matrix)
+stage_list['winspeed_matrix'] = (('index',), stage_winspeed_matrix)
+stage_list['Diurnal_matrix'] = (('index',), stage_Diurnal_matrix)
+stage_list['dailymeantemp_list'] = (('index',), stage_dailymeantemp_list)
+stage_list['illuminance_list'] = (('index', 'solar_position', 'sky_state'), stage_illuminance_list)
+stage_list['temp_histogram'] = (('index',), stage_temp_histogram)
+stage_list['winspeed_histogram'] = (('index',), stage_winspeed_histogram)
+stage_list['illuminance_histogram'] = (('index', 'illuminance_list'), stage_illuminance_histogram)
+stage_list['illuminance_query'] = (('index', 'sky_state'), stage_illuminance_query)
+stage_list['depth_list'] = ((), stage_depth_list)
+stage_list['tground_matrix'] = (('index', 'dailymeantemp_list', 'depth_list'), stage_tground_matrix)
+
+#the results of analyse_weather: everything needed for the figures of WeatherFigures
+result_list = ['summary', 'index', 'day_list', 'SRtime_list', 'SStime_list', 'temp_list', 'winspeed_list', 'global_list',
+               'temp_matrix', 'rh_matrix', 'winspeed_matrix', 'Diurnal_matrix', 'illuminance_list', 'tground_matrix', 'depth_list',
+               'temp_histogram', 'winspeed_histogram', 'illuminance_histogram']
+
+
+#XXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXX########
+# THE SCHEDULER
+#XXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXX########
+
+#this class resolves the stages of the analysis of the climate data of a site at latitude
+#lat (radians), calculating each only when it (or a stage that depends on it) is asked for,
+#and then keeping it. The index and sky state may be given, so that they are not calculated.
+class WeatherPipeline:
+
+    def __init__(self, data, lat, longitude, timezone, timeshift, globaleff=globaleff, HDDbase=HDDbase, CDDbase=CDDbase, index=None, skystate=None):
+        self.data = data
+        self.lat = lat
+        self.longitude = longitude
+        self.timezone = timezone
+        self.timeshift = timeshift
+        self.globaleff = globaleff
+        self.HDDbase = HDDbase
+        self.CDDbase = CDDbase
+        self.values = {}
+        #the stages calculated so far, in the order they were calculated
+        self.computed = []
+        if index is not None:
+            self.values['index'] = index
+        if skystate is not None:
+            self.set_sky_state(skystate)
+
+    def set_sky_state(self, skystate):
+        #gives the sky state (e.g. read from the derived cache, see SkyState), and with it the sun position it holds
+        self.values['sky_state'] = skystate
+        self.values['solar_position'] = {'solalt': skystate['solalt'], 'solaz': skystate['solaz']}
+
+    def requires(self, outputs):
+        #returns the stages the outputs depend on (and the outputs), inputs first, that are not yet known
+        requires = []
+        def visit(name):
+            if name not in stage_list:
+                raise KeyError('unknown stage: ' + str(name))
+            if name in requires or name in self.values:
+                return
+            for input_name in stage_list[name][0]:
+                visit(input_name)
+            requires.append(name)
+        for name in outputs:
+            visit(name)
+        return requires
+
+    def get(self, name):
+        #returns a stage, calculating it and any of its inputs not yet known
+        for stage in self.requires([name]):
+            input_list, function = stage_list[stage]
+            self.values[stage] = function(self, *[self.values[input_name] for input_name in input_list])
+            self.computed.append(stage)
+        return self.values[name]
+
+    def compute(self, outputs):
+        #returns a dictionary of the outputs
+        compute = {}
+        for name in outputs:
+            compute[name] = self.get(name)
+        return compute
+
+
+#this function analyses the climate data (see ClimateData) of a site at latitude lat
+#(radians), returning a dictionary of the outputs (by default the summary statistics and
+#everything needed for the figures of WeatherFigures). Only the stages the outputs depend on
+#are calculated (see WeatherPipeline): outputs=['summary'] reads no sun position or sky state.
+#Days and months follow the calendar of the data (see TimeIndex), and the illuminance its
+#hourly sky state (see SkyState); both are calculated if they are needed and not given.
+def analyse_weather(data, lat, longitude, timezone, timeshift, globaleff=globaleff, HDDbase=HDDbase, CDDbase=CDDbase, index=None, skystate=None, outputs=result_list):
+    pipeline = WeatherPipeline(data, lat, longitude, timezone, timeshift, globaleff, HDDbase, CDDbase, index, skystate)
+    analyse_weather = pipeline.compute(outputs)
+    return analyse_weather
+
+
+#PRINT SUMMARY STATISTICS
+def print_summary(summary):
+    print('')
+    print('')
+    print('Annual global horizontal solar irradiation: {0:1.2f}' .format(summary['AnnualIgh'])  + ', kWh/m^2')
+    print('Annual solar diffuse fraction: {0:1.3f}' .format(summary['DiffuseFraction']))
+    print('Total annual wind kinetic energy flux: {0:1.2f}' .format(summary['WindKineticEnergy']) + ', kWh/m^2')
+    print('Total annual heating degree-days: {0:1.0f}' .format(summary['TotalHDD']))
+    print('Total annual cooling degree-days: {0:1.0f}' .format(summary['TotalCDD']))
+    print('')
+    print('')
 
-for month in range (1,13):
-    #plt.scatter(tground_matrix[month-1], depth_list, c=Colour_list[month-1], s=20)
-    plt.plot(tground_matrix[month-1], depth_list, lw=2, c=Colour_list[11-(month-1)])
 
-plt.title("Ground temperature profile")
-plt.xlabel('temperature, oC')
-plt.ylabel('depth below surface, m')
+def main():
+    import matplotlib.pyplot as plt
+    import WeatherFigures
 
-plt.ylim(0,20)
+    #this reads the climate data into typed columns
+    data = read_climate(filename, timestep=timestep)
+    skystate = read_sky_state(filename, lat * pi / 180, longitude, timezone, timeshift, timestep=timestep)
+    results = analyse_weather(data, lat * pi / 180, longitude, timezone, timeshift, globaleff, HDDbase, CDDbase, skystate=skystate)
+    summary = results['summary']
+    print_summary(summary)
 
-plt.ylim(plt.ylim()[::-1])
+    if ReportFolder is not None:
+        from WeatherReport import render_report
+        render_report(results, ReportFolder, globaleff=globaleff, filename=filename)
+        return
 
-plt.legend(['Jan', 'Feb', 'Mar', 'Apr', 'May', 'Jun', 'Jul', 'Aug', 'Sep', 'Oct', 'Nov', 'Dec'])
-plt.show()
-tground_matrix.clear()
+    WeatherFigures.plot_ground_profile(results['tground_matrix'], results['depth_list'])
+    plt.show()
 
+    #this plots histograms:
+    WeatherFigures.plot_temperature_histogram(results['temp_histogram'])
+    plt.show()
 
-#this plots histograms:
-fig,ax = plt.subplots(1,1, figsize = (12,6), tight_layout=True)
-#plots a standard frequency distribution
-xrange=int(max(temp_list)-int(min(temp_list)))
-ax.hist(temp_list, xrange, alpha=0.3, histtype='step', color='darkgray', lw=3)
+    WeatherFigures.plot_windspeed_histogram(results['winspeed_histogram'])
+    plt.show()
 
-#creates a y2 axis for the cumulative distribution
-ax2 = ax.twinx() 
-ax2.hist(temp_list, bins = xrange, cumulative=True, alpha=1, histtype='step', color='red', lw=3)
-ax2.hist(temp_list, bins = xrange, cumulative=-1, alpha=1, histtype='step', color='blue', lw=3)
+    WeatherFigures.plot_illuminance_cdf(results['illuminance_histogram'])
+    plt.show()
 
+    WeatherFigures.plot_degree_days(summary['MonthlyHDD'], summary['MonthlyCDD'])
+    plt.show()
 
-ax.set_title("temperature frequency histogram")
-ax.set_xlabel('temperature bins, oC')
-ax.set_ylabel('counts [grey]')
-ax2.set_ylabel('cumulative counts [red / blue]')
+    #this plots violin plots:
+    WeatherFigures.plot_violins(results['temp_matrix'], results['rh_matrix'], results['Diurnal_matrix'], results['winspeed_matrix'])
+    plt.show()
 
-plt.show()
-temp_list.clear()
+    WeatherFigures.plot_solar_availability(results['index'].grid(results['global_list']), results['day_list'], results['SRtime_list'], results['SStime_list'])
+    plt.show()
 
+    WeatherFigures.plot_daylight_availability(results['index'].grid(results['illuminance_list']), results['day_list'], results['SRtime_list'], results['SStime_list'], globaleff)
+    plt.show()
 
-fig,ax = plt.subplots(1,1, figsize = (12,6), tight_layout=True)
-#plots a standard frequency distribution
-xrange=int(max(winspeed_list)-int(min(winspeed_list)))
-ax.hist(winspeed_list, xrange, alpha=0.3, histtype='step', color='darkgray', lw=3)
-#creates a y2 axis for the cumulative distribution
-ax2 = ax.twinx() 
-ax2.hist(winspeed_list, bins = xrange, cumulative=True, alpha=1, histtype='step', color='red', lw=3)
-#ax2.hist(winspeed_list, bins = xrange, cumulative=-1, alpha=1, histtype='step', color='blue', lw=3)
 
-
-ax.set_title("wind speed frequency histogram")
-ax.set_xlabel('wind speed bins, m/s')
-ax.set_ylabel('counts [grey]')
-ax2.set_ylabel('cumulative counts [red]')
-
-plt.show()
-winspeed_list.clear()
-
-
-#plots a decrementing illuminance histogram
-fig,ax = plt.subplots(1,1, figsize = (12,6), tight_layout=True)
-xrange=int((max(illuminance_list)-int(min(illuminance_list))))
-ax.hist(illuminance_list, xrange, alpha=1, histtype='stepfilled', color='red', cumulative=-1, range = [1,max(illuminance_list)])
-
-ax.set_title("inverse cumulative illuminance frequency histogram")
-ax.set_xlabel('illuminance bins, klux')
-ax.set_ylabel('cumulative counts')
-
-plt.show()
-
-
-#plots a degree-day histograms
-fig,ax = plt.subplots(1,1, figsize = (12,6), tight_layout=True)
-xlist = np.linspace(1, 12, 12)
-y1 = ax.bar(xlist, MonthlyHDD_list, alpha=1, color='blue')
-y2 = ax.bar(xlist, MonthlyCDD_list, alpha=1, color='red')
-
-ax.set_title("Monthly degree-days")
-ax.set_xlabel('Time, months')
-ax.set_ylabel('Monthly degree days')
-plt.legend((y1[0],y2[0]), ('Heating', 'Cooling'), loc='best')
-plt.show()
-
-
-
-#this plots violin plots:
-fig,axes = plt.subplots(2,2, figsize = (12,6))
-
-temp_data_to_plot = [temp_matrix[0], temp_matrix[1], temp_matrix[2], temp_matrix[3], temp_matrix[4], temp_matrix[5], temp_matrix[6], temp_matrix[7], temp_matrix[8], temp_matrix[9], temp_matrix[10], temp_matrix[11]]
-axes[0,0].violinplot(temp_data_to_plot)
-axes[0,0].set_title('Temperature Violin Plot')
-axes[0,0].set_xlabel('Time, months')
-axes[0,0].set_ylabel('Temperature, oC')
-
-rh_data_to_plot = [rh_matrix[0], rh_matrix[1], rh_matrix[2], rh_matrix[3], rh_matrix[4], rh_matrix[5], rh_matrix[6], rh_matrix[7], rh_matrix[8], rh_matrix[9], rh_matrix[10], rh_matrix[11]]
-axes[0,1].violinplot(rh_data_to_plot)
-axes[0,1].set_title('Relative Humidity Violin Plot')
-axes[0,1].set_xlabel('Time, months')
-axes[0,1].set_ylabel('Relative Humidity, %')
-
-diurnal_data_to_plot = [Diurnal_matrix[0], Diurnal_matrix[1], Diurnal_matrix[2], Diurnal_matrix[3], Diurnal_matrix[4], Diurnal_matrix[5], Diurnal_matrix[6], Diurnal_matrix[7], Diurnal_matrix[8], Diurnal_matrix[9], Diurnal_matrix[10], Diurnal_matrix[11]]
-axes[1,0].violinplot(diurnal_data_to_plot)
-axes[1,0].set_title('Diurnal Temperature Violin Plot')
-axes[1,0].set_xlabel('Time, months')
-axes[1,0].set_ylabel('Diurnal temperature, oC')
-
-winspeed_data_to_plot = [winspeed_matrix[0], winspeed_matrix[1], winspeed_matrix[2], winspeed_matrix[3], winspeed_matrix[4], winspeed_matrix[5], winspeed_matrix[6], winspeed_matrix[7], winspeed_matrix[8], winspeed_matrix[9], winspeed_matrix[10], winspeed_matrix[11]]
-axes[1,1].violinplot(winspeed_data_to_plot)
-axes[1,1].set_title('Wind Speed Violin Plot')
-axes[1,1].set_xlabel('Time, months')
-axes[1,1].set_ylabel('Wind Speed, m/s')
-
-fig.tight_layout()
-plt.show()
-
-temp_matrix.clear()
-winspeed_matrix.clear()
-Diurnal_matrix.clear()
-rh_matrix.clear()
-
-
-#This creates a 2D solar availability surface plot
-#NOTE: the chart is asymmetric because of the hour-centred convention.
-xlist = np.linspace(0, 23, 24)
-ylist = np.linspace(1, 365, 365)
-X, Y = np.meshgrid(xlist, ylist)
-fig,ax=plt.subplots(1,1, figsize=(12,6))
-#this part converts the list into an array and reshapes it, to match the x,y dimensions
-Z = np.array(global_list)
-Z = Z.reshape(365,24)
-cp = ax.contourf(Y, X, Z, 16, cmap='jet') #'plasma', 'jet' and 'viridis' are also good cmaps
-fig.colorbar(cp, label = 'Global horizontal solar irradiance, W/m^2') # Adds a colorbar
-ax.set_title('Solar Availability Surface Plot')
-ax.set_xlabel('Time, days')
-ax.set_ylabel('Time, hours')
-
-plt.plot(day_list, SRtime_list,c='red')
-plt.plot(day_list, SStime_list,c='red')    
-plt.show()
-global_list.clear()
-
-
-#This creates a 2D daylight availability surface plot
-#NOTE: the chart is asymmetric because of the hour-centred convention.
-xlist = np.linspace(0, 23, 24)
-ylist = np.linspace(1, 365, 365)
-X, Y = np.meshgrid(xlist, ylist)
-fig,ax=plt.subplots(1,1, figsize=(12,6))
-#this part converts the list into an array and reshapes it, to match the x,y dimensions
-Z = np.array(illuminance_list)
-Z = Z.reshape(365,24)
-cp = ax.contourf(Y, X, Z, 16, cmap='jet') #'plasma', 'jet' and 'viridis' are also good cmaps
-if globaleff==False:
-    fig.colorbar(cp, label = 'diffuse horizontal illuminance, kLux') # Adds a colorbar
-else:
-    fig.colorbar(cp, label = 'global horizontal illuminance, kLux') # Adds a colorbar
-ax.set_title('Daylight Availability Surface Plot')
-ax.set_xlabel('Time, days')
-ax.set_ylabel('Time, hours')
-
-plt.plot(day_list, SRtime_list,c='red')
-plt.plot(day_list, SStime_list,c='red')    
-plt.show()
-
-illuminance_list.clear()
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,189 @@
+##########################################################################################
+# PyClim was developed by Prof. Darren Robinson (University of Sheffield, 2019).         #
+# PyClim produces a range of graphs and statistics to support the analysis of climate    #
+# data, to support architectural / engineering / technology students to develop their    #
+# early-stage bioclimatic design concepts.                                               #
+##########################################################################################
+
+
+#THIS MODULE CREATES THE WeatherAnalysis FIGURES FROM PRE-CALCULATED DATA. EACH FUNCTION
+#RETURNS ITS FIGURE, WITHOUT SHOWING IT, SO THAT IT CAN EITHER BE SHOWN OR SAVED.
+
+#imports the basic libraries
+import numpy as np
+
+from Histograms import FrequencyTable, frequency_table
+
+Colour_list = ['firebrick', 'salmon', 'darkorange', 'orange', 'gold', 'yellow', 'yellowgreen', 'green', 'olive', 'cyan', 'skyblue', 'blue']
+Month_list = ['Jan', 'Feb', 'Mar', 'Apr', 'May', 'Jun', 'Jul', 'Aug', 'Sep', 'Oct', 'Nov', 'Dec']
+
+
+#plots the ground temperature profile of each month
+def plot_ground_profile(tground_matrix, depth_list):
+    import matplotlib.pyplot as plt
+    fig,ax = plt.subplots(1,1, figsize=(12, 6))
+
+    for month in range (1,13):
+        #ax.scatter(tground_matrix[month-1], depth_list, c=Colour_list[month-1], s=20)
+        ax.plot(tground_matrix[month-1], depth_list, lw=2, c=Colour_list[11-(month-1)])
+
+    ax.set_title("Ground temperature profile")
+    ax.set_xlabel('temperature, oC')
+    ax.set_ylabel('depth below surface, m')
+
+    ax.set_ylim(0,20)
+
+    ax.set_ylim(ax.get_ylim()[::-1])
+
+    ax.legend(Month_list)
+    return fig
+
+
+#plots a temperature frequency histogram, with cumulative and reverse cumulative counts,
+#from a FrequencyTable (see Histograms), or from temperatures binned once over edges (by
+#default about 1oC from the minimum to the maximum)
+def plot_temperature_histogram(temp_list, edges=None):
+    import matplotlib.pyplot as plt
+    table = temp_list if isinstance(temp_list, FrequencyTable) else frequency_table(temp_list, edges)
+    fig,ax = plt.subplots(1,1, figsize = (12,6), tight_layout=True)
+    #plots a standard frequency distribution
+    ax.stairs(table.counts, table.edges, baseline=0, alpha=0.3, color='darkgray', lw=3)
+
+    #creates a y2 axis for the cumulative distribution
+    ax2 = ax.twinx() 
+    ax2.stairs(table.cumulative, table.edges, baseline=0, alpha=1, color='red', lw=3)
+    ax2.stairs(table.exceedance, table.edges, baseline=0, alpha=1, color='blue', lw=3)
+
+
+    ax.set_title("temperature frequency histogram")
+    ax.set_xlabel('temperature bins, oC')
+    ax.set_ylabel('counts [grey]')
+    ax2.set_ylabel('cumulative counts [red / blue]')
+    return fig
+
+
+#plots a wind speed frequency histogram, with cumulative counts, from a FrequencyTable (see
+#Histograms), or from wind speeds binned once over edges (by default about 1m/s from the
+#minimum to the maximum)
+def plot_windspeed_histogram(winspeed_list, edges=None):
+    import matplotlib.pyplot as plt
+    table = winspeed_list if isinstance(winspeed_list, FrequencyTable) else frequency_table(winspeed_list, edges)
+    fig,ax = plt.subplots(1,1, figsize = (12,6), tight_layout=True)
+    #plots a standard frequency distribution
+    ax.stairs(table.counts, table.edges, baseline=0, alpha=0.3, color='darkgray', lw=3)
+    #creates a y2 axis for the cumulative distribution
+    ax2 = ax.twinx() 
+    ax2.stairs(table.cumulative, table.edges, baseline=0, alpha=1, color='red', lw=3)
+    #ax2.stairs(table.exceedance, table.edges, baseline=0, alpha=1, color='blue', lw=3)
+
+
+    ax.set_title("wind speed frequency histogram")
+    ax.set_xlabel('wind speed bins, m/s')
+    ax.set_ylabel('counts [grey]')
+    ax2.set_ylabel('cumulative counts [red]')
+    return fig
+
+
+#plots a decrementing illuminance histogram, from a FrequencyTable (see Histograms), or from
+#illuminances binned once over edges (by default about 1klux from 1klux to the maximum)
+def plot_illuminance_cdf(illuminance_list, edges=None):
+    import matplotlib.pyplot as plt
+    table = illuminance_list if isinstance(illuminance_list, FrequencyTable) else frequency_table(illuminance_list, edges, low=1)
+    fig,ax = plt.subplots(1,1, figsize = (12,6), tight_layout=True)
+    ax.stairs(table.exceedance, table.edges, baseline=0, fill=True, alpha=1, color='red')
+
+    ax.set_title("inverse cumulative illuminance frequency histogram")
+    ax.set_xlabel('illuminance bins, klux')
+    ax.set_ylabel('cumulative counts')
+    return fig
+
+
+#plots a degree-day histograms
+def plot_degree_days(MonthlyHDD_list, MonthlyCDD_list):
+    import matplotlib.pyplot as plt
+    fig,ax = plt.subplots(1,1, figsize = (12,6), tight_layout=True)
+    xlist = np.linspace(1, 12, 12)
+    y1 = ax.bar(xlist, MonthlyHDD_list, alpha=1, color='blue')
+    y2 = ax.bar(xlist, MonthlyCDD_list, alpha=1, color='red')
+
+    ax.set_title("Monthly degree-days")
+    ax.set_xlabel('Time, months')
+    ax.set_ylabel('Monthly degree days')
+    ax.legend((y1[0],y2[0]), ('Heating', 'Cooling'), loc='best')
+    return fig
+
+
+#This creates a 2D solar availability surface plot
+#NOTE: the chart is asymmetric because of the hour-centred convention.
+def plot_solar_availability(global_list, day_list, SRtime_list, SStime_list):
+    import matplotlib.pyplot as plt
+    ylist = np.asarray(day_list)
+    #this part converts the list (or a TimeIndex grid) into a (days x steps) array, e.g. (days x 24) for hourly data
+    Z = np.asarray(global_list).reshape(len(ylist),-1)
+    #each time step is plotted at its end hour-1, so hourly data span 0 to 23
+    xlist = np.arange(1, Z.shape[1]+1)*24/Z.shape[1] - 1
+    X, Y = np.meshgrid(xlist, ylist)
+    fig,ax=plt.subplots(1,1, figsize=(12,6))
+    cp = ax.contourf(Y, X, Z, 16, cmap='jet') #'plasma', 'jet' and 'viridis' are also good cmaps
+    fig.colorbar(cp, label = 'Global horizontal solar irradiance, W/m^2') # Adds a colorbar
+    ax.set_title('Solar Availability Surface Plot')
+    ax.set_xlabel('Time, days')
+    ax.set_ylabel('Time, hours')
+
+    ax.plot(day_list, SRtime_list,c='red')
+    ax.plot(day_list, SStime_list,c='red')
+    return fig
+
+
+#this plots violin plots of the monthly temperature, RH, diurnal range and wind speed
+def plot_violins(temp_matrix, rh_matrix, Diurnal_matrix, winspeed_matrix):
+    import matplotlib.pyplot as plt
+    fig,axes = plt.subplots(2,2, figsize = (12,6))
+
+    axes[0,0].violinplot(list(temp_matrix))
+    axes[0,0].set_title('Temperature Violin Plot')
+    axes[0,0].set_xlabel('Time, months')
+    axes[0,0].set_ylabel('Temperature, oC')
+
+    axes[0,1].violinplot(list(rh_matrix))
+    axes[0,1].set_title('Relative Humidity Violin Plot')
+    axes[0,1].set_xlabel('Time, months')
+    axes[0,1].set_ylabel('Relative Humidity, %')
+
+    axes[1,0].violinplot(list(Diurnal_matrix))
+    axes[1,0].set_title('Diurnal Temperature Violin Plot')
+    axes[1,0].set_xlabel('Time, months')
+    axes[1,0].set_ylabel('Diurnal temperature, oC')
+
+    axes[1,1].violinplot(list(winspeed_matrix))
+    axes[1,1].set_title('Wind Speed Violin Plot')
+    axes[1,1].set_xlabel('Time, months')
+    axes[1,1].set_ylabel('Wind Speed, m/s')
+
+    fig.tight_layout()
+    return fig
+
+
+#This creates a 2D daylight availability surface plot
+#NOTE: the chart is asymmetric because of the hour-centred convention.
+def plot_daylight_availability(illuminance_list, day_list, SRtime_list, SStime_list, globaleff):
+    import matplotlib.pyplot as plt
+    ylist = np.asarray(day_list)
+    #this part converts the list (or a TimeIndex grid) into a (days x steps) array, e.g. (days x 24) for hourly data
+    Z = np.asarray(illuminance_list).reshape(len(ylist),-1)
+    #each time step is plotted at its end hour-1, so hourly data span 0 to 23
+    xlist = np.arange(1, Z.shape[1]+1)*24/Z.shape[1] - 1
+    X, Y = np.meshgrid(xlist, ylist)
+    fig,ax=plt.subplots(1,1, figsize=(12,6))
+    cp = ax.contourf(Y, X, Z, 16, cmap='jet') #'plasma', 'jet' and 'viridis' are also good cmaps
+    if globaleff==False:
+        fig.colorbar(cp, label = 'diffuse horizontal illuminance, kLux') # Adds a colorbar
+    else:
+        fig.colorbar(cp, label = 'global horizontal illuminance, kLux') # Adds a colorbar
+    ax.set_title('Daylight Availability Surface Plot')
+    ax.set_xlabel('Time, days')
+    ax.set_ylabel('Time, hours')
+
+    ax.plot(day_list, SRtime_list,c='red')
+    ax.plot(day_list, SStime_list,c='red')
+    return fig
@@ -0,0 +1,181 @@
+##########################################################################################
+# PyClim was developed by Prof. Darren Robinson (University of Sheffield, 2019).         #
+# PyClim produces a range of graphs and statistics to support the analysis of climate    #
+# data, to support architectural / engineering / technology students to develop their    #
+# early-stage bioclimatic design concepts.                                               #
+##########################################################################################
+
+
+#THIS MODULE RENDERS THE WeatherAnalysis FIGURES AS A REPORT: THE ANALYSIS IS CALCULATED
+#ONCE, THEN THE SELECTED FIGURES ARE DRAWN OFF-SCREEN (Agg) ACROSS A POOL OF WORKER
+#PROCESSES AND SAVED AS PNG, SVG AND / OR PDF FILES, WITH A manifest.json LISTING THE
+#SUMMARY STATISTICS, THE FILES OF EACH FIGURE AND THE TIME IT TOOK.
+#
+#   python WeatherReport.py ./Finningley.csv --out report --figures solar,degreedays --formats png,svg
+
+#imports the basic libraries
+import argparse
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from BatchStations import init_worker
+
+#the figures of the report, in the order of WeatherAnalysis, and the formats they can be saved in
+figure_list = ['ground', 'temperature', 'windspeed', 'illuminance', 'degreedays', 'violins', 'solar', 'daylight']
+format_list = ['png', 'svg', 'pdf']
+
+
+#the outputs of WeatherAnalysis.analyse_weather that each figure needs (see WeatherPipeline)
+figure_outputs = {}
+figure_outputs['ground'] = ['tground_matrix', 'depth_list']
+figure_outputs['temperature'] = ['temp_histogram']
+figure_outputs['windspeed'] = ['winspeed_histogram']
+figure_outputs['illuminance'] = ['illuminance_histogram']
+figure_outputs['degreedays'] = ['summary']
+figure_outputs['violins'] = ['temp_matrix', 'rh_matrix', 'Diurnal_matrix', 'winspeed_matrix']
+figure_outputs['solar'] = ['index', 'global_list', 'day_list', 'SRtime_list', 'SStime_list']
+figure_outputs['daylight'] = ['index', 'illuminance_list', 'day_list', 'SRtime_list', 'SStime_list']
+
+
+#this function returns the outputs of WeatherAnalysis.analyse_weather needed for the
+#figures (and the summary statistics, for the manifest)
+def report_outputs(figures=figure_list):
+    report_outputs = ['summary']
+    for figure in figures:
+        report_outputs = report_outputs + [name for name in figure_outputs[figure] if name not in report_outputs]
+    return report_outputs
+
+
+#this function returns, for each of the figures, the name of its WeatherFigures function and
+#the arguments to pass it, taken from the results of WeatherAnalysis.analyse_weather (the
+#histograms are drawn from its binned tables, without their series)
+def figure_arguments(results, globaleff, figures=figure_list):
+    figure_arguments = {}
+    for figure in figures:
+        if figure == 'ground':
+            figure_arguments[figure] = ('plot_ground_profile', (results['tground_matrix'], results['depth_list']))
+        elif figure == 'temperature':
+            figure_arguments[figure] = ('plot_temperature_histogram', (results['temp_histogram'].binned(),))
+        elif figure == 'windspeed':
+            figure_arguments[figure] = ('plot_windspeed_histogram', (results['winspeed_histogram'].binned(),))
+        elif figure == 'illuminance':
+            figure_arguments[figure] = ('plot_illuminance_cdf', (results['illuminance_histogram'].binned(),))
+        elif figure == 'degreedays':
+            figure_arguments[figure] = ('plot_degree_days', (results['summary']['MonthlyHDD'], results['summary']['MonthlyCDD']))
+        elif figure == 'violins':
+            figure_arguments[figure] = ('plot_violins', (results['temp_matrix'], results['rh_matrix'], results['Diurnal_matrix'], results['winspeed_matrix']))
+        elif figure == 'solar':
+            figure_arguments[figure] = ('plot_solar_availability', (results['index'].grid(results['global_list']), results['day_list'], results['SRtime_list'], results['SStime_list']))
+        elif figure == 'daylight':
+            figure_arguments[figure] = ('plot_daylight_availability', (results['index'].grid(results['illuminance_list']), results['day_list'], results['SRtime_list'], results['SStime_list'], globaleff))
+    return figure_arguments
+
+
+#XXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXX########
+# THE WORKER PROCESSES
+#XXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXX########
+
+#this function draws one figure and saves it in each format to outdir, returning the names
+#of the files and the time taken
+def render_figure(name, function, arguments, outdir, formats=('png',), prefix=''):
+    import matplotlib.pyplot as plt
+    import WeatherFigures
+
+    start = time.time()
+    result = {'name': name, 'files': []}
+    try:
+        fig = getattr(WeatherFigures, function)(*arguments)
+        for fmt in formats:
+            figfile = os.path.join(outdir, prefix + name + '.' + fmt)
+            fig.savefig(figfile)
+            result['files'].append(os.path.basename(figfile))
+        plt.close(fig)
+        result['error'] = ''
+    except Exception as error:
+        result['error'] = type(error).__name__ + ': ' + str(error)
+    result['seconds'] = time.time()-start
+    return result
+
+
+#XXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXX########
+# FAN THE FIGURES OUT ACROSS THE POOL
+#XXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXX########
+
+#this function renders the figures (all of figure_list by default) of the results of
+#WeatherAnalysis.analyse_weather to outdir, and writes outdir/manifest.json (naming the
+#climate file, if it is given). Returns the manifest.
+def render_report(results, outdir, figures=None, formats=('png',), workers=None, globaleff=False, prefix='', filename=None, verbose=True):
+    if figures is None:
+        figures = figure_list
+    os.makedirs(outdir, exist_ok=True)
+    start = time.time()
+    arguments = figure_arguments(results, globaleff, figures)
+    figure_results = {}
+    with ProcessPoolExecutor(max_workers=workers, initializer=init_worker, initargs=(None,)) as pool:
+        futures = [pool.submit(render_figure, name, arguments[name][0], arguments[name][1], outdir, list(formats), prefix) for name in figures]
+        for done, future in enumerate(as_completed(futures), 1):
+            result = future.result()
+            figure_results[result['name']] = result
+            if verbose:
+                status = result['error'] or '{0:1.2f}s' .format(result['seconds'])
+                print('[{0}/{1}] {2}: {3}' .format(done, len(figures), result['name'], status))
+
+    manifest = {}
+    if filename is not None:
+        manifest['filename'] = os.path.abspath(filename)
+    manifest['summary'] = results['summary']
+    manifest['formats'] = list(formats)
+    manifest['figures'] = [figure_results[name] for name in figures]
+    manifest['seconds'] = time.time()-start
+    with open(os.path.join(outdir, prefix + 'manifest.json'), 'w') as f:
+        json.dump(manifest, f, indent=1)
+    return manifest
+
+
+#this function analyses a climate file (see WeatherAnalysis.analyse_weather) for a site at
+#latitude lat (degrees) and renders its report to outdir. Only the stages of the analysis
+#that the figures need are calculated, and the sky state is only read when they need it.
+#Returns the manifest.
+def weather_report(filename, outdir, lat, longitude, timezone, timeshift=None, figures=None, formats=('png',), workers=None, globaleff=False, timestep=None, verbose=True):
+    from ClimAnalFunctions import pi
+    from ClimateData import read_climate
+    from SkyState import read_sky_state
+    from WeatherAnalysis import WeatherPipeline
+
+    if figures is None:
+        figures = figure_list
+    data = read_climate(filename, timestep=timestep)
+    pipeline = WeatherPipeline(data, lat*pi/180, longitude, timezone, timeshift, globaleff)
+    outputs = report_outputs(figures)
+    if 'sky_state' in pipeline.requires(outputs):
+        pipeline.set_sky_state(read_sky_state(filename, lat*pi/180, longitude, timezone, timeshift, timestep=timestep))
+    results = pipeline.compute(outputs)
+    weather_report = render_report(results, outdir, figures, formats, workers, globaleff, filename=filename, verbose=verbose)
+    return weather_report
+
+
+if __name__ == '__main__':
+    import ClimAnalFunctions
+    parser = argparse.ArgumentParser(description='Render the WeatherAnalysis figures of a climate file, off-screen and in parallel.')
+    parser.add_argument('filename', nargs='?', default=ClimAnalFunctions.filename, help='climate file')
+    parser.add_argument('--out', default='weather_report', help='folder for the figures and manifest.json')
+    parser.add_argument('--lat', type=float, default=ClimAnalFunctions.lat, help='latitude, degrees')
+    parser.add_argument('--lon', type=float, default=ClimAnalFunctions.longitude, help='longitude, degrees')
+    parser.add_argument('--timezone', type=float, default=ClimAnalFunctions.timezone, help='time zone, hours')
+    parser.add_argument('--timeshift', type=float, default=ClimAnalFunctions.timeshift, help='time shift, hours (default: the middle of each time step)')
+    parser.add_argument('--figures', default=','.join(figure_list), help='comma separated figures: ' + ', '.join(figure_list))
+    parser.add_argument('--formats', default='png', help='comma separated formats: ' + ', '.join(format_list))
+    parser.add_argument('--workers', type=int, default=None, help='number of worker processes')
+    parser.add_argument('--globaleff', action='store_true', help='global (rather than diffuse) illuminance')
+    args = parser.parse_args()
+    figures = [figure for figure in args.figures.split(',') if figure]
+    for figure in figures:
+        if figure not in figure_list:
+            parser.error('unknown figure: ' + figure)
+    formats = [fmt for fmt in args.formats.split(',') if fmt]
+    for fmt in formats:
+        if fmt not in format_list:
+            parser.error('unknown format: ' + fmt)
+    weather_report(args.filename, args.out, args.lat, args.lon, args.timezone, args.timeshift, figures, formats, args.workers, args.globaleff, ClimAnalFunctions.timestep)
@@ -0,0 +1,82 @@
+##########################################################################################
+# PyClim was developed by Prof. Darren Robinson (University of Sheffield, 2019).         #
+# PyClim produces a range of graphs and statistics to support the analysis of climate    #
+# data, to support architectural / engineering / technology students to develop their    #
+# early-stage bioclimatic design concepts.                                               #
+##########################################################################################
+
+
+#THIS MODULE CALCULATES THE STATISTICS REPORTED BY WeatherAnalysis FROM THE COLUMNS OF A
+#CLIMATE FILE (SEE ClimateData), WITHOUT PLOTTING ANYTHING, SO THAT THEY CAN BE USED IN
+#BATCH RUNS AND BY OTHER MODULES. DAYS AND MONTHS ARE TAKEN FROM THE FILE'S CALENDAR (SEE
+#TimeIndex), SO LEAP YEARS, MULTI-YEAR RECORDS, MISSING HOURS AND SUB-HOURLY TIME STEPS ARE
+#HANDLED; THE 'ANNUAL' STATISTICS OF A MULTI-YEAR RECORD ARE MEANS PER YEAR.
+
+#imports the basic libraries
+import numpy as np
+
+from ClimAnalArrays import declin_angle_array, time_diff_array, sunrise_time_array
+from TimeIndex import time_index
+
+Rho=1.2 #kg/m3
+HDDbase = 15.5
+CDDbase = 18
+
+
+#XXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXX########
+# FUNCTIONS TO CALCULATE DAILY AND MONTHLY QUANTITIES
+#XXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXX########
+
+#this function calculates the mean temperature of each day of a TimeIndex
+def daily_mean_temps(temp_list, index):
+    daily_mean_temps = index.mean(temp_list, 'day')
+    return daily_mean_temps
+
+
+#this function sums daily heating and cooling degree-days into months (1 to 12)
+def monthly_degree_days(dailymeantemp_list, daymonth_list, HDDbase=HDDbase, CDDbase=CDDbase):
+    monthindex = np.asarray(daymonth_list, dtype=int)-1
+    MonthlyHDD_list = np.bincount(monthindex, weights=np.maximum(HDDbase-dailymeantemp_list, 0), minlength=12)
+    MonthlyCDD_list = np.bincount(monthindex, weights=np.maximum(dailymeantemp_list-CDDbase, 0), minlength=12)
+    return MonthlyHDD_list, MonthlyCDD_list
+
+
+#this function calculates the sunrise and sunset (clock) times of each day, bounded to the
+#first and last hours of the day, for the solar availability plots
+def sunrise_sunset(day_list, lat, longitude, timezone, timeshift):
+    dec_list = declin_angle_array(day_list)
+    dT = time_diff_array(day_list, False, longitude, timezone, timeshift)
+    SStime, SRtime = sunrise_time_array(dec_list, lat, day_list)
+    SRtime_list = np.maximum(1, SRtime+dT)
+    SStime_list = np.minimum(24, SStime+dT)
+    return SRtime_list, SStime_list
+
+
+#XXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXX########
+# THE SUMMARY STATISTICS
+#XXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXX########
+
+#this function returns the summary statistics printed by WeatherAnalysis, as a dictionary:
+#annual global horizontal irradiation (kWh/m2), diffuse fraction, wind kinetic energy flux
+#(kWh/m2), annual mean temperature and total and monthly heating / cooling degree-days. The
+#TimeIndex of data is built if it is not given.
+def summary_statistics(data, HDDbase=HDDbase, CDDbase=CDDbase, index=None):
+    if index is None:
+        index = time_index(data)
+    numyears = len(index.year_list)
+    temp_list = data['dbt']
+    dailymeantemp_list = daily_mean_temps(temp_list, index)
+    MonthlyHDD_list, MonthlyCDD_list = monthly_degree_days(dailymeantemp_list, index.first(index.month, 'day'), HDDbase, CDDbase)
+    MonthlyHDD_list = MonthlyHDD_list/numyears
+    MonthlyCDD_list = MonthlyCDD_list/numyears
+    summary = {}
+    #irradiances and wind power (W/m2) are integrated over each time step
+    summary['AnnualIgh'] = float(data['global'].sum()*index.timestep/1000/numyears)
+    summary['DiffuseFraction'] = float(data['diffuse'].sum()/data['global'].sum())
+    summary['WindKineticEnergy'] = float((0.5*Rho*data['winspeed']**3/1000).sum()*index.timestep/numyears)
+    summary['AnnualMeanTemp'] = float(temp_list.mean())
+    summary['TotalHDD'] = float(MonthlyHDD_list.sum())
+    summary['TotalCDD'] = float(MonthlyCDD_list.sum())
+    summary['MonthlyHDD'] = MonthlyHDD_list.tolist()
+    summary['MonthlyCDD'] = MonthlyCDD_list.tolist()
+    return summary
@@ -5,15 +5,21 @@
 # early-stage bioclimatic design concepts.                                               #
 ##########################################################################################
 
-#THIS MODULE SIMPLY CREATES A POLAR WIND ROSE PLOT.
+#THIS MODULE SIMPLY CREATES A POLAR WIND ROSE PLOT. windrose_tables COUNTS THE HOURS AND
+#plot_windrose DRAWS THEM (IMPORTING matplotlib ONLY THEN); RUN THE MODULE AS A SCRIPT TO
+#PLOT THE CLIMATE FILE NAMED IN ClimAnalFunctions. THE HOURS ARE COUNTED WITH np.bincount,
+#INTO ANY SPEED AND TEMPERATURE BIN EDGES (E.G. THE BEAUFORT SCALE), FOR RECORDS OF ANY
+#LENGTH; THE TABLES OF SEVERAL YEARS OR STATIONS CAN SIMPLY BE ADDED.
 
 import math
-import matplotlib.pyplot as plt
 import numpy as np
 
 from ClimAnalFunctions import * 
+from ClimateData import read_climate
+from TimeIndex import time_index, calendar_lengths, season_names
 
-#in the future: provide the option to plot using the Beaufort scale
+#the titles of the calendar wind roses
+month_names = ['Jan', 'Feb', 'Mar', 'Apr', 'May', 'Jun', 'Jul', 'Aug', 'Sep', 'Oct', 'Nov', 'Dec']
 
 ########################################################
 #The following control the format of the windrose
@@ -30,75 +36,222 @@ lower_percentile_limit  = 20
 PlotTemp = True
 #Wind speeds are potted at 1m/s intervals: TempInterval sets the temperature intervals
 TempInterval = 2.5
+#This plots wind speeds in Beaufort classes rather than at 1m/s intervals
+Beaufort = False
+#This also plots a wind rose for each month and for each season
+CalendarRoses = True
 
-#this reads climate data file
-winspeed_list= []
-windir_list = []
-temp_list = []
-file_list = []
-
-for line in file:
-    line = line.rstrip('\n')
-    line = line.split(',')
-    file_list.append(line)
-file.close()
-
-
-#this popuates lists with the corresponding data
-for i in range (3, len(file_list)):
-    temp_list.append(float(file_list[i][3]))
-    winspeed_list.append(float(file_list[i][7]))
-    windir_list.append(float(file_list[i][8]))
-
-maxspeed = int(max(winspeed_list))
-maxtemp = int(max(temp_list))
-mintemp = int(min(temp_list))
-
-azimuth_list  = np.linspace(0, 360, (numsectors+1))
-zenith_list = np.linspace(0,maxspeed+1,(maxspeed+1))
-tempzen_list = np.linspace(mintemp,maxtemp+1,(maxtemp-mintemp+1))
-value_list = [[0 for i in range(numsectors+1)] for j in range(maxspeed+1)]
-tempval_list = [[0 for i in range(numsectors+1)] for j in range(maxtemp-mintemp+1)]
-
-for j in range (0,8760):        
-    sectornum = int(windir_list[j]/(360/numsectors))
-    speednum=int(winspeed_list[j])
-    tempnum=int(temp_list[j])
-    zval = value_list[speednum][sectornum]
-    zpval = tempval_list[tempnum][sectornum]
-    value_list[speednum][sectornum] = zval+1
-    tempval_list[tempnum][sectornum] = zpval+1
-
-value_list[0][0]=0
-
-fig, ax = plt.subplots(subplot_kw=dict(projection='polar'))
-
-azimuth_list = np.radians(azimuth_list)
-
-if PlotTemp == False:
-    #NB: The jet cmap gives very good discrimination:
-    cp = ax.pcolormesh(azimuth_list, zenith_list, value_list, cmap='jet') #'plasma', 'magma', 'jet' and 'viridis' are good cmaps
-    
-    ax.set_title('Annual Wind Rose: with wind speed in radial sectors')
-    ax.set_theta_zero_location("N")
-    ax.set_theta_direction(-1)
-    ax.set_ylim([int(np.percentile(winspeed_list,lower_percentile_limit)), int(np.percentile(winspeed_list,upper_percentile_limit))])
-    
-    if invert_radialaxis==True:
-        ax.set_ylim(plt.ylim()[::-1])
-    fig.colorbar(cp, label = 'Annual hours: wind approaching from ith direction at jth speed')
-else:
-    cp = ax.pcolormesh(azimuth_list, tempzen_list, tempval_list, cmap='jet')
-    
-    ax.set_title('Annual Wind Rose: with temperature in radial sectors')
-    ax.set_theta_zero_location("N")
-    ax.set_theta_direction(-1)
-    ax.set_ylim([int(np.percentile(temp_list,lower_percentile_limit)), int(np.percentile(temp_list,upper_percentile_limit))])
-    
-    if invert_radialaxis==True:
-        ax.set_ylim(plt.ylim()[::-1])
-#    ax.set_yticklabels([])
-    fig.colorbar(cp, label = 'Annual hours: wind approaching from ith direction at jth temperature')
-
-plt.tight_layout()
-plt.show()
+#the lower edges (m/s) of Beaufort forces 0 to 12
+beaufort_edges = np.array([0, 0.3, 1.6, 3.4, 5.5, 8.0, 10.8, 13.9, 17.2, 20.8, 24.5, 28.5, 32.7, np.inf])
+
+
+#this function returns the sector (0 to numsectors-1) that each wind direction (degrees)
+#falls in; sector 0 starts at north
+def sector_index(windir_list, numsectors=numsectors):
+    sector_index = np.floor(np.mod(np.asarray(windir_list, dtype=float), 360)/(360/numsectors)).astype(int)
+    sector_index = np.minimum(sector_index, numsectors-1)
+    return sector_index
+
+
+#this function returns the bin that each value falls in, for bins with the given (rising)
+#edges, the last bin including its upper edge; values outside the edges are -1
+def bin_index(value_list, edges):
+    value_list = np.asarray(value_list, dtype=float)
+    edges = np.asarray(edges, dtype=float)
+    bin_index = np.searchsorted(edges, value_list, side='right')-1
+    bin_index[value_list == edges[-1]] = len(edges)-2
+    bin_index[(value_list < edges[0]) | (value_list > edges[-1]) | np.isnan(value_list)] = -1
+    return bin_index
+
+
+#this function counts the rows in each (group x bin x sector), ignoring rows outside the
+#bins; without groups every row is in group 0
+def count_table(binnum, sectornum, numbins, numsectors=numsectors, group=None, numgroups=1):
+    if group is None:
+        group = np.zeros(len(binnum), dtype=int)
+    valid = binnum >= 0
+    code = (np.asarray(group)[valid]*numbins + binnum[valid])*numsectors + sectornum[valid]
+    count_table = np.bincount(code, minlength=numgroups*numbins*numsectors)
+    count_table = count_table.reshape(numgroups, numbins, numsectors)
+    return count_table
+
+
+#this function returns the default bin edges: 1m/s speed intervals (or the Beaufort classes),
+#and temperature intervals of TempInterval, spanning the data
+def windrose_edges(temp_list, winspeed_list, Beaufort=Beaufort, TempInterval=TempInterval):
+    if Beaufort == True:
+        speed_edges = beaufort_edges
+    else:
+        speed_edges = np.arange(0, math.floor(np.max(winspeed_list))+2)
+    mintemp = math.floor(np.min(temp_list)/TempInterval)*TempInterval
+    temp_edges = np.arange(mintemp, np.max(temp_list)+TempInterval, TempInterval)
+    if temp_edges[-1] <= np.max(temp_list):
+        temp_edges = np.append(temp_edges, temp_edges[-1]+TempInterval)
+    return speed_edges, temp_edges
+
+
+#this function counts the hours of wind approaching from each of numsectors azimuthal
+#sectors in each speed bin and in each temperature bin, for each group (0 to numgroups-1,
+#e.g. the month) of every hour, in one pass. It returns the sector edges (degrees), the
+#speed bin edges and hour counts (group x speed x sector), and the temperature bin edges and
+#hour counts (group x temperature x sector). Calm hours (no wind speed) have no direction,
+#so they are not counted.
+def windrose_cubes(temp_list, winspeed_list, windir_list, group=None, numgroups=1, numsectors=numsectors, speed_edges=None, temp_edges=None):
+    if speed_edges is None or temp_edges is None:
+        default_speed, default_temp = windrose_edges(temp_list, winspeed_list)
+        speed_edges = default_speed if speed_edges is None else speed_edges
+        temp_edges = default_temp if temp_edges is None else temp_edges
+    winspeed_list = np.asarray(winspeed_list, dtype=float)
+    azimuth_list = np.linspace(0, 360, (numsectors+1))
+    zenith_list = np.asarray(speed_edges, dtype=float)
+    tempzen_list = np.asarray(temp_edges, dtype=float)
+
+    sectornum = sector_index(windir_list, numsectors)
+    speednum = bin_index(winspeed_list, zenith_list)
+    tempnum = bin_index(temp_list, tempzen_list)
+    speednum[winspeed_list <= 0] = -1
+    tempnum[winspeed_list <= 0] = -1
+    value_cube = count_table(speednum, sectornum, len(zenith_list)-1, numsectors, group, numgroups)
+    tempval_cube = count_table(tempnum, sectornum, len(tempzen_list)-1, numsectors, group, numgroups)
+    return azimuth_list, zenith_list, value_cube, tempzen_list, tempval_cube
+
+
+#this function counts the hours of wind approaching from each of numsectors azimuthal
+#sectors in each speed bin and in each temperature bin, in one pass. It returns the sector
+#edges (degrees), the speed bin edges and hour counts (speed x sector), and the temperature
+#bin edges and hour counts (temperature x sector).
+def windrose_tables(temp_list, winspeed_list, windir_list, numsectors=numsectors, speed_edges=None, temp_edges=None):
+    azimuth_list, zenith_list, value_cube, tempzen_list, tempval_cube = windrose_cubes(temp_list, winspeed_list, windir_list, None, 1, numsectors, speed_edges, temp_edges)
+    return azimuth_list, zenith_list, value_cube[0], tempzen_list, tempval_cube[0]
+
+
+#this function counts the wind rose cubes of climate data (see ClimateData) by calendar
+#month (12 groups) or season (4 groups, see TimeIndex.season_names), in one pass
+def windrose_calendar(data, key='month', numsectors=numsectors, speed_edges=None, temp_edges=None, index=None):
+    if index is None:
+        index = time_index(data)
+    if key == 'month':
+        group = index.month-1
+    else:
+        group = index.season
+    windrose_calendar = windrose_cubes(data['dbt'], data['winspeed'], data['windir'], group, calendar_lengths[key], numsectors, speed_edges, temp_edges)
+    return windrose_calendar
+
+
+#this function draws the wind rose, of wind speed or (with PlotTemp) of temperature, from
+#the tables of windrose_tables. With Beaufort, the radial axis is the Beaufort force.
+#Returns the figure.
+def plot_windrose(temp_list, winspeed_list, windir_list, PlotTemp=PlotTemp, numsectors=numsectors, invert_radialaxis=invert_radialaxis, Beaufort=Beaufort):
+    import matplotlib.pyplot as plt
+    speed_edges, temp_edges = windrose_edges(temp_list, winspeed_list, Beaufort)
+    azimuth_list, zenith_list, value_list, tempzen_list, tempval_list = windrose_tables(temp_list, winspeed_list, windir_list, numsectors, speed_edges, temp_edges)
+
+    fig, ax = plt.subplots(subplot_kw=dict(projection='polar'))
+
+    azimuth_list = np.radians(azimuth_list)
+
+    if PlotTemp == False:
+        if Beaufort == True:
+            #the Beaufort forces are plotted at equal intervals
+            zenith_list = np.arange(len(zenith_list))
+            speed_limits = bin_index(np.percentile(winspeed_list, [lower_percentile_limit, upper_percentile_limit]), beaufort_edges) + [0, 1]
+        else:
+            speed_limits = [int(np.percentile(winspeed_list,lower_percentile_limit)), int(np.percentile(winspeed_list,upper_percentile_limit))]
+        #NB: The jet cmap gives very good discrimination:
+        cp = ax.pcolormesh(azimuth_list, zenith_list, value_list, cmap='jet') #'plasma', 'magma', 'jet' and 'viridis' are good cmaps
+        
+        ax.set_title('Annual Wind Rose: with wind speed in radial sectors')
+        ax.set_theta_zero_location("N")
+        ax.set_theta_direction(-1)
+        ax.set_ylim(speed_limits)
+        
+        if invert_radialaxis==True:
+            ax.set_ylim(ax.get_ylim()[::-1])
+        if Beaufort == True:
+            fig.colorbar(cp, label = 'Annual hours: wind approaching from ith direction at jth Beaufort force')
+        else:
+            fig.colorbar(cp, label = 'Annual hours: wind approaching from ith direction at jth speed')
+    else:
+        cp = ax.pcolormesh(azimuth_list, tempzen_list, tempval_list, cmap='jet')
+        
+        ax.set_title('Annual Wind Rose: with temperature in radial sectors')
+        ax.set_theta_zero_location("N")
+        ax.set_theta_direction(-1)
+        ax.set_ylim([int(np.percentile(temp_list,lower_percentile_limit)), int(np.percentile(temp_list,upper_percentile_limit))])
+        
+        if invert_radialaxis==True:
+            ax.set_ylim(ax.get_ylim()[::-1])
+        #ax.set_yticklabels([])
+        fig.colorbar(cp, label = 'Annual hours: wind approaching from ith direction at jth temperature')
+
+    fig.tight_layout()
+    return fig
+
+
+#this function draws a grid of small wind roses, one per group of the cubes of windrose_cubes
+#(e.g. windrose_calendar), on a common colour scale, without returning to the hourly data.
+#titles names each group. Returns the figure.
+def plot_windrose_grid(azimuth_list, edges, cube, titles, PlotTemp=PlotTemp, Beaufort=Beaufort, invert_radialaxis=invert_radialaxis):
+    import matplotlib.pyplot as plt
+    numgroups = len(cube)
+    numcols = 4 if numgroups > 4 else 2
+    numrows = int(math.ceil(numgroups/numcols))
+    fig, axes = plt.subplots(numrows, numcols, figsize=(3*numcols+1, 3*numrows), subplot_kw=dict(projection='polar'), squeeze=False)
+
+    azimuth_list = np.radians(azimuth_list)
+    edges = np.asarray(edges, dtype=float)
+    if PlotTemp == False and Beaufort == True:
+        #the Beaufort forces are plotted at equal intervals
+        edges = np.arange(len(edges))
+    vmax = max(int(cube.max()), 1)
+    for i, ax in enumerate(axes.ravel()):
+        if i >= numgroups:
+            ax.set_visible(False)
+            continue
+        cp = ax.pcolormesh(azimuth_list, edges, cube[i], cmap='jet', vmin=0, vmax=vmax)
+        ax.set_title(titles[i])
+        ax.set_theta_zero_location("N")
+        ax.set_theta_direction(-1)
+        ax.set_xticklabels([])
+        #the radial axis spans the bins that hold any hours, across all of the groups
+        used = np.flatnonzero(cube.sum(axis=(0,2)))
+        if len(used) > 0:
+            ax.set_ylim([edges[used[0]], edges[used[-1]+1]])
+        if invert_radialaxis==True:
+            ax.set_ylim(ax.get_ylim()[::-1])
+
+    if PlotTemp == False:
+        fig.colorbar(cp, ax=axes.ravel().tolist(), label = 'Hours: wind approaching from ith direction at jth speed')
+    else:
+        fig.colorbar(cp, ax=axes.ravel().tolist(), label = 'Hours: wind approaching from ith direction at jth temperature')
+    return fig
+
+
+#this function draws the monthly (key='month') or seasonal (key='season') wind roses of
+#climate data, counting the cubes in one pass. Returns the figure.
+def plot_windrose_calendar(data, key='month', PlotTemp=PlotTemp, numsectors=numsectors, Beaufort=Beaufort, invert_radialaxis=invert_radialaxis):
+    speed_edges, temp_edges = windrose_edges(data['dbt'], data['winspeed'], Beaufort)
+    azimuth_list, zenith_list, value_cube, tempzen_list, tempval_cube = windrose_calendar(data, key, numsectors, speed_edges, temp_edges)
+    titles = month_names if key == 'month' else season_names
+    if PlotTemp == False:
+        fig = plot_windrose_grid(azimuth_list, zenith_list, value_cube, titles, PlotTemp, Beaufort, invert_radialaxis)
+    else:
+        fig = plot_windrose_grid(azimuth_list, tempzen_list, tempval_cube, titles, PlotTemp, Beaufort, invert_radialaxis)
+    return fig
+
+
+def main():
+    import matplotlib.pyplot as plt
+    #this reads the climate data into typed columns
+    data = read_climate(filename)
+    plot_windrose(data['dbt'], data['winspeed'], data['windir'], PlotTemp, numsectors, invert_radialaxis, Beaufort)
+    plt.show()
+    if CalendarRoses == True:
+        plot_windrose_calendar(data, 'month', PlotTemp, numsectors, Beaufort, invert_radialaxis)
+        plt.show()
+        plot_windrose_calendar(data, 'season', PlotTemp, numsectors, Beaufort, invert_radialaxis)
+        plt.show()
+
+
+if __name__ == '__main__':
+    main()
@@ -14,22 +14,27 @@
 #This module creates a psychrometric chart for the plotting of climate data
 #It also creates a second chart with data translated along the wet bulb line 
 #to a defined fraction of the wbtd, to mimic adiabatic (evaporative) cooling.
+#The functions below only create figures when called (importing matplotlib then), so the
+#module can be imported without reading the climate file; run it as a script for the charts.
 
 #imports the basic libraries
 import math
-import matplotlib.pyplot as plt
 import numpy as np
 
 from ClimAnalFunctions import * 
+from ClimAnalArrays import g_array
+from ClimateData import read_climate
+from EvapCoolSweep import evap_cool_sweep, plot_sweep
+from PsychroChart import PsychroChart
 
-file = open("./Phoenix.csv", "r")
+filename = "./Phoenix.csv"
 
 
-file_list = []
-temp_list = []
-rh_list = []
-g_list = []
 PlotMonthly=True
+#This draws the chart lines as a cached image rather than as vector lines
+RasterBackground = False
+#This bins the hours into a density mesh of hour counts, rather than plotting a point per hour
+PlotDensity = False
 
 PlotEvapCool = True
 LLdbt = 25 #lower limit of temperature: above which data is shifted
@@ -37,213 +42,117 @@ MartinezLimit = True
 EvapCoolEff = 0.7 #Proportion of wbtd thar data s shifted to.
 Screen = False #so that wbt not t_screen is calculated
 
+#This compares many evaporative cooling scenarios (nan in LLdbt_list is the Martinez limit)
+PlotEvapSweep = False
+EvapCoolEff_list = [0.5, 0.6, 0.7, 0.8, 0.9]
+LLdbt_list = [20, 22, 24, 26, 28, np.nan]
 
-#XXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXX
-#READ IN THE CLIMATE DATA TO PLOT
-#XXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXX
-
-#this reads climate data file
-
-numhours=0
-for line in file:
-    line = line.rstrip('\n')
-    line = line.split(',')
-    file_list.append(line)
-    numhours=numhours+1
-file.close()
-
-
-#this popuates lists with the corresponding data
-for i in range (3, len(file_list)):
-    temp_list.append(float(file_list[i][3]))
-    rh_list.append(float(file_list[i][4]))
-
-#XXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXX
-#NOW: CREATE THE PSYCHROMETRIC CHART
-#XXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXX
 
-plt.figure(figsize=(12, 8), tight_layout=True)
-
-temp_x_list = []
-g_y_list = []
-
-for rh in range (10,110,10):
-    for temp in range (-10,61):
-        temp_x_list.append(temp)
-        g_y_list.append(g(temp,rh))
-    plt.plot(temp_x_list,g_y_list, lw=1, color='darkgray')
-    temp_x_list.clear()
-    g_y_list.clear()
-
-mc=0
-while mc<=0.03:
-    mc=mc+0.005
-    temp_x_list.append(tsat(mc))
-    g_y_list.append(mc)
-    temp_x_list.append(60)
-    g_y_list.append(mc)
-    plt.plot(temp_x_list,g_y_list, lw=1, color='darkgray')
-    temp_x_list.clear()
-    g_y_list.clear()
-
-for temp in range(-10,60,5):
-    gsat=g_dry_wet(temp,temp)
-    if gsat>=0.3:
-        gsat=0.3
-    temp_x_list.append(temp)
-    g_y_list.append(0)
-    temp_x_list.append(temp)
-    g_y_list.append(gsat)
-    plt.plot(temp_x_list,g_y_list, lw=1, color='darkgray')
-    temp_x_list.clear()
-    g_y_list.clear()
-
-for wbt in range (-10,40,5):
-    for dbt in range (-10, 61, 1):
-        mc = g_dry_wet(dbt,wbt)
-        if dbt>=wbt:
-            temp_x_list.append(dbt)
-            g_y_list.append(mc)
-    plt.plot(temp_x_list,g_y_list, lw=1, color='darkgray')
-    temp_x_list.clear()
-    g_y_list.clear()
+Month_list = ['Jan', 'Feb', 'Mar', 'Apr', 'May', 'Jun', 'Jul', 'Aug', 'Sep', 'Oct', 'Nov', 'Dec']
+Colour_list = ['firebrick', 'salmon', 'darkorange', 'orange', 'gold', 'yellow', 'yellowgreen', 'green', 'olive', 'cyan', 'skyblue', 'blue']
 
 
 #XXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXX
-#NOW: PLOT THE DATA
+#PLOT THE DATA
 #XXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXX
 
-if PlotMonthly==False:
-    for plotpoints in range (0,len(temp_list)):
-        g_list.append(g(temp_list[plotpoints],rh_list[plotpoints]))
-    plt.scatter(temp_list,g_list, c='red', alpha=0.5, s=5)
-else:
-    cumhour=0
-    Colour_list = ['firebrick', 'salmon', 'darkorange', 'orange', 'gold', 'yellow', 'yellowgreen', 'green', 'olive', 'cyan', 'skyblue', 'blue']
-    Month_list = ['Jan', 'Feb', 'Mar', 'Apr', 'May', 'Jun', 'Jul', 'Aug', 'Sep', 'Oct', 'Nov', 'Dec']
-    daynum_list = [31,28,31,30,31,30,31,31,30,31,30,31]
-    Monthly_g = []
-    Monthly_t = []
-    for month in range (1,13):
-        for days in range (0, daynum_list[month-1]):
-            for hours in range(1,25):
-                Monthly_g.append(g(temp_list[cumhour],rh_list[cumhour]))
-                Monthly_t.append(temp_list[cumhour])
-                cumhour=cumhour+1
-        plt.scatter(Monthly_t, Monthly_g, c=Colour_list[11-month], label = (Month_list[month-1]), s=6, alpha=0.9)
-        Monthly_t.clear()
-        Monthly_g.clear()
-
-
-plt.ylim(0,0.03)
-plt.xlim(-10,60)
-plt.xlabel('Dry bulb temperature, $^o$C')
-plt.ylabel('Moisture content, kg/kg (dry air)')
-
-plt.axvline(x=60, color='lightgrey')
-#plt.axis('off')
-plt.title('Hourly climate data plotted on a psychrometric chart', loc='center')
-plt.legend(loc = 'upper left', frameon=False)
-
-plt.show()
-
-
-if PlotEvapCool == True:
-    
-    #XXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXX
-    #RE-CREATE THE PSYCHROMETRIC CHART AND PLOT EVAP-COOLED DATA
-    #XXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXX
-
-    plt.figure(figsize=(12, 8), tight_layout=True)
-    
-    temp_x_list = []
-    g_y_list = []
-    for rh in range (10,110,10):
-        for temp in range (-10,61):
-            temp_x_list.append(temp)
-            g_y_list.append(g(temp,rh))
-        plt.plot(temp_x_list,g_y_list, lw=1, color='darkgray')
-        temp_x_list.clear()
-        g_y_list.clear()
-    
-    mc=0
-    while mc<=0.03:
-        mc=mc+0.005
-        temp_x_list.append(tsat(mc))
-        g_y_list.append(mc)
-        temp_x_list.append(60)
-        g_y_list.append(mc)
-        plt.plot(temp_x_list,g_y_list, lw=1, color='darkgray')
-        temp_x_list.clear()
-        g_y_list.clear()
-    
-    for temp in range(-10,60,5):
-        gsat=g_dry_wet(temp,temp)
-        if gsat>=0.3:
-            gsat=0.3
-        temp_x_list.append(temp)
-        g_y_list.append(0)
-        temp_x_list.append(temp)
-        g_y_list.append(gsat)
-        plt.plot(temp_x_list,g_y_list, lw=1, color='darkgray')
-        temp_x_list.clear()
-        g_y_list.clear()
-    
-    for wbt in range (-10,40,5):
-        for dbt in range (-10, 61, 1):
-            mc = g_dry_wet(dbt,wbt)
-            if dbt>=wbt:
-                temp_x_list.append(dbt)
-                g_y_list.append(mc)
-        plt.plot(temp_x_list,g_y_list, lw=1, color='darkgray')
-        temp_x_list.clear()
-        g_y_list.clear()
-
-    
-    shifted_temp_list = []
-    shifted_g_list = []
-    
-    for plotpoints in range (0,len(temp_list)):
-        g_list.append(g(temp_list[plotpoints],rh_list[plotpoints]))
-        tdry = temp_list[plotpoints]
-        twet = twetrh(temp_list[plotpoints], rh_list[plotpoints], Screen)
-        wbtd = tdry-twet
-        
-        if MartinezLimit==True:
-            LLdbt = 29 + g_list[plotpoints] / -0.0055 #where -0.0055 = dy/dx of PDEC line
-        
-        if tdry>=LLdbt:
-            tdry = tdry - (EvapCoolEff * wbtd)
-            shifted_temp_list.append(tdry)
-            shifted_g_list.append(g_dry_wet(tdry,twet))
+#this function plots hourly dry bulb temperatures and moisture contents on the chart: as
+#points, coloured by month if PlotMonthly, or (with PlotDensity) as binned hour counts, on
+#one small chart per month if PlotMonthly. Returns the figure.
+def plot_climate(chart, temp_list, g_list, month_list, PlotMonthly=PlotMonthly, PlotDensity=PlotDensity, RasterBackground=RasterBackground):
+    import matplotlib.pyplot as plt
+    if PlotDensity==True and PlotMonthly==True:
+        #one small chart per month, sharing a colour scale
+        counts, tedges, gedges = chart.bin_hours(temp_list, g_list, month_list)
+        fig,axes = plt.subplots(3,4, figsize=(16, 10), constrained_layout=True)
+        for month in range (1,13):
+            ax = axes[(month-1)//4, (month-1)%4]
+            chart.draw(ax, RasterBackground)
+            mesh = chart.draw_density(ax, counts[month-1], tedges, gedges)
+            mesh.set_clim(1, counts.max())
+            ax.set_title(Month_list[month-1])
+        fig.colorbar(mesh, ax=axes, label = 'Hours')
+    elif PlotDensity==True:
+        counts, tedges, gedges = chart.bin_hours(temp_list, g_list)
+        fig,ax = plt.subplots(1,1, figsize=(12, 8), tight_layout=True)
+        chart.draw(ax, RasterBackground)
+        mesh = chart.draw_density(ax, counts, tedges, gedges)
+        fig.colorbar(mesh, ax=ax, label = 'Hours')
+        ax.set_title('Hourly climate data binned on a psychrometric chart', loc='center')
+    else:
+        fig,ax = plt.subplots(1,1, figsize=(12, 8), tight_layout=True)
+        chart.draw(ax, RasterBackground)
+        if PlotMonthly==False:
+            ax.scatter(temp_list,g_list, c='red', alpha=0.5, s=5)
         else:
-            shifted_temp_list.append(temp_list[plotpoints])
-            shifted_g_list.append(g_list[plotpoints])
-    plt.scatter(shifted_temp_list,shifted_g_list, c='red', alpha=0.5, s=5)
-    
-    plt.ylim(0,0.03)
-    plt.xlim(-10,60)
-    plt.xlabel('Dry bulb temperature, $^o$C')
-    plt.ylabel('Moisture content, kg/kg (dry air)')
-    
-    plt.axvline(x=60, color='lightgrey')
-    #plt.axis('off')
-    plt.title('Hourly climate data plotted on a psychrometric chart', loc='center')
-    
-    plt.show()
+            for month in range (1,13):
+                inmonth = month_list == month
+                ax.scatter(temp_list[inmonth], g_list[inmonth], c=Colour_list[11-month], label = (Month_list[month-1]), s=6, alpha=0.9)
 
+        #ax.axis('off')
+        ax.set_title('Hourly climate data plotted on a psychrometric chart', loc='center')
+        ax.legend(loc = 'upper left', frameon=False)
+    return fig
 
 
+#this function shifts the hours at or above LLdbt (or the Martinez limit) along their wet
+#bulb line by EvapCoolEff of the wet bulb depression, returning the shifted dry bulb
+#temperatures and moisture contents. It is a single scenario of evap_cool_sweep.
+def evap_cool(temp_list, rh_list, LLdbt=LLdbt, MartinezLimit=MartinezLimit, EvapCoolEff=EvapCoolEff, Screen=Screen):
+    if MartinezLimit==True:
+        LLdbt = np.nan
+    table, shifted_temp_list, shifted_g_list = evap_cool_sweep(temp_list, rh_list, [EvapCoolEff], [LLdbt], Screen=Screen)
+    return shifted_temp_list[0], shifted_g_list[0]
 
 
+#this function plots evaporatively cooled hours (from evap_cool) on the chart
+def plot_evap_cool(chart, shifted_temp_list, shifted_g_list, RasterBackground=RasterBackground):
+    import matplotlib.pyplot as plt
+    fig,ax = plt.subplots(1,1, figsize=(12, 8), tight_layout=True)
+    chart.draw(ax, RasterBackground)
+    ax.scatter(shifted_temp_list,shifted_g_list, c='red', alpha=0.5, s=5)
 
+    #ax.axis('off')
+    ax.set_title('Hourly climate data plotted on a psychrometric chart', loc='center')
+    return fig
 
 
+def main():
+    import matplotlib.pyplot as plt
 
+    #XXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXX
+    #READ IN THE CLIMATE DATA TO PLOT
+    #XXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXX
 
+    #this reads climate data file
+    data = read_climate(filename)
+    temp_list = data['dbt']
+    rh_list = data['rh']
+    month_list = data['month']
+    #the moisture content of every hour, in one call
+    g_list = g_array(temp_list, rh_list)
 
+    #the chart lines are calculated once (and cached on disk), then reused by every chart
+    chart = PsychroChart(-10, 60, 0.03)
 
+    plot_climate(chart, temp_list, g_list, month_list, PlotMonthly, PlotDensity, RasterBackground)
+    plt.show()
 
+    if PlotEvapCool == True:
+        #RE-CREATE THE PSYCHROMETRIC CHART AND PLOT EVAP-COOLED DATA
+        shifted_temp_list, shifted_g_list = evap_cool(temp_list, rh_list, LLdbt, MartinezLimit, EvapCoolEff, Screen)
+        plot_evap_cool(chart, shifted_temp_list, shifted_g_list, RasterBackground)
+        plt.show()
 
+    if PlotEvapSweep == True:
+        #COMPARE EVAPORATIVE COOLING SCENARIOS
+        sweep_table, sweep_temp_list, sweep_g_list = evap_cool_sweep(temp_list, rh_list, EvapCoolEff_list, LLdbt_list, Screen=Screen)
+        print('EvapCoolEff, LLdbt, hours shifted, hours in comfort zone, hours brought into comfort zone')
+        for row in sweep_table:
+            print('{0:1.2f}, {1:1.1f}, {2:d}, {3:d}, {4:d}' .format(row['EvapCoolEff'], row['LLdbt'], row['hours_shifted'], row['hours_in_zone'], row['hours_into_zone']))
+        plot_sweep(sweep_table, EvapCoolEff_list, LLdbt_list)
+        plt.show()
 
 
+if __name__ == '__main__':
+    main()
@@ -7,16 +7,19 @@
 
 #This module creates a stereographic sunpath diagram,given a user-defined latitude, and 
 #specification of solar or clock time. It can also create shading protractors.
+#plot_sunpath creates the diagram (importing matplotlib only then); run the module as a
+#script to show it for the settings below. The geometry (circles, spokes, monthly paths,
+#time curves / analemmas and protractor lines) is calculated as arrays, a whole set of
+#curves per call.
 
 #imports the basic libraries
 import math
-import matplotlib.pyplot as plt
 import numpy as np
 
 from ClimAnalFunctions import * 
+from ClimAnalArrays import declin_angle_array, sunrise_time_array, solar_altitude_array, solar_azimuth_array, time_diff_array
 
 lat = 52
-lat = lat*pi/180
 
 AzimuthIncrement = 10
 HorizontalProtractor = True
@@ -26,149 +29,171 @@ ClockTime = True
 
 EqTonly = True
 
-circles_x = []
-circles_y = []
-spokes_x = []
-spokes_y = []
 
-
-Hemisphere = "N"
-if lat<0:
-    Hemisphere="S"
-
-
-#working backwards from the winter solstice
+#the days of the monthly sunpaths, working backwards from the winter solstice, and their colours and labels
 SunpathDay_list = [355,325,294,264,233,202,172,141,111,80,52,21]
-azi_list = []
-alt_list = []
-sunpath_x = []
-sunpath_y = []
-
 Colour_list = ['firebrick', 'darkorange', 'orange', 'gold', 'green', 'cyan', 'blue']
 Month_list = ['Dec', 'Nov/Jan', 'Oct/Feb', 'Sep/Mar', 'Aug/Apr', 'Jul/May', 'Jun']
-plt.figure(figsize=(9, 9))
 
-#######################################
-# THIS PLOTS THE ISO-ALTITUDE CIRCLES AND RADIAL AZIMUTH LINES
-#######################################
 
-for circle in range (90,0,-10):
-    for orientation in range (0,360+AzimuthIncrement, AzimuthIncrement):
-        circles_x.append(circle*math.sin(orientation*pi/180))
-        circles_y.append(circle*math.cos(orientation*pi/180))
-        if circle==80:
-            spokes_x.append(90*math.sin(orientation*pi/180))
-            spokes_y.append(90*math.cos(orientation*pi/180))
-            spokes_x.append(0*math.sin(orientation*pi/180))
-            spokes_y.append(0*math.cos(orientation*pi/180))
-        if circle==90 and orientation < 360:
-            plt.text(95*math.sin(orientation*pi/180),95*math.cos(orientation*pi/180),str(orientation)+ '$^o$', c = 'darkgray', horizontalalignment='center', fontsize=8)
-    if circle<90 and circle!=0:
-        plt.text((circle+1)*math.sin(5*pi/180),(circle+1)*math.cos(orientation*pi/180),str(90-circle)+ '$^o$', c = 'darkgray', horizontalalignment='center', fontsize=8)
-
-    plt.plot(circles_x,circles_y, lw=1, color='darkgray')
-    plt.plot(spokes_x,spokes_y, lw=1, color='darkgray')
-    circles_x.clear()
-    circles_y.clear()
-    spokes_x.clear()
-    spokes_y.clear()
-
-for month in range (1,8):
-    position=0
-    day = SunpathDay_list[month-1]
-    dec = declin_angle(day)
-    ss,sr = sunrise_time(dec,lat,day)
-    
-    if ss<24:
-        #in this case we need to plot from the non-integer sunrise time, through to sunset
-        alt_list.append(solar_altitude(day,sr,lat,dec)*180/pi)    
-        azi_list.append(solar_azimuth(day,sr,lat,alt_list[0]*pi/180,dec))
-        sunpath_x.append((90-alt_list[0])*math.sin(azi_list[0]))
-        sunpath_y.append((90-alt_list[0])*math.cos(azi_list[0]))
-    
-        for hour in range(math.ceil(sr),int(sr)+2*(12-int(sr))):
-            position=position+1
-            alt_list.append(solar_altitude(day,hour,lat,dec)*180/pi)    
-            azi_list.append(solar_azimuth(day,hour,lat,alt_list[position]*pi/180,dec))
-            sunpath_x.append((90-alt_list[position])*math.sin(azi_list[position]))
-            sunpath_y.append((90-alt_list[position])*math.cos(azi_list[position]))
-            
-        alt_list.append(solar_altitude(day,ss,lat,dec)*180/pi)    
-        azi_list.append(solar_azimuth(day,ss,lat,solar_altitude(day,ss,lat,dec)*pi/180,dec))
-        sunpath_x.append(90*math.sin(azi_list[position+1]))
-        sunpath_y.append(90*math.cos(azi_list[position+1]))
+#this function projects altitudes (degrees) and azimuths (radians) onto the diagram, with the
+#zenith at the centre and the horizon at a radius of 90
+def sky_xy(alt, azi):
+    r = 90-np.asarray(alt, dtype=float)
+    return r*np.sin(azi), r*np.cos(azi)
+
+
+#this function calculates the iso-altitude circles (rows) and the radial azimuth lines (as
+#one zig-zag line) for azimuths at AzimuthIncrement (degrees). These depend on no site, so
+#they are shared by every diagram.
+def sunpath_background(AzimuthIncrement=AzimuthIncrement):
+    background = {}
+    background['circle_list'] = np.arange(90, 0, -10)
+    background['orientation_list'] = np.arange(0, 360+AzimuthIncrement, AzimuthIncrement)
+    orientation = background['orientation_list']*pi/180
+    background['circles_x'] = background['circle_list'][:,None]*np.sin(orientation)[None,:]
+    background['circles_y'] = background['circle_list'][:,None]*np.cos(orientation)[None,:]
+    background['spokes_x'] = np.stack((90*np.sin(orientation), 0*np.sin(orientation)), axis=1).ravel()
+    background['spokes_y'] = np.stack((90*np.cos(orientation), 0*np.cos(orientation)), axis=1).ravel()
+    return background
+
+
+#this function calculates the monthly sunpaths, for latitude lat (radians): from the
+#(non-integer) sunrise time, through each hour, to sunset, or through the entire 24h period
+#when the sun does not set. Returns a list of (x, y) arrays, in the order of Month_list.
+def sunpath_curves(lat):
+    day_list = np.array(SunpathDay_list[:7])
+    dec_list = declin_angle_array(day_list)
+    ss_list, sr_list = sunrise_time_array(dec_list, lat, day_list)
+    #the days on which the sun sets (the sunset time itself is 24h less rounding when it does not)
+    sets = -np.tan(lat)*np.tan(dec_list) > -1
+
+    #the hours of every path, then the sun positions of all of them in one call
+    hour_list = []
+    for sr, ss, sunset in zip(sr_list, ss_list, sets):
+        if sunset == True:
+            hour_list.append(np.concatenate(([sr], np.arange(math.ceil(sr), int(sr)+2*(12-int(sr))), [ss])))
+        else:
+            hour_list.append(np.arange(0, 25, dtype=float))
+    length = [len(hours) for hours in hour_list]
+    day = np.repeat(day_list, length)
+    dec = np.repeat(dec_list, length)
+    hour = np.concatenate(hour_list)
+    alt = solar_altitude_array(day, hour, lat, dec)
+    azi = solar_azimuth_array(day, hour, lat, alt, dec)
+    x, y = sky_xy(alt*180/pi, azi)
+
+    sunpath_curves = []
+    for path, (xpath, ypath) in enumerate(zip(np.split(x, np.cumsum(length)[:-1]), np.split(y, np.cumsum(length)[:-1]))):
+        if sets[path] == True:
+            #the path ends on the horizon, at sunset
+            xpath[-1] = 90*math.sin(azi[np.cumsum(length)[path]-1])
+            ypath[-1] = 90*math.cos(azi[np.cumsum(length)[path]-1])
+        sunpath_curves.append((xpath, ypath))
+    return sunpath_curves
+
+
+#this function calculates the (clock or solar) time curves for hours 0 to 24 of every day, for
+#latitude lat (radians): in clock time these trace the analemma. Hours when the sun is below
+#the horizon at the summer solstice are left out, as are the days on which it is below the
+#horizon. Returns a list of (x, y) arrays.
+def time_curves(lat, ClockTime=ClockTime, EqTonly=EqTonly):
+    hour_list = np.arange(0, 25)
+    day_list = np.arange(1, 366)
+    summerday = 172 if lat >= 0 else 355
+    summer = solar_altitude_array(summerday, hour_list, lat, declin_angle_array(summerday)) > 0
+
+    #this controls whether solar time curves of the analemma are plotted
+    if ClockTime == True:
+        EqT = time_diff_array(day_list, EqTonly, 0, 0, 0)
     else:
-        #in this case we simply need to plot for the entire 24h period
-         for hour in range(0,25):
-            alt_list.append(solar_altitude(day,hour,lat,dec)*180/pi)    
-            azi_list.append(solar_azimuth(day,hour,lat,alt_list[position]*pi/180,dec))
-            sunpath_x.append((90-alt_list[position])*math.sin(azi_list[position]))
-            sunpath_y.append((90-alt_list[position])*math.cos(azi_list[position]))
-            position=position+1
-
-    plt.plot(sunpath_x, sunpath_y, c=Colour_list[7-month], label = (Month_list[month-1]), marker='o')
-    
-    alt_list.clear()
-    azi_list.clear()
-    sunpath_x.clear()
-    sunpath_y.clear()
-
-time_curve_x = []
-time_curve_y = []
-for hour in range (0,25):
-    for day in range(1,366):
-        #if the sun is below the horizon during the summer solstice for this hour then skip
-        if Hemisphere=="N":
-            summerday = 172
+        EqT = np.zeros(len(day_list))
+    Dec = declin_angle_array(day_list)[None,:]
+    hour = hour_list[summer][:,None] + EqT[None,:]
+    Solalt = solar_altitude_array(day_list[None,:], hour, lat, Dec)
+    Solaz = solar_azimuth_array(day_list[None,:], hour, lat, Solalt, Dec)
+    x, y = sky_xy(Solalt*180/pi, Solaz)
+    up = Solalt > 0
+    time_curves = [(x[i][up[i]], y[i][up[i]]) for i in range(len(x))]
+    #WEIRD PROBLEM: EQT FOR FIRST HOUR IN (ANT)ARCTIC CIRCLE ISN'T CORRECT (IT MIRRORS ABOUT THE HALF YEAR).
+    return time_curves
+
+
+#this function calculates the shading protractor lines of a wall of azimuth WallAzimuth
+#(degrees): curves of equal horizontal shading angle (rows, at 10 to 80 degrees), and lines of
+#equal vertical shading angle (rows, each from the horizon to the centre)
+def protractor_lines(WallAzimuth=WallAzimuth):
+    Theta = np.arange(10, 90, 10)[:,None]
+    Orientation = np.arange(WallAzimuth-90, WallAzimuth+100, 10)
+    ThetaAdjusted = np.arctan(np.tan(Theta*pi/180) * np.cos(np.abs(Orientation-WallAzimuth)*pi/180)) * 180/pi
+    horizontal_x, horizontal_y = sky_xy(ThetaAdjusted, Orientation[None,:]*pi/180)
+    vertical_x = np.stack((90*np.sin(Orientation*pi/180), 0*np.sin(Orientation*pi/180)), axis=1)
+    vertical_y = np.stack((90*np.cos(Orientation*pi/180), 0*np.cos(Orientation*pi/180)), axis=1)
+    return horizontal_x, horizontal_y, vertical_x, vertical_y
+
+
+#this function draws the iso-altitude circles, radial azimuth lines and their labels
+#(see sunpath_background) on the axes ax
+def draw_background(ax, background):
+    orientation_list = background['orientation_list']
+    for i, circle in enumerate(background['circle_list']):
+        if circle==90:
+            for orientation in orientation_list[orientation_list < 360]:
+                ax.text(95*math.sin(orientation*pi/180),95*math.cos(orientation*pi/180),str(orientation)+ '$^o$', c = 'darkgray', horizontalalignment='center', fontsize=8)
         else:
-            summerday = 355
-        if solar_altitude(summerday,hour,lat,declin_angle(summerday))>0:
-            #this controls whether solar time curves of the analemma are plotted
-            if ClockTime == True:
-                EqT = time_diff(day, EqTonly, 0, 0, 0)
-            else:
-                EqT = 0
-            Dec = declin_angle(day)
-            Solalt = solar_altitude(day,hour+EqT,lat, Dec)
-            if Solalt>0:
-                Solaz = solar_azimuth(day,hour+EqT,lat,Solalt,Dec)
-                time_curve_x.append((90-(Solalt*180/pi))*math.sin(Solaz))
-                time_curve_y.append((90-(Solalt*180/pi))*math.cos(Solaz))
-    plt.plot(time_curve_x, time_curve_y, c='darkblue')
-    time_curve_x.clear()
-    time_curve_y.clear()
-#WEIRD PROBLEM: EQT FOR FIRST HOUR IN (ANT)ARCTIC CIRCLE ISN'T CORRECT (IT MIRRORS ABOUT THE HALF YEAR).
-
-
-#######################################
-# THIS PLOTS THE SHADING PROTRACTORS
-#######################################
-
-Protractor_x = []
-Protractor_y = []
-if HorizontalProtractor == True:
-    for Theta in range (10, 90, 10):
-        for Orientation in range (WallAzimuth-90, WallAzimuth+100, 10):
-            ThetaAdjusted = math.atan(math.tan(Theta*pi/180) * math.cos(math.fabs(Orientation-WallAzimuth)*pi/180)) * 180/pi            
-            Protractor_x.append((90-ThetaAdjusted)*math.sin(Orientation*pi/180))
-            Protractor_y.append((90-ThetaAdjusted)*math.cos(Orientation*pi/180))
-        plt.plot(Protractor_x, Protractor_y, c='darkorange', lw=2, linestyle=':')
-        Protractor_x.clear()
-        Protractor_y.clear()
-if VerticalProtractor == True:
-    for Orientation in range (WallAzimuth-90, WallAzimuth+100, 10):
-        Protractor_x.append(90*math.sin(Orientation*pi/180))
-        Protractor_y.append(90*math.cos(Orientation*pi/180))
-        Protractor_x.append(0*math.sin(Orientation*pi/180))
-        Protractor_y.append(0*math.cos(Orientation*pi/180))        
-        plt.plot(Protractor_x, Protractor_y, c='darkorange', lw=2, linestyle=':')
-        Protractor_x.clear()
-        Protractor_y.clear()
-
-plt.title('Stereographic sunpath diagram, for latitude: ' + str(int(180*math.fabs(lat)/pi)) +'$^o$' + str(Hemisphere), loc='center')
-plt.legend(loc = 'lower left', frameon=False)
-plt.axis('off')
-plt.tight_layout()
-
-plt.show()
+            ax.text((circle+1)*math.sin(5*pi/180),(circle+1)*math.cos(orientation_list[-1]*pi/180),str(90-circle)+ '$^o$', c = 'darkgray', horizontalalignment='center', fontsize=8)
+        ax.plot(background['circles_x'][i],background['circles_y'][i], lw=1, color='darkgray')
+        if circle==80:
+            ax.plot(background['spokes_x'],background['spokes_y'], lw=1, color='darkgray')
+
+
+#this function draws the sunpath diagram for latitude lat (radians), returning the figure.
+#A background from sunpath_background may be given, to be shared by many diagrams.
+def plot_sunpath(lat, AzimuthIncrement=AzimuthIncrement, HorizontalProtractor=HorizontalProtractor, VerticalProtractor=VerticalProtractor, WallAzimuth=WallAzimuth, ClockTime=ClockTime, EqTonly=EqTonly, background=None):
+    import matplotlib.pyplot as plt
+    if background is None:
+        background = sunpath_background(AzimuthIncrement)
+
+    Hemisphere = "N"
+    if lat<0:
+        Hemisphere="S"
+
+    fig,ax = plt.subplots(1,1, figsize=(9, 9))
+
+    #######################################
+    # THIS PLOTS THE ISO-ALTITUDE CIRCLES AND RADIAL AZIMUTH LINES
+    #######################################
+
+    draw_background(ax, background)
+
+    for month, (sunpath_x, sunpath_y) in enumerate(sunpath_curves(lat)):
+        ax.plot(sunpath_x, sunpath_y, c=Colour_list[6-month], label = (Month_list[month]), marker='o')
+
+    for time_curve_x, time_curve_y in time_curves(lat, ClockTime, EqTonly):
+        ax.plot(time_curve_x, time_curve_y, c='darkblue')
+
+    #######################################
+    # THIS PLOTS THE SHADING PROTRACTORS
+    #######################################
+
+    horizontal_x, horizontal_y, vertical_x, vertical_y = protractor_lines(WallAzimuth)
+    if HorizontalProtractor == True:
+        ax.plot(horizontal_x.T, horizontal_y.T, c='darkorange', lw=2, linestyle=':')
+    if VerticalProtractor == True:
+        ax.plot(vertical_x.T, vertical_y.T, c='darkorange', lw=2, linestyle=':')
+
+    ax.set_title('Stereographic sunpath diagram, for latitude: ' + str(int(round(180*math.fabs(lat)/pi))) +'$^o$' + str(Hemisphere), loc='center')
+    ax.legend(loc = 'lower left', frameon=False)
+    ax.axis('off')
+    fig.tight_layout()
+    return fig
+
+
+def main():
+    import matplotlib.pyplot as plt
+    plot_sunpath(lat*pi/180, AzimuthIncrement, HorizontalProtractor, VerticalProtractor, WallAzimuth, ClockTime, EqTonly)
+    plt.show()
+
 
+if __name__ == '__main__':
+    main()